@@ -0,0 +1,61 @@
+"""ticket inventory counters
+
+Revision ID: 0001_ticket_inventory
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001_ticket_inventory"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ticket_type = postgresql.ENUM("GENERAL", "VIP", "EARLY_BIRD", name="tickettype", create_type=False)
+
+
+def upgrade():
+    op.create_table(
+        "event_inventory",
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), primary_key=True),
+        sa.Column("capacity", sa.Integer(), nullable=False),
+        sa.Column("sold", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("held", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "ticket_type_inventory",
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), primary_key=True),
+        sa.Column("ticket_type", ticket_type, primary_key=True),
+        sa.Column("capacity", sa.Integer(), nullable=True),
+        sa.Column("sold", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("held", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # Seed counters from the tickets already sold
+    op.execute(
+        """
+        INSERT INTO event_inventory (event_id, capacity, sold, held, version)
+        SELECT e.id, COALESCE(e.capacity, 0), COUNT(t.id), 0, 0
+        FROM events e LEFT JOIN tickets t ON t.event_id = e.id
+        GROUP BY e.id, e.capacity
+        """
+    )
+    for value in ("GENERAL", "VIP", "EARLY_BIRD"):
+        op.execute(
+            f"""
+            INSERT INTO ticket_type_inventory (event_id, ticket_type, sold, held)
+            SELECT e.id, '{value}',
+                   (SELECT COUNT(*) FROM tickets t
+                    WHERE t.event_id = e.id AND t.ticket_type = '{value}'),
+                   0
+            FROM events e
+            """
+        )
+
+
+def downgrade():
+    op.drop_table("ticket_type_inventory")
+    op.drop_table("event_inventory")
@@ -0,0 +1,33 @@
+"""ticket holds
+
+Revision ID: 0002_ticket_holds
+Revises: 0001_ticket_inventory
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_ticket_holds"
+down_revision = "0001_ticket_inventory"
+branch_labels = None
+depends_on = None
+
+ticket_status = sa.Enum("HELD", "CONFIRMED", "EXPIRED", name="ticketstatus")
+
+
+def upgrade():
+    ticket_status.create(op.get_bind(), checkfirst=True)
+    # Tickets sold before holds existed are treated as confirmed sales
+    op.add_column(
+        "tickets",
+        sa.Column("status", ticket_status, nullable=True, server_default="CONFIRMED"),
+    )
+    op.add_column("tickets", sa.Column("hold_expires_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_tickets_status_hold_expires_at", "tickets", ["status", "hold_expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_tickets_status_hold_expires_at", table_name="tickets")
+    op.drop_column("tickets", "hold_expires_at")
+    op.drop_column("tickets", "status")
+    ticket_status.drop(op.get_bind(), checkfirst=True)
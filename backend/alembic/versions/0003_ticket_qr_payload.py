@@ -0,0 +1,25 @@
+"""store signed QR payloads instead of rendered images
+
+Revision ID: 0003_ticket_qr_payload
+Revises: 0002_ticket_holds
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_ticket_qr_payload"
+down_revision = "0002_ticket_holds"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Payloads are signed with SECRET_KEY, so existing tickets get theirs
+    # lazily the first time their QR image is requested.
+    op.add_column("tickets", sa.Column("qr_payload", sa.String(), nullable=True))
+    op.drop_column("tickets", "qr_code")
+
+
+def downgrade():
+    op.add_column("tickets", sa.Column("qr_code", sa.String(), nullable=True))
+    op.drop_column("tickets", "qr_payload")
@@ -0,0 +1,20 @@
+"""index tickets by event for gate snapshots
+
+Revision ID: 0004_ticket_event_index
+Revises: 0003_ticket_qr_payload
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0004_ticket_event_index"
+down_revision = "0003_ticket_qr_payload"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_tickets_event_id_status_id", "tickets", ["event_id", "status", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_tickets_event_id_status_id", table_name="tickets")
@@ -0,0 +1,31 @@
+"""keyset pagination indexes for my-orders and my-tickets
+
+Revision ID: 0005_user_history_pagination
+Revises: 0004_ticket_event_index
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_user_history_pagination"
+down_revision = "0004_ticket_event_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing tickets have no booking time; they sort as booked at migration time
+    op.add_column(
+        "tickets",
+        sa.Column("created_at", sa.DateTime(), nullable=True, server_default=sa.func.now()),
+    )
+    op.execute("UPDATE orders SET created_at = now() WHERE created_at IS NULL")
+
+    op.create_index("ix_tickets_user_id_created_at_id", "tickets", ["user_id", "created_at", "id"])
+    op.create_index("ix_orders_user_id_created_at_id", "orders", ["user_id", "created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_orders_user_id_created_at_id", table_name="orders")
+    op.drop_index("ix_tickets_user_id_created_at_id", table_name="tickets")
+    op.drop_column("tickets", "created_at")
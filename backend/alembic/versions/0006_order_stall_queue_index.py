@@ -0,0 +1,20 @@
+"""index orders for the stall queue
+
+Revision ID: 0006_order_stall_queue_index
+Revises: 0005_user_history_pagination
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0006_order_stall_queue_index"
+down_revision = "0005_user_history_pagination"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_orders_stall_id_status_created_at", "orders", ["stall_id", "status", "created_at"])
+
+
+def downgrade():
+    op.drop_index("ix_orders_stall_id_status_created_at", table_name="orders")
@@ -0,0 +1,49 @@
+"""stall revenue ledger
+
+Revision ID: 0007_revenue_ledger
+Revises: 0006_order_stall_queue_index
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_revenue_ledger"
+down_revision = "0006_order_stall_queue_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "revenue_ledger",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("stall_id", sa.Integer(), sa.ForeignKey("stalls.id"), nullable=False),
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("orders.id"), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("folded", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_revenue_ledger_id", "revenue_ledger", ["id"])
+    op.create_unique_constraint("uq_revenue_ledger_order_id", "revenue_ledger", ["order_id"])
+    op.create_index(
+        "ix_revenue_ledger_unfolded",
+        "revenue_ledger",
+        ["stall_id"],
+        postgresql_where=sa.text("NOT folded"),
+    )
+
+    # Orders completed before the ledger existed become unfolded entries; the
+    # compaction job adds them to the stall totals on its first run
+    op.execute(
+        """
+        INSERT INTO revenue_ledger (stall_id, order_id, amount, folded, created_at)
+        SELECT stall_id, id, total_amount, false, COALESCE(completed_at, now())
+        FROM orders
+        WHERE status = 'COMPLETED' AND stall_id IS NOT NULL
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_revenue_ledger_unfolded", table_name="revenue_ledger")
+    op.drop_table("revenue_ledger")
@@ -0,0 +1,21 @@
+"""menu item stock counts
+
+Revision ID: 0008_menu_item_stock
+Revises: 0007_revenue_ledger
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008_menu_item_stock"
+down_revision = "0007_revenue_ledger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("menu_items", sa.Column("stock", sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("menu_items", "stock")
@@ -0,0 +1,24 @@
+"""composite indexes for event listing filters
+
+Revision ID: 0009_event_listing_indexes
+Revises: 0008_menu_item_stock
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0009_event_listing_indexes"
+down_revision = "0008_menu_item_stock"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_events_date_id", "events", ["date", "id"])
+    op.create_index("ix_events_is_active_date_id", "events", ["is_active", "date", "id"])
+    op.create_index("ix_events_venue_date_id", "events", ["venue", "date", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_events_venue_date_id", table_name="events")
+    op.drop_index("ix_events_is_active_date_id", table_name="events")
+    op.drop_index("ix_events_date_id", table_name="events")
@@ -0,0 +1,40 @@
+"""full-text and trigram search indexes for events and stalls
+
+Revision ID: 0010_search_indexes
+Revises: 0009_event_listing_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0010_search_indexes"
+down_revision = "0009_event_listing_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Expressions must match EVENT_DOCUMENT and STALL_DOCUMENT in search_service
+    op.execute(
+        """
+        CREATE INDEX ix_events_search ON events USING gin (
+            to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(venue, ''))
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX ix_stalls_search ON stalls USING gin (
+            to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, ''))
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_events_name_trgm ON events USING gin (name gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_stalls_name_trgm ON stalls USING gin (name gin_trgm_ops)")
+
+
+def downgrade():
+    op.drop_index("ix_stalls_name_trgm", table_name="stalls")
+    op.drop_index("ix_events_name_trgm", table_name="events")
+    op.drop_index("ix_stalls_search", table_name="stalls")
+    op.drop_index("ix_events_search", table_name="events")
@@ -0,0 +1,49 @@
+"""per-event, per-type sales statistics
+
+Revision ID: 0011_event_ticket_stats
+Revises: 0010_search_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0011_event_ticket_stats"
+down_revision = "0010_search_indexes"
+branch_labels = None
+depends_on = None
+
+ticket_type = postgresql.ENUM("GENERAL", "VIP", "EARLY_BIRD", name="tickettype", create_type=False)
+
+
+def upgrade():
+    op.create_table(
+        "event_ticket_stats",
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), primary_key=True),
+        sa.Column("ticket_type", ticket_type, primary_key=True),
+        sa.Column("sold", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("checked_in", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("reconciled_at", sa.DateTime(), nullable=True),
+    )
+
+    # Seed counters from the confirmed tickets already sold
+    for value in ("GENERAL", "VIP", "EARLY_BIRD"):
+        op.execute(
+            f"""
+            INSERT INTO event_ticket_stats (event_id, ticket_type, sold, revenue, checked_in, reconciled_at)
+            SELECT e.id, '{value}',
+                   COUNT(t.id),
+                   COALESCE(SUM(t.price), 0),
+                   COUNT(t.id) FILTER (WHERE t.is_used),
+                   now()
+            FROM events e
+            LEFT JOIN tickets t
+              ON t.event_id = e.id AND t.ticket_type = '{value}' AND t.status = 'CONFIRMED'
+            GROUP BY e.id
+            """
+        )
+
+
+def downgrade():
+    op.drop_table("event_ticket_stats")
@@ -0,0 +1,51 @@
+"""payment webhook inbox and gateway order references
+
+Revision ID: 0012_payment_webhook_inbox
+Revises: 0011_event_ticket_stats
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0012_payment_webhook_inbox"
+down_revision = "0011_event_ticket_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "payment_webhook_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("delivery_id", sa.String(), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("payment_id", sa.String(), nullable=True),
+        sa.Column("gateway_order_id", sa.String(), nullable=True),
+        sa.Column("payload", sa.String(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_payment_webhook_events_id", "payment_webhook_events", ["id"])
+    op.create_unique_constraint("uq_payment_webhook_events_delivery_id", "payment_webhook_events", ["delivery_id"])
+    op.create_index("ix_payment_webhook_events_payment_id", "payment_webhook_events", ["payment_id"])
+    op.create_index(
+        "ix_payment_webhook_events_pending",
+        "payment_webhook_events",
+        ["id"],
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+
+    op.add_column("tickets", sa.Column("gateway_order_id", sa.String(), nullable=True))
+    op.create_index("ix_tickets_gateway_order_id", "tickets", ["gateway_order_id"])
+    op.add_column("orders", sa.Column("gateway_order_id", sa.String(), nullable=True))
+    op.create_index("ix_orders_gateway_order_id", "orders", ["gateway_order_id"])
+
+
+def downgrade():
+    op.drop_index("ix_orders_gateway_order_id", table_name="orders")
+    op.drop_column("orders", "gateway_order_id")
+    op.drop_index("ix_tickets_gateway_order_id", table_name="tickets")
+    op.drop_column("tickets", "gateway_order_id")
+    op.drop_index("ix_payment_webhook_events_pending", table_name="payment_webhook_events")
+    op.drop_table("payment_webhook_events")
@@ -0,0 +1,33 @@
+"""indexes on payment IDs for reconciliation
+
+Revision ID: 0013_payment_id_indexes
+Revises: 0012_payment_webhook_inbox
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0013_payment_id_indexes"
+down_revision = "0012_payment_webhook_inbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_tickets_payment_id",
+        "tickets",
+        ["payment_id"],
+        postgresql_where=sa.text("payment_id IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_orders_payment_id",
+        "orders",
+        ["payment_id"],
+        postgresql_where=sa.text("payment_id IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_orders_payment_id", table_name="orders")
+    op.drop_index("ix_tickets_payment_id", table_name="tickets")
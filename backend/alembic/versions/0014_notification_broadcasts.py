@@ -0,0 +1,57 @@
+"""notification broadcasts
+
+Revision ID: 0014_notification_broadcasts
+Revises: 0013_payment_id_indexes
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0014_notification_broadcasts"
+down_revision = "0013_payment_id_indexes"
+branch_labels = None
+depends_on = None
+
+broadcast_audience = sa.Enum("EVENT_TICKET_HOLDERS", "ROLE", name="broadcastaudience")
+broadcast_status = sa.Enum("PENDING", "RUNNING", "COMPLETED", "FAILED", name="broadcaststatus")
+user_role = postgresql.ENUM(
+    "ADMIN", "EVENT_TEAM", "VOLUNTEER", "STUDENT", "FOOD_STALL", "GAME_STALL",
+    name="userrole", create_type=False
+)
+notification_type = postgresql.ENUM(
+    "ORDER_STATUS", "PAYMENT", "EVENT_UPDATE", "SYSTEM",
+    name="notificationtype", create_type=False
+)
+
+
+def upgrade():
+    op.create_table(
+        "notification_broadcasts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("audience", broadcast_audience, nullable=False),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), nullable=True),
+        sa.Column("role", user_role, nullable=True),
+        sa.Column("type", notification_type, nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("status", broadcast_status, nullable=False),
+        sa.Column("total_recipients", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("sent_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_user_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_notification_broadcasts_id", "notification_broadcasts", ["id"])
+    # Recipient pages walk an event's confirmed ticket holders in user ID order
+    op.create_index("ix_tickets_event_id_status_user_id", "tickets", ["event_id", "status", "user_id"])
+
+
+def downgrade():
+    op.drop_index("ix_tickets_event_id_status_user_id", table_name="tickets")
+    op.drop_table("notification_broadcasts")
+    broadcast_status.drop(op.get_bind(), checkfirst=True)
+    broadcast_audience.drop(op.get_bind(), checkfirst=True)
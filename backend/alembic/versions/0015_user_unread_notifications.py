@@ -0,0 +1,41 @@
+"""per-user unread notification counter
+
+Revision ID: 0015_user_unread_notifications
+Revises: 0014_notification_broadcasts
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0015_user_unread_notifications"
+down_revision = "0014_notification_broadcasts"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "users",
+        sa.Column("unread_notifications", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_notifications_user_id_is_read", "notifications", ["user_id", "is_read"])
+
+    # Seed counters from the notifications already unread
+    op.execute(
+        """
+        UPDATE users u
+        SET unread_notifications = counts.unread
+        FROM (
+            SELECT user_id, COUNT(*) AS unread
+            FROM notifications
+            WHERE NOT is_read
+            GROUP BY user_id
+        ) counts
+        WHERE counts.user_id = u.id
+        """
+    )
+
+
+def downgrade():
+    op.drop_index("ix_notifications_user_id_is_read", table_name="notifications")
+    op.drop_column("users", "unread_notifications")
@@ -0,0 +1,35 @@
+"""server-side ticket type prices
+
+Revision ID: 0016_ticket_type_prices
+Revises: 0015_user_unread_notifications
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0016_ticket_type_prices"
+down_revision = "0015_user_unread_notifications"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("ticket_type_inventory", sa.Column("price", sa.Float(), nullable=True))
+
+    # Keep selling at the price of the latest ticket of each type; types never
+    # sold stay off sale until the event team prices them
+    op.execute(
+        """
+        UPDATE ticket_type_inventory tti
+        SET price = (
+            SELECT t.price FROM tickets t
+            WHERE t.event_id = tti.event_id AND t.ticket_type = tti.ticket_type
+            ORDER BY t.id DESC
+            LIMIT 1
+        )
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("ticket_type_inventory", "price")
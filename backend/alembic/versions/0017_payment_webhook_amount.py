@@ -0,0 +1,30 @@
+"""captured amount on payment webhook events
+
+Revision ID: 0017_payment_webhook_amount
+Revises: 0016_ticket_type_prices
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0017_payment_webhook_amount"
+down_revision = "0016_ticket_type_prices"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("payment_webhook_events", sa.Column("amount", sa.Integer(), nullable=True))
+
+    # Deliveries still waiting in the inbox carry the amount in their payload
+    op.execute(
+        """
+        UPDATE payment_webhook_events
+        SET amount = (payload::json -> 'payload' -> 'payment' -> 'entity' ->> 'amount')::integer
+        WHERE processed_at IS NULL
+        """
+    )
+
+
+def downgrade():
+    op.drop_column("payment_webhook_events", "amount")
@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     RAZORPAY_KEY_ID: str
     RAZORPAY_KEY_SECRET: str
+    RAZORPAY_WEBHOOK_SECRET: Optional[str] = None
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
     MAIL_FROM: str
@@ -21,6 +22,41 @@ class Settings(BaseSettings):
     MAX_LOGIN_ATTEMPTS: int = 5
     LOGIN_ATTEMPT_WINDOW: int = 300  # 5 minutes
     PASSWORD_HISTORY_SIZE: int = 5
+    TICKET_HOLD_MINUTES: int = 10
+    HOLD_SWEEP_INTERVAL_SECONDS: int = 30
+    HOLD_SWEEP_BATCH_SIZE: int = 500
+    WAITING_ROOM_ENABLED: bool = False
+    WAITING_ROOM_ADMIT_RATE: float = 20.0  # admissions per second per event
+    WAITING_ROOM_BURST: int = 50
+    ADMISSION_TOKEN_MINUTES: int = 10
+    QR_RENDER_WORKERS: int = 2
+    QR_CACHE_SIZE: int = 2048
+    GATE_FLUSH_INTERVAL_SECONDS: float = 2.0
+    GATE_FLUSH_BATCH_SIZE: int = 1000
+    ORDER_EVENTS_BACKEND: str = "memory"  # "memory" or "redis" for several workers
+    ORDER_EVENTS_QUEUE_SIZE: int = 100
+    REVENUE_COMPACT_INTERVAL_SECONDS: int = 60
+    REVENUE_COMPACT_BATCH_SIZE: int = 1000
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_LOCK_SECONDS: int = 60  # how long an unfinished request keeps its key
+    MENU_CACHE_SIZE: int = 1024
+    MENU_CACHE_REDIS: bool = False  # share serialized menus between workers
+    MENU_CACHE_TTL_SECONDS: int = 3600
+    EVENT_CACHE_SIZE: int = 512
+    SEARCH_INDEX_TTL_SECONDS: int = 60  # rebuild interval of the non-Postgres fallback index
+    STATS_RECONCILE_INTERVAL_SECONDS: int = 600
+    PAYMENT_GATEWAY_POOL_SIZE: int = 8
+    PAYMENT_GATEWAY_TIMEOUT_SECONDS: float = 10.0
+    PAYMENT_GATEWAY_FAILURE_THRESHOLD: int = 5  # consecutive failures that open the circuit
+    PAYMENT_GATEWAY_RESET_SECONDS: float = 30.0
+    PAYMENT_GATEWAY_LATENCY_SAMPLES: int = 1000
+    PAYMENT_GATEWAY_BASE_URL: Optional[str] = None  # e.g. scripts/fake_gateway.py for load tests
+    PAYMENT_WEBHOOK_INTERVAL_SECONDS: float = 1.0
+    PAYMENT_WEBHOOK_BATCH_SIZE: int = 500
+    NOTIFICATION_FANOUT_INTERVAL_SECONDS: float = 2.0
+    NOTIFICATION_FANOUT_CHUNK_SIZE: int = 5000  # recipients per INSERT ... SELECT
+    UNREAD_REPAIR_INTERVAL_SECONDS: int = 3600
+    UNREAD_REPAIR_BATCH_SIZE: int = 1000
 
     class Config:
         env_file = ".env"
@@ -1,10 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import auth, events, tickets, payments, stalls, menu_items, orders, notifications
+from .routers import auth, events, tickets, payments, stalls, menu_items, orders, notifications, waiting_room, search
 from .database import engine
 from .models import users, events, tickets, stalls
 from .middleware.security import SecurityHeadersMiddleware, RequestLoggingMiddleware
 from app.core.config import settings
+from .services.hold_service import HoldService
+from .services.qr_service import QRService
+from .services.payment_service import PaymentService
+from .services.payment_webhook_service import PaymentWebhookService
+from .services.notification_service import NotificationService
+from .services.gate_service import GateService
+from .services.order_events_service import OrderEventService
+from .services.revenue_service import RevenueService
+from .services.stats_service import StatsService
+from .utils.background import start_background_job, stop_background_jobs
 
 # Create database tables
 users.Base.metadata.create_all(bind=engine)
@@ -21,6 +31,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Add middleware before CORS
@@ -36,6 +47,25 @@ app.include_router(stalls.router)
 app.include_router(menu_items.router)
 app.include_router(orders.router)
 app.include_router(notifications.router)
+app.include_router(waiting_room.router)
+app.include_router(search.router)
+
+@app.on_event("startup")
+async def start_background_jobs():
+    start_background_job(HoldService.run_sweeper())
+    start_background_job(GateService.run_flusher())
+    start_background_job(OrderEventService.run_listener())
+    start_background_job(RevenueService.run_compactor())
+    start_background_job(StatsService.run_reconciler())
+    start_background_job(PaymentWebhookService.run_consumer())
+    start_background_job(NotificationService.run_broadcaster())
+    start_background_job(NotificationService.run_unread_repair())
+
+@app.on_event("shutdown")
+async def shutdown_background_jobs():
+    await stop_background_jobs()
+    QRService.shutdown()
+    PaymentService.shutdown()
 
 @app.get("/")
 async def root():
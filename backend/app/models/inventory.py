@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+from ..database import Base
+from .tickets import TicketType
+
+class EventInventory(Base):
+    __tablename__ = "event_inventory"
+
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    capacity = Column(Integer, nullable=False)
+    sold = Column(Integer, nullable=False, default=0)
+    held = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)
+
+    # Relationships
+    event = relationship("Event")
+
+class TicketTypeInventory(Base):
+    __tablename__ = "ticket_type_inventory"
+
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    ticket_type = Column(Enum(TicketType), primary_key=True)
+    capacity = Column(Integer, nullable=True)  # None means limited only by the event capacity
+    price = Column(Float, nullable=True)  # None means the type is not on sale yet
+    sold = Column(Integer, nullable=False, default=0)
+    held = Column(Integer, nullable=False, default=0)
@@ -11,6 +11,7 @@ class MenuItem(Base):
     description = Column(String, nullable=True)
     price = Column(Float)
     is_available = Column(Boolean, default=True)
+    stock = Column(Integer, nullable=True)  # None means unlimited
     
     # Relationships
     stall = relationship("Stall", back_populates="menu_items") 
\ No newline at end of file
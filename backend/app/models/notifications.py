@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
+from .users import UserRole
 from datetime import datetime
 import enum
 
@@ -10,8 +11,21 @@ class NotificationType(str, enum.Enum):
     EVENT_UPDATE = "event_update"
     SYSTEM = "system"
 
+class BroadcastAudience(str, enum.Enum):
+    EVENT_TICKET_HOLDERS = "event_ticket_holders"
+    ROLE = "role"
+
+class BroadcastStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_user_id_is_read", "user_id", "is_read"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -22,4 +36,25 @@ class Notification(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
-    user = relationship("User") 
\ No newline at end of file
+    user = relationship("User") 
+
+class NotificationBroadcast(Base):
+    """One notification fanned out to an audience in chunks by a background job"""
+    __tablename__ = "notification_broadcasts"
+
+    id = Column(Integer, primary_key=True, index=True)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    audience = Column(Enum(BroadcastAudience), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=True)
+    role = Column(Enum(UserRole), nullable=True)
+    type = Column(Enum(NotificationType), nullable=False)
+    title = Column(String, nullable=False)
+    message = Column(String, nullable=False)
+    status = Column(Enum(BroadcastStatus), nullable=False, default=BroadcastStatus.PENDING)
+    total_recipients = Column(Integer, nullable=False, default=0)
+    sent_count = Column(Integer, nullable=False, default=0)
+    last_user_id = Column(Integer, nullable=False, default=0)  # recipients are sent in user ID order
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
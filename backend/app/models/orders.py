@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Enum, Index, text
 from sqlalchemy.orm import relationship
 from ..database import Base
 from datetime import datetime
@@ -13,6 +13,11 @@ class OrderStatus(str, enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_orders_stall_id_status_created_at", "stall_id", "status", "created_at"),
+        Index("ix_orders_payment_id", "payment_id", postgresql_where=text("payment_id IS NOT NULL")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -20,6 +25,7 @@ class Order(Base):
     total_amount = Column(Float)
     status = Column(Enum(OrderStatus), default=OrderStatus.PENDING)
     payment_id = Column(String, nullable=True)
+    gateway_order_id = Column(String, nullable=True, index=True)  # set when a payment is started
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
 
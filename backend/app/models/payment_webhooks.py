@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
+from ..database import Base
+from datetime import datetime
+
+class PaymentWebhookEvent(Base):
+    """Inbox of payment gateway webhook deliveries, applied by a background consumer"""
+    __tablename__ = "payment_webhook_events"
+    __table_args__ = (
+        Index("ix_payment_webhook_events_pending", "id", postgresql_where=text("processed_at IS NULL")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    delivery_id = Column(String, unique=True, nullable=False)  # X-Razorpay-Event-Id, for redeliveries
+    event_type = Column(String, nullable=False)
+    payment_id = Column(String, nullable=True, index=True)
+    gateway_order_id = Column(String, nullable=True)
+    amount = Column(Integer, nullable=True)  # captured amount in paise
+    payload = Column(String, nullable=False)  # raw signed body
+    error = Column(String, nullable=True)
+    received_at = Column(DateTime, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True)
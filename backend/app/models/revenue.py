@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Float, Boolean, DateTime, ForeignKey, Index, text
+from sqlalchemy.orm import relationship
+from ..database import Base
+from datetime import datetime
+
+class RevenueLedgerEntry(Base):
+    """Append-only record of stall revenue, folded into `Stall` totals by compaction"""
+    __tablename__ = "revenue_ledger"
+    __table_args__ = (
+        Index("ix_revenue_ledger_unfolded", "stall_id", postgresql_where=text("NOT folded")),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stall_id = Column(Integer, ForeignKey("stalls.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), unique=True)
+    amount = Column(Float, nullable=False)
+    folded = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    stall = relationship("Stall")
+    order = relationship("Order")
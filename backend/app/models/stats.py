@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, Enum, DateTime
+from ..database import Base
+from .tickets import TicketType
+
+class EventTicketStats(Base):
+    """Sales and check-in counters per event and ticket type, kept for dashboards"""
+    __tablename__ = "event_ticket_stats"
+
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    ticket_type = Column(Enum(TicketType), primary_key=True)
+    sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    checked_in = Column(Integer, nullable=False, default=0)
+    reconciled_at = Column(DateTime, nullable=True)
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Enum, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from ..database import Base
+from datetime import datetime
 import enum
 
 class TicketType(str, enum.Enum):
@@ -8,17 +9,33 @@ class TicketType(str, enum.Enum):
     VIP = "vip"
     EARLY_BIRD = "early_bird"
 
+class TicketStatus(str, enum.Enum):
+    HELD = "held"
+    CONFIRMED = "confirmed"
+    EXPIRED = "expired"
+
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        Index("ix_tickets_status_hold_expires_at", "status", "hold_expires_at"),
+        Index("ix_tickets_event_id_status_id", "event_id", "status", "id"),
+        Index("ix_tickets_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_tickets_payment_id", "payment_id", postgresql_where=text("payment_id IS NOT NULL")),
+        Index("ix_tickets_event_id_status_user_id", "event_id", "status", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     event_id = Column(Integer, ForeignKey("events.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     ticket_type = Column(Enum(TicketType))
     price = Column(Float)
-    qr_code = Column(String)
+    qr_payload = Column(String, nullable=True)  # signed payload encoded in the QR image
     is_used = Column(Boolean, default=False)
     payment_id = Column(String)
+    gateway_order_id = Column(String, nullable=True, index=True)  # set when a payment is started
+    status = Column(Enum(TicketStatus), default=TicketStatus.CONFIRMED)
+    hold_expires_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationships
     event = relationship("Event", back_populates="tickets")
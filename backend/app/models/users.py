@@ -22,6 +22,7 @@ class User(Base):
     role = Column(Enum(UserRole))
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
+    unread_notifications = Column(Integer, nullable=False, default=0)  # kept by NotificationService
     
     # Bank account details
     bank_account_number = Column(String, nullable=True)
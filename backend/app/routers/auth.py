@@ -3,7 +3,7 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
-from ..models import users, notifications
+from ..models import users
 from ..schemas import users as user_schemas
 from ..services.user_service import UserService
 from jose import JWTError, jwt
@@ -180,18 +180,10 @@ async def login(
 
 @router.get("/me", response_model=user_schemas.UserOut)
 async def get_current_user_info(
-    db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
-    unread_count = db.query(notifications.Notification).filter(
-        notifications.Notification.user_id == current_user.id,
-        notifications.Notification.is_read == False
-    ).count()
-    
-    return {
-        **current_user.__dict__,
-        "unread_notifications": unread_count
-    }
+    # The unread count is a column on the user, kept by NotificationService
+    return current_user
 
 @router.put("/me", response_model=user_schemas.UserOut)
 async def update_user_info(
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from ..database import get_db
 from ..models import users, events
 from ..schemas import events as event_schemas
 from .auth import oauth2_scheme
 from ..utils.auth import get_current_user
+from ..services.inventory_service import InventoryService
+from ..services.event_cache_service import EventCacheService
+from ..services.stats_service import StatsService
+from ..services.notification_service import NotificationService
+from ..models.notifications import BroadcastAudience
 
 router = APIRouter(
     prefix="/events",
@@ -26,24 +32,113 @@ async def create_event(
     
     db_event = events.Event(**event.dict(), created_by=current_user.id)
     db.add(db_event)
+    db.flush()
+    InventoryService.create_for_event(db, db_event)
+    StatsService.create_for_event(db, db_event)
     db.commit()
+    EventCacheService.invalidate()
     db.refresh(db_event)
     return db_event
 
 @router.get("/", response_model=List[event_schemas.EventInDB])
 async def get_events(
-    skip: int = 0,
-    limit: int = 10,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    venue: Optional[str] = None,
+    is_active: Optional[bool] = None
 ):
-    return db.query(events.Event).offset(skip).limit(limit).all()
+    filters = {"date_from": date_from, "date_to": date_to, "venue": venue, "is_active": is_active}
+    body, next_cursor = await EventCacheService.get(
+        ("list", cursor, skip, limit, *filters.values()),
+        EventCacheService.load_list(filters, cursor, skip, limit)
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/cache-stats")
+async def get_event_cache_stats(
+    current_user: users.User = Depends(get_current_user)
+):
+    if current_user.role != users.UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view cache statistics"
+        )
+    return EventCacheService.get_stats()
 
 @router.get("/{event_id}", response_model=event_schemas.EventInDB)
 async def get_event(
+    event_id: int
+):
+    body = await EventCacheService.get(("detail", event_id), EventCacheService.load_detail(event_id))
+    if body is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return Response(content=body, media_type="application/json")
+
+@router.put("/{event_id}", response_model=event_schemas.EventInDB)
+async def update_event(
     event_id: int,
-    db: Session = Depends(get_db)
+    event_update: event_schemas.EventUpdate,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
 ):
-    event = db.query(events.Event).filter(events.Event.id == event_id).first()
-    if not event:
+    if current_user.role != users.UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can update events"
+        )
+    
+    db_event = db.query(events.Event).filter(events.Event.id == event_id).first()
+    if not db_event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    changes = event_update.dict(exclude_unset=True)
+    if changes.get("capacity") is not None and changes["capacity"] != db_event.capacity:
+        InventoryService.set_event_capacity(db, event_id, changes["capacity"])
+    moved = any(
+        changes.get(key) is not None and changes[key] != getattr(db_event, key)
+        for key in ("venue", "date")
+    )
+    
+    for key, value in changes.items():
+        if value is not None:
+            setattr(db_event, key, value)
+    
+    # Ticket holders hear about venue and time changes
+    if moved:
+        message = f"{db_event.name} is now at {db_event.venue}"
+        if db_event.date is not None:
+            message += f" on {db_event.date:%d %b %Y, %H:%M}"
+        NotificationService.create_broadcast(
+            db,
+            current_user.id,
+            BroadcastAudience.EVENT_TICKET_HOLDERS,
+            title=f"{db_event.name} has changed",
+            message=message,
+            event_id=event_id
+        )
+    
+    db.commit()
+    EventCacheService.invalidate()
+    db.refresh(db_event)
+    return db_event
+
+@router.get("/{event_id}/stats", response_model=event_schemas.EventStats)
+async def get_event_stats(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    if current_user.role not in [users.UserRole.ADMIN, users.UserRole.EVENT_TEAM]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and the event team can view event statistics"
+        )
+    
+    stats = StatsService.get_stats(db, event_id)
+    if stats["capacity"] is None and not stats["ticket_types"]:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event 
\ No newline at end of file
+    return stats
\ No newline at end of file
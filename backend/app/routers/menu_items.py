@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Header, Query, Response, UploadFile, WebSocket, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from ..database import get_db
 from ..models import users, stalls, menu_items
 from ..schemas import menu_items as menu_schemas
 from ..utils.auth import get_current_user
+from ..services.menu_service import MenuService
+from ..services.menu_cache_service import MenuCacheService
+from ..services.order_events_service import OrderEventService
 
 router = APIRouter(
     prefix="/menu-items",
@@ -32,15 +36,81 @@ async def create_menu_item(
     db_item = menu_items.MenuItem(**item.dict())
     db.add(db_item)
     db.commit()
+    MenuCacheService.invalidate(db_item.stall_id)
     db.refresh(db_item)
     return db_item
 
 @router.get("/stall/{stall_id}", response_model=List[menu_schemas.MenuItemOut])
-async def get_stall_menu(stall_id: int, db: Session = Depends(get_db)):
-    return db.query(menu_items.MenuItem).filter(
-        menu_items.MenuItem.stall_id == stall_id,
-        menu_items.MenuItem.is_available == True
-    ).all()
+async def get_stall_menu(
+    stall_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    version = MenuCacheService.get_version(stall_id)
+    headers = {
+        "ETag": MenuCacheService.etag(stall_id, version),
+        "Cache-Control": "public, no-cache"
+    }
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    body = MenuCacheService.get_menu(db, stall_id, version)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def get_owned_stall(db: Session, stall_id: int, current_user: users.User) -> stalls.Stall:
+    stall = db.query(stalls.Stall).filter(
+        stalls.Stall.id == stall_id,
+        stalls.Stall.owner_id == current_user.id
+    ).first()
+    
+    if not stall:
+        raise HTTPException(
+            status_code=403,
+            detail="You don't have permission to manage this stall's menu"
+        )
+    return stall
+
+@router.post("/stall/{stall_id}/import", response_model=menu_schemas.MenuImportResult)
+async def import_menu(
+    stall_id: int,
+    menu_import: menu_schemas.MenuImport,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    get_owned_stall(db, stall_id, current_user)
+    result = MenuService.import_menu(db, stall_id, menu_import.items)
+    MenuCacheService.invalidate(stall_id)
+    return result
+
+@router.post("/stall/{stall_id}/import-csv", response_model=menu_schemas.MenuImportResult)
+async def import_menu_csv(
+    stall_id: int,
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    get_owned_stall(db, stall_id, current_user)
+    rows = MenuService.parse_csv(await file.read())
+    if not rows or len(rows) > 1000:
+        raise HTTPException(status_code=400, detail="CSV must have between 1 and 1000 rows")
+    
+    result = MenuService.import_menu(db, stall_id, rows)
+    MenuCacheService.invalidate(stall_id)
+    return result
+
+@router.get("/stall/{stall_id}/export")
+async def export_menu(
+    stall_id: int,
+    format: str = Query("csv", pattern="^(csv|json)$"),
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    get_owned_stall(db, stall_id, current_user)
+    return StreamingResponse(
+        MenuService.export_menu(stall_id, format),
+        media_type="text/csv" if format == "csv" else "application/json",
+        headers={"Content-Disposition": f'attachment; filename="menu-{stall_id}.{format}"'}
+    )
 
 @router.put("/{item_id}", response_model=menu_schemas.MenuItemOut)
 async def update_menu_item(
@@ -57,9 +127,50 @@ async def update_menu_item(
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     
-    for key, value in item_update.dict(exclude_unset=True).items():
+    changes = item_update.dict(exclude_unset=True)
+    stock = changes.pop("stock", db_item.stock)
+    for key, value in changes.items():
         setattr(db_item, key, value)
     
+    if stock is not None and db_item.stock is not None:
+        # Apply a new count as a relative change, so it never overwrites concurrent sales
+        if stock != db_item.stock:
+            MenuService.adjust_stock(db, db_item, stock - db_item.stock)
+    else:
+        # Starting or stopping stock tracking; orders never touch untracked items
+        db_item.stock = stock
+    
+    db.commit()
+    MenuCacheService.invalidate(db_item.stall_id)
+    db.refresh(db_item)
+    OrderEventService.publish_stock([db_item])
+    return db_item
+
+@router.post("/{item_id}/stock", response_model=menu_schemas.MenuItemOut)
+async def adjust_menu_item_stock(
+    item_id: int,
+    adjustment: menu_schemas.MenuItemStockAdjust,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    db_item = db.query(menu_items.MenuItem).join(stalls.Stall).filter(
+        menu_items.MenuItem.id == item_id,
+        stalls.Stall.owner_id == current_user.id
+    ).first()
+    
+    if not db_item:
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    # Relative change, so restocking never overwrites concurrent sales
+    stock_change = MenuService.adjust_stock(db, db_item, adjustment.delta)
     db.commit()
+    MenuCacheService.invalidate(db_item.stall_id)
+    OrderEventService.publish_stock([stock_change])
+    
     db.refresh(db_item)
-    return db_item 
\ No newline at end of file
+    return db_item
+
+@router.websocket("/ws/stall/{stall_id}")
+async def stall_menu_updates(websocket: WebSocket, stall_id: int):
+    await websocket.accept()
+    await OrderEventService.stream(websocket, OrderEventService.menu_channel(stall_id)) 
\ No newline at end of file
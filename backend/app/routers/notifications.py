@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
-from ..models import notifications
+from ..models import notifications, users
 from ..schemas import notifications as notification_schemas
+from ..services.notification_service import NotificationService
 from ..utils.auth import get_current_user
 
 router = APIRouter(
@@ -30,7 +31,7 @@ async def mark_as_read(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    notification = db.query(notifications.Notification).filter(
+    notification = db.query(notifications.Notification.id).filter(
         notifications.Notification.id == notification_id,
         notifications.Notification.user_id == current_user.id
     ).first()
@@ -38,7 +39,7 @@ async def mark_as_read(
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    notification.is_read = True
+    NotificationService.mark_read(db, current_user.id, notification_id)
     db.commit()
     return {"message": "Notification marked as read"}
 
@@ -47,10 +48,42 @@ async def mark_all_as_read(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    db.query(notifications.Notification).filter(
-        notifications.Notification.user_id == current_user.id,
-        notifications.Notification.is_read == False
-    ).update({"is_read": True})
+    NotificationService.mark_read(db, current_user.id)
+    db.commit()
+    return {"message": "All notifications marked as read"} 
+
+@router.post("/broadcasts", response_model=notification_schemas.BroadcastOut, status_code=status.HTTP_202_ACCEPTED)
+async def create_broadcast(
+    broadcast: notification_schemas.BroadcastCreate,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    if current_user.role not in [users.UserRole.ADMIN, users.UserRole.EVENT_TEAM]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and the event team can send broadcasts"
+        )
     
+    db_broadcast = NotificationService.create_broadcast(db, current_user.id, **broadcast.dict())
     db.commit()
-    return {"message": "All notifications marked as read"} 
\ No newline at end of file
+    db.refresh(db_broadcast)
+    return db_broadcast
+
+@router.get("/broadcasts/{broadcast_id}", response_model=notification_schemas.BroadcastOut)
+async def get_broadcast(
+    broadcast_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    if current_user.role not in [users.UserRole.ADMIN, users.UserRole.EVENT_TEAM]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and the event team can view broadcasts"
+        )
+    
+    broadcast = db.query(notifications.NotificationBroadcast).filter(
+        notifications.NotificationBroadcast.id == broadcast_id
+    ).first()
+    if not broadcast:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    return broadcast
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
-from ..database import get_db
-from ..models import users, orders, menu_items
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, WebSocket, status
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Optional
+from ..database import SessionLocal, get_db
+from ..models import users, orders, stalls
 from ..schemas import orders as order_schemas
-from ..utils.auth import get_current_user
-from ..services.notification_service import NotificationService
+from ..utils.auth import get_current_user, get_user_from_token
+from ..utils.pagination import paginate_newest_first
+from ..services.order_service import OrderService, OPEN_ORDER_STATUSES
+from ..services.idempotency_service import IdempotentRequest
+from ..services.order_events_service import OrderEventService
 
 router = APIRouter(
     prefix="/orders",
@@ -16,63 +18,29 @@ router = APIRouter(
 @router.post("/", response_model=order_schemas.OrderOut)
 async def create_order(
     order_data: order_schemas.OrderCreate,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
-    # Calculate total amount and verify items
-    total_amount = 0
-    order_items = []
+    idempotent = IdempotentRequest("orders.create", current_user.id, idempotency_key, order_data)
+    if idempotent.replay is not None:
+        return idempotent.replay
     
-    for item in order_data.items:
-        menu_item = db.query(menu_items.MenuItem).filter(
-            menu_items.MenuItem.id == item.menu_item_id,
-            menu_items.MenuItem.stall_id == order_data.stall_id,
-            menu_items.MenuItem.is_available == True
-        ).first()
-        
-        if not menu_item:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Menu item {item.menu_item_id} not available"
-            )
-        
-        total_amount += menu_item.price * item.quantity
-        order_items.append({
-            "menu_item_id": menu_item.id,
-            "quantity": item.quantity,
-            "price_at_time": menu_item.price
-        })
-    
-    # Create order
-    db_order = orders.Order(
-        user_id=current_user.id,
-        stall_id=order_data.stall_id,
-        total_amount=total_amount
-    )
-    db.add(db_order)
-    db.commit()
-    db.refresh(db_order)
-    
-    # Create order items
-    for item in order_items:
-        db_order_item = orders.OrderItem(
-            order_id=db_order.id,
-            **item
-        )
-        db.add(db_order_item)
-    
-    db.commit()
-    db.refresh(db_order)
-    return db_order
+    with idempotent:
+        order = OrderService.create_order(db, current_user, order_data)
+        return idempotent.save(order_schemas.OrderOut.model_validate(order, from_attributes=True))
 
-@router.get("/my-orders", response_model=List[order_schemas.OrderOut])
+@router.get("/my-orders", response_model=order_schemas.OrderPage)
 async def get_my_orders(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
-    return db.query(orders.Order).filter(
-        orders.Order.user_id == current_user.id
-    ).order_by(orders.Order.created_at.desc()).all()
+    query = db.query(orders.Order).options(
+        selectinload(orders.Order.items).selectinload(orders.OrderItem.menu_item)
+    ).filter(orders.Order.user_id == current_user.id)
+    return paginate_newest_first(query, orders.Order, cursor, limit)
 
 @router.put("/{order_id}/status")
 async def update_order_status(
@@ -97,12 +65,77 @@ async def update_order_status(
             detail="You don't have permission to update this order"
         )
     
-    order.status = status
-    if status == orders.OrderStatus.COMPLETED:
-        order.completed_at = datetime.utcnow()
+    if not OrderService.transition(db, order.stall_id, [order.id], status):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Order is already {order.status.value}"
+        )
+    return {"message": "Order status updated successfully"}
+
+@router.post("/bulk-status", response_model=order_schemas.OrderStatusBulkResult)
+async def bulk_update_order_status(
+    update_data: order_schemas.OrderStatusBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    stall = OrderService.get_owned_stall(db, current_user)
+    updated = OrderService.transition(db, stall.id, update_data.order_ids, update_data.status)
     
-    # Create notification for order status change
-    NotificationService.create_order_status_notification(db, order, status)
+    updated_ids = set(updated)
+    return {
+        "status": update_data.status,
+        "updated": updated,
+        "skipped": [order_id for order_id in update_data.order_ids if order_id not in updated_ids]
+    }
+
+@router.get("/stall-queue", response_model=List[order_schemas.OrderOut])
+async def get_stall_queue(
+    status: Optional[orders.OrderStatus] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    stall = OrderService.get_owned_stall(db, current_user)
+    if status and status not in OPEN_ORDER_STATUSES:
+        raise HTTPException(status_code=400, detail="The queue only holds open orders")
+    return OrderService.get_queue(db, stall.id, status, limit)
+
+@router.websocket("/ws/stall/{stall_id}")
+async def stall_order_board(
+    websocket: WebSocket,
+    stall_id: int,
+    token: str = Query(...)
+):
+    # Short-lived session so open sockets don't hold database connections
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+        allowed = user is not None and db.query(stalls.Stall.id).filter(
+            stalls.Stall.id == stall_id,
+            stalls.Stall.owner_id == user.id
+        ).first() is not None
+    finally:
+        db.close()
+    
+    if not allowed:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    await OrderEventService.stream(websocket, OrderEventService.stall_channel(stall_id))
+
+@router.websocket("/ws/my-orders")
+async def my_order_updates(
+    websocket: WebSocket,
+    token: str = Query(...)
+):
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(db, token)
+    finally:
+        db.close()
     
-    db.commit()
-    return {"message": "Order status updated successfully"} 
\ No newline at end of file
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    await OrderEventService.stream(websocket, OrderEventService.user_channel(user.id)) 
\ No newline at end of file
@@ -1,65 +1,170 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from anyio import from_thread
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Dict
-import razorpay
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Optional
+import json
 from ..database import get_db
-from ..models import tickets, users
-from ..config import settings
+from ..models import orders, tickets, users
 from .auth import get_current_user
+from ..services.hold_service import HoldService
+from ..services.idempotency_service import IdempotentRequest
+from ..services.payment_service import PaymentService
+from ..services.payment_webhook_service import PaymentWebhookService
+from ..utils.background import run_with_session
 
 router = APIRouter(
     prefix="/payments",
     tags=["Payments"]
 )
 
-razorpay_client = razorpay.Client(
-    auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-)
-
 @router.post("/create-order")
 async def create_payment_order(
-    amount: int,
+    ticket_ids: Optional[List[int]] = Query(None),
+    order_id: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
-    try:
-        payment_order = razorpay_client.order.create({
-            'amount': amount * 100,  # amount in paisa
-            'currency': 'INR',
-            'payment_capture': 1
-        })
-        return payment_order
-    except Exception as e:
+    # Price the payment on the server, in paise, exactly as verify will check it
+    # Only unpaid tickets and orders can be charged, so nothing is paid for twice
+    unpaid_tickets = [
+        tickets.Ticket.id.in_(ticket_ids or []),
+        tickets.Ticket.user_id == current_user.id,
+        tickets.Ticket.status.in_([tickets.TicketStatus.HELD, tickets.TicketStatus.EXPIRED]),
+        tickets.Ticket.payment_id.is_(None)
+    ]
+    unpaid_order = [
+        orders.Order.id == order_id,
+        orders.Order.user_id == current_user.id,
+        orders.Order.payment_id.is_(None)
+    ]
+    total = 0.0
+    if ticket_ids:
+        prices = db.query(tickets.Ticket.price).filter(*unpaid_tickets).all()
+        if len(prices) != len(set(ticket_ids)):
+            raise HTTPException(status_code=404, detail="Ticket not found or already paid")
+        total += sum(price for price, in prices)
+    if order_id:
+        order_total = db.query(orders.Order.total_amount).filter(*unpaid_order).scalar()
+        if order_total is None:
+            raise HTTPException(status_code=404, detail="Order not found or already paid")
+        total += order_total
+    amount = round(total * 100)
+    if amount <= 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+            detail="Nothing to pay for"
         )
+    
+    payment_order = await PaymentService.create_order(amount)
+    
+    # Remember what this payment is for, so its webhook can be applied without the browser
+    if ticket_ids:
+        db.query(tickets.Ticket).filter(*unpaid_tickets).update(
+            {"gateway_order_id": payment_order['id']}, synchronize_session=False
+        )
+    if order_id:
+        db.query(orders.Order).filter(*unpaid_order).update(
+            {"gateway_order_id": payment_order['id']}, synchronize_session=False
+        )
+    db.commit()
+    
+    return payment_order
+
+@router.post("/webhook")
+async def receive_payment_webhook(
+    request: Request,
+    x_razorpay_signature: Optional[str] = Header(None),
+    x_razorpay_event_id: Optional[str] = Header(None)
+):
+    body = await request.body()
+    PaymentService.verify_webhook_signature(body, x_razorpay_signature)
+    await run_in_threadpool(run_with_session, PaymentWebhookService.store, body, x_razorpay_event_id)
+    return {"status": "accepted"}
 
+@router.get("/gateway-stats")
+async def get_gateway_stats(
+    current_user: users.User = Depends(get_current_user)
+):
+    if current_user.role != users.UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can view payment gateway statistics"
+        )
+    return PaymentService.get_stats()
+
+# Plain def: FastAPI runs it on the threadpool, off the event loop
 @router.post("/verify")
-async def verify_payment(
+def verify_payment(
     payment_details: Dict,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
+    idempotent = IdempotentRequest("payments.verify", current_user.id, idempotency_key, payment_details)
+    if idempotent.replay is not None:
+        return idempotent.replay
+    
+    with idempotent:
+        return idempotent.save(_verify_payment(payment_details, db, current_user))
+
+def _verify_payment(payment_details: Dict, db: Session, current_user: users.User):
     try:
-        # Verify payment signature
-        params_dict = {
-            'razorpay_payment_id': payment_details['razorpay_payment_id'],
-            'razorpay_order_id': payment_details['razorpay_order_id'],
-            'razorpay_signature': payment_details['razorpay_signature']
-        }
-        razorpay_client.utility.verify_payment_signature(params_dict)
+        PaymentService.verify_signature(payment_details)
+        
+        # Only the tickets this gateway order was created for can be paid by it
+        gateway_order_id = payment_details['razorpay_order_id']
+        ticket_ids = payment_details.get('ticket_ids') or [payment_details['ticket_id']]
+        stamped = db.query(tickets.Ticket.id, tickets.Ticket.price).filter(
+            tickets.Ticket.gateway_order_id == gateway_order_id,
+            tickets.Ticket.user_id == current_user.id
+        ).all()
+        if not stamped or {int(ticket_id) for ticket_id in ticket_ids} != {ticket.id for ticket in stamped}:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Tickets do not match this payment"
+            )
         
-        # Update ticket payment status
-        ticket = db.query(tickets.Ticket).filter(
-            tickets.Ticket.id == payment_details['ticket_id']
-        ).first()
+        # A gateway order can also pay for a stall order created alongside the tickets
+        order_total = db.query(func.sum(orders.Order.total_amount)).filter(
+            orders.Order.gateway_order_id == gateway_order_id,
+            orders.Order.user_id == current_user.id
+        ).scalar() or 0.0
         
-        if ticket:
-            ticket.payment_id = payment_details['razorpay_payment_id']
-            db.commit()
+        # Plain def route: hop onto the event loop for the gateway call
+        payment_order = from_thread.run(PaymentService.fetch_order, gateway_order_id)
+        payment_id = payment_details['razorpay_payment_id']
+        try:
+            if payment_order['amount'] != round((sum(ticket.price for ticket in stamped) + order_total) * 100):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Payment amount does not match the tickets and orders"
+                )
+            
+            # Turn the held tickets into a sale; bulk bookings pay for several at once
+            HoldService.confirm_tickets(db, [ticket.id for ticket in stamped], payment_id)
+        except HTTPException as e:
+            # The money is already captured, so finance needs a record to refund or reconcile
+            db.rollback()
+            PaymentWebhookService.record_failure(
+                db,
+                payment_id,
+                gateway_order_id,
+                payment_order['amount'],
+                e.detail,
+                json.dumps(payment_details)
+            )
+            raise
+        db.query(orders.Order).filter(
+            orders.Order.gateway_order_id == gateway_order_id,
+            orders.Order.payment_id.is_(None)
+        ).update({"payment_id": payment_id}, synchronize_session=False)
+        db.commit()
         
         return {"status": "Payment verified successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..schemas import search as search_schemas
+from ..services.search_service import SearchService, SEARCH_KINDS
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"]
+)
+
+@router.get("/", response_model=search_schemas.SearchResults)
+async def search(
+    q: str = Query(..., min_length=2, max_length=100),
+    type: str = Query("all", pattern="^(all|event|stall)$"),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=500),
+    db: Session = Depends(get_db)
+):
+    kinds = list(SEARCH_KINDS) if type == "all" else [type]
+    # Fetch one extra row to know whether another page exists
+    items = SearchService.search(db, q, kinds, limit + 1, offset)
+    return {
+        "items": items[:limit],
+        "next_offset": offset + limit if len(items) > limit else None
+    }
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
 from ..models import users, stalls
 from ..schemas import stalls as stall_schemas
 from ..utils.auth import get_current_user
+from ..services.revenue_service import RevenueService
 
 router = APIRouter(
     prefix="/stalls",
@@ -69,6 +70,8 @@ async def update_bank_details(
 
 @router.get("/revenue-summary")
 async def get_revenue_summary(
+    after_id: int = 0,
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
@@ -79,18 +82,11 @@ async def get_revenue_summary(
         )
     
     if current_user.role == users.UserRole.ADMIN:
-        # Get all stalls revenue for admin
-        all_stalls = db.query(stalls.Stall).all()
+        # Get a page of stall revenue for admin, ordered by stall ID
+        stalls_revenue = RevenueService.get_summary(db, after_id=after_id, limit=limit)
         return {
-            "stalls_revenue": [
-                {
-                    "stall_id": stall.id,
-                    "stall_name": stall.name,
-                    "total_revenue": stall.total_revenue,
-                    "pending_payment": stall.pending_payment
-                }
-                for stall in all_stalls
-            ]
+            "stalls_revenue": stalls_revenue,
+            "next_after_id": stalls_revenue[-1]["stall_id"] if len(stalls_revenue) == limit else None
         }
     else:
         # Get specific stall revenue for stall owner
@@ -100,8 +96,9 @@ async def get_revenue_summary(
         
         if not stall:
             raise HTTPException(status_code=404, detail="No stall found")
-            
+        
+        revenue = RevenueService.get_summary(db, stall_id=stall.id, limit=1)[0]
         return {
-            "total_revenue": stall.total_revenue,
-            "pending_payment": stall.pending_payment
-        } 
\ No newline at end of file
+            "total_revenue": revenue["total_revenue"],
+            "pending_payment": revenue["pending_payment"]
+        }
\ No newline at end of file
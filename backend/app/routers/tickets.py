@@ -1,95 +1,343 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header, Query, Response, status
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from typing import List
-import qrcode
-import io
-import base64
+from typing import Optional
 from ..database import get_db
 from ..models import tickets, users, events
 from ..schemas import tickets as ticket_schemas
 from ..utils.auth import get_current_user
+from ..services.inventory_service import InventoryService
+from ..services.hold_service import HoldService
+from ..services.waiting_room_service import WaitingRoomService
+from ..services.qr_service import QRService
+from ..services.gate_service import GateService, ScanResult
+from ..services.snapshot_service import SnapshotService
+from ..services.stats_service import StatsService
+from ..utils.logger import logger
+from ..utils.background import run_with_session
+from ..utils.pagination import paginate_newest_first
 
 router = APIRouter(
     prefix="/tickets",
     tags=["Tickets"]
 )
 
-def generate_qr_code(ticket_id: int, event_id: int) -> str:
-    # Generate QR code with ticket and event info
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(f"ticket_id:{ticket_id},event_id:{event_id}")
-    qr.make(fit=True)
-    
-    # Create QR code image
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert to base64 string
-    buffered = io.BytesIO()
-    img.save(buffered, format="PNG")
-    return base64.b64encode(buffered.getvalue()).decode()
-
 @router.post("/book", response_model=ticket_schemas.TicketOut)
 async def book_ticket(
     ticket_data: ticket_schemas.TicketCreate,
+    x_admission_token: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
-    # Check if event exists and has capacity
+    # Only callers let through the waiting room may book
+    WaitingRoomService.verify_admission(x_admission_token, ticket_data.event_id, current_user.id)
+    
+    # Check if event exists
     event = db.query(events.Event).filter(events.Event.id == ticket_data.event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
-    # Count existing tickets
-    ticket_count = db.query(tickets.Ticket).filter(
-        tickets.Ticket.event_id == ticket_data.event_id
-    ).count()
-    
-    if ticket_count >= event.capacity:
-        raise HTTPException(status_code=400, detail="Event is fully booked")
+    # Atomically take a seat; paid tickets are only held until payment is verified
+    price = InventoryService.get_price(db, event.id, ticket_data.ticket_type)
+    needs_payment = price > 0
+    try:
+        InventoryService.reserve(db, event.id, ticket_data.ticket_type, hold=needs_payment)
+    except HTTPException:
+        db.rollback()
+        raise
     
     # Create ticket
     db_ticket = tickets.Ticket(
-        **ticket_data.dict(),
-        user_id=current_user.id
+        **ticket_data.dict(exclude={"user_id"}),
+        price=price,
+        user_id=current_user.id,
+        status=tickets.TicketStatus.HELD if needs_payment else tickets.TicketStatus.CONFIRMED,
+        hold_expires_at=HoldService.hold_expiry() if needs_payment else None
     )
     db.add(db_ticket)
+    db.flush()
+    
+    # Store only the signed payload; the image is rendered on demand
+    db_ticket.qr_payload = QRService.sign(db_ticket.id, db_ticket.event_id)
+    if not needs_payment:
+        StatsService.record_sales(db, [db_ticket])
     db.commit()
     db.refresh(db_ticket)
     
-    # Generate QR code
-    db_ticket.qr_code = generate_qr_code(db_ticket.id, db_ticket.event_id)
+    return db_ticket
+
+@router.post("/book-bulk", response_model=ticket_schemas.TicketBulkOut)
+async def book_tickets_bulk(
+    booking: ticket_schemas.TicketBulkCreate,
+    background_tasks: BackgroundTasks,
+    x_admission_token: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    WaitingRoomService.verify_admission(x_admission_token, booking.event_id, current_user.id)
+    
+    event = db.query(events.Event).filter(events.Event.id == booking.event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    # One inventory operation for the whole group
+    price = InventoryService.get_price(db, event.id, booking.ticket_type)
+    needs_payment = price > 0
+    try:
+        InventoryService.reserve(db, event.id, booking.ticket_type, booking.quantity, hold=needs_payment)
+    except HTTPException:
+        db.rollback()
+        raise
+    
+    ticket_status = tickets.TicketStatus.HELD if needs_payment else tickets.TicketStatus.CONFIRMED
+    hold_expires_at = HoldService.hold_expiry() if needs_payment else None
+    # RETURNING hands back what the stats need, so there is no read-back query
+    booked = db.execute(
+        insert(tickets.Ticket).returning(
+            tickets.Ticket.id, tickets.Ticket.event_id, tickets.Ticket.ticket_type, tickets.Ticket.price
+        ),
+        [
+            {
+                "event_id": event.id,
+                "user_id": current_user.id,
+                "ticket_type": booking.ticket_type,
+                "price": price,
+                "is_used": False,
+                "status": ticket_status,
+                "hold_expires_at": hold_expires_at
+            }
+        ] * booking.quantity
+    ).all()
+    ticket_ids = [ticket.id for ticket in booked]
+    if not needs_payment:
+        StatsService.record_sales(db, booked)
     db.commit()
     
-    return db_ticket
+    # QR payloads are signed after the response has been sent
+    background_tasks.add_task(run_with_session, QRService.fill_payloads, ticket_ids)
+    
+    return {
+        "event_id": event.id,
+        "ticket_type": booking.ticket_type,
+        "quantity": booking.quantity,
+        "ticket_ids": ticket_ids,
+        "status": ticket_status,
+        "hold_expires_at": hold_expires_at
+    }
+
+@router.get("/availability/{event_id}", response_model=ticket_schemas.EventAvailability)
+async def get_availability(
+    event_id: int,
+    db: Session = Depends(get_db)
+):
+    return InventoryService.get_availability(db, event_id)
 
-@router.get("/my-tickets", response_model=List[ticket_schemas.TicketOut])
+@router.put("/inventory/{event_id}")
+async def set_ticket_type_capacity(
+    event_id: int,
+    capacity_update: ticket_schemas.TicketTypeCapacityUpdate,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    if current_user.role not in [users.UserRole.ADMIN, users.UserRole.EVENT_TEAM]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and the event team can change ticket quotas"
+        )
+    
+    InventoryService.set_type_capacity(
+        db, event_id, capacity_update.ticket_type, capacity_update.capacity
+    )
+    return {"message": "Ticket quota updated successfully"}
+
+@router.put("/pricing/{event_id}")
+async def set_ticket_type_price(
+    event_id: int,
+    price_update: ticket_schemas.TicketTypePriceUpdate,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    if current_user.role not in [users.UserRole.ADMIN, users.UserRole.EVENT_TEAM]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and the event team can change ticket prices"
+        )
+    
+    InventoryService.set_type_price(db, event_id, price_update.ticket_type, price_update.price)
+    return {"message": "Ticket price updated successfully"}
+
+@router.get("/my-tickets", response_model=ticket_schemas.TicketPage)
 async def get_my_tickets(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
-    return db.query(tickets.Ticket).filter(tickets.Ticket.user_id == current_user.id).all()
+    query = db.query(tickets.Ticket).filter(tickets.Ticket.user_id == current_user.id)
+    return paginate_newest_first(query, tickets.Ticket, cursor, limit)
 
-@router.post("/verify-ticket/{ticket_id}")
-async def verify_ticket(
+@router.get("/{ticket_id}/qr")
+async def get_ticket_qr(
     ticket_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: users.User = Depends(get_current_user)
 ):
-    # Check if user is volunteer or admin
+    ticket = db.query(tickets.Ticket).filter(tickets.Ticket.id == ticket_id).first()
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    if ticket.user_id != current_user.id and current_user.role not in [users.UserRole.VOLUNTEER, users.UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to view this ticket"
+        )
+    
+    if not ticket.qr_payload:
+        ticket.qr_payload = QRService.sign(ticket.id, ticket.event_id)
+        db.commit()
+    
+    # The payload never changes for a ticket, so the image can be cached forever
+    headers = {
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "ETag": f'"{ticket.qr_payload}"'
+    }
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    png = await QRService.render_png(ticket.qr_payload)
+    return Response(content=png, media_type="image/png", headers=headers)
+
+def require_gate_staff(current_user: users.User):
     if current_user.role not in [users.UserRole.VOLUNTEER, users.UserRole.ADMIN]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only volunteers and admins can verify tickets"
         )
+
+@router.post("/verify-ticket/{ticket_id}")
+async def verify_ticket(
+    ticket_id: int,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    # Check if user is volunteer or admin
+    require_gate_staff(current_user)
     
     ticket = db.query(tickets.Ticket).filter(tickets.Ticket.id == ticket_id).first()
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    if ticket.is_used:
+    if ticket.status != tickets.TicketStatus.CONFIRMED:
+        raise HTTPException(status_code=400, detail="Ticket has not been paid for")
+    
+    if GateService.is_open(ticket.event_id):
+        used = GateService.check_in(db, ticket.event_id, [ticket.id])[0] != ScanResult.ADMITTED
+    else:
+        # Conditional update so two scanners cannot both admit the same ticket
+        used = not db.query(tickets.Ticket).filter(
+            tickets.Ticket.id == ticket_id,
+            tickets.Ticket.is_used == False
+        ).update({"is_used": True}, synchronize_session=False)
+        if not used:
+            StatsService.record_checkins(db, [ticket])
+        db.commit()
+    
+    if used:
         raise HTTPException(status_code=400, detail="Ticket has already been used")
     
-    ticket.is_used = True
-    db.commit()
+    return {"status": "Ticket verified successfully"}
+
+@router.post("/gate/{event_id}/open")
+async def open_gate(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    require_gate_staff(current_user)
     
-    return {"status": "Ticket verified successfully"} 
\ No newline at end of file
+    event = db.query(events.Event.id).filter(events.Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    loaded = GateService.open_gate(db, event_id)
+    return {"message": "Gate opened", "tickets_loaded": loaded}
+
+@router.post("/gate/{event_id}/close")
+async def close_gate(
+    event_id: int,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    require_gate_staff(current_user)
+    GateService.close_gate(db, event_id)
+    return {"message": "Gate closed"}
+
+@router.post("/gate/{event_id}/verify", response_model=ticket_schemas.GateScanResults)
+async def verify_gate_scans(
+    event_id: int,
+    scan_batch: ticket_schemas.GateScanBatch,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    require_gate_staff(current_user)
+    
+    if not GateService.is_open(event_id):
+        raise HTTPException(status_code=409, detail="Gate is not open for this event")
+    
+    # Forged payloads and tickets for other events are rejected without a lookup
+    ticket_ids = []
+    for payload in scan_batch.scans:
+        decoded = QRService.verify(payload)
+        ticket_ids.append(decoded[0] if decoded and decoded[1] == event_id else None)
+    
+    checked = iter(GateService.check_in(
+        db, event_id, [ticket_id for ticket_id in ticket_ids if ticket_id is not None]
+    ))
+    return {
+        "results": [
+            {
+                "payload": payload,
+                "ticket_id": ticket_id,
+                "result": next(checked) if ticket_id is not None else ScanResult.INVALID
+            }
+            for payload, ticket_id in zip(scan_batch.scans, ticket_ids)
+        ]
+    }
+
+@router.get("/gate/{event_id}/snapshot")
+async def get_gate_snapshot(
+    event_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    require_gate_staff(current_user)
+    
+    version, ticket_count, payload = SnapshotService.get_snapshot(db, event_id)
+    headers = {
+        "ETag": f'"{event_id}-{version}"',
+        "X-Snapshot-Version": str(version),
+        "X-Ticket-Count": str(ticket_count),
+        "Cache-Control": "private, no-cache"
+    }
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    return Response(content=payload, media_type="application/octet-stream", headers=headers)
+
+@router.post("/gate/{event_id}/sync", response_model=ticket_schemas.OfflineSyncResult)
+async def sync_offline_scans(
+    event_id: int,
+    scan_batch: ticket_schemas.OfflineScanBatch,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    require_gate_staff(current_user)
+    
+    result = SnapshotService.sync_scans(db, event_id, scan_batch.scans)
+    if result["conflicts"]:
+        logger.warning(
+            f"Scanner {scan_batch.scanner_id} synced {len(result['conflicts'])} conflicting scans for event {event_id}"
+        )
+    return result
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Response
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..models import users, events
+from ..schemas import waiting_room as waiting_room_schemas
+from ..services.waiting_room_service import WaitingRoomService
+from ..utils.auth import get_current_user
+
+router = APIRouter(
+    prefix="/waiting-room",
+    tags=["Waiting Room"]
+)
+
+@router.post("/{event_id}/join", response_model=waiting_room_schemas.WaitingRoomStatus)
+async def join_waiting_room(
+    event_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: users.User = Depends(get_current_user)
+):
+    event = db.query(events.Event.id).filter(events.Event.id == event_id).first()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    queue_status = WaitingRoomService.join(event_id, current_user.id)
+    response.headers["Retry-After"] = str(queue_status["retry_after"])
+    return queue_status
+
+@router.get("/{event_id}/status", response_model=waiting_room_schemas.WaitingRoomStatus)
+async def get_waiting_room_status(
+    event_id: int,
+    response: Response,
+    x_queue_token: str = Header(...)
+):
+    # Authenticated by the signed queue token alone so polling never hits the database
+    queue_status = WaitingRoomService.get_status(event_id, x_queue_token)
+    response.headers["Retry-After"] = str(queue_status["retry_after"])
+    response.headers["Cache-Control"] = "no-store"
+    return queue_status
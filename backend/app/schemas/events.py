@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from ..models.tickets import TicketType
 
 class EventBase(BaseModel):
     name: str
@@ -13,7 +14,13 @@ class EventBase(BaseModel):
 class EventCreate(EventBase):
     pass
 
-class EventUpdate(EventBase):
+class EventUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    venue: Optional[str] = None
+    date: Optional[datetime] = None
+    capacity: Optional[int] = None
+    poster_url: Optional[str] = None
     is_active: Optional[bool] = None
 
 class EventInDB(EventBase):
@@ -23,4 +30,21 @@ class EventInDB(EventBase):
     created_by: int
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+class TicketTypeStats(BaseModel):
+    ticket_type: TicketType
+    sold: int
+    revenue: float
+    checked_in: int
+    check_in_rate: float
+
+class EventStats(BaseModel):
+    event_id: int
+    capacity: Optional[int]
+    sold: int
+    revenue: float
+    checked_in: int
+    check_in_rate: float
+    reconciled_at: Optional[datetime]
+    ticket_types: List[TicketTypeStats]
\ No newline at end of file
@@ -1,11 +1,12 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, confloat, conint, conlist, constr
+from typing import Any, Dict, Optional
 
 class MenuItemBase(BaseModel):
     name: str
     description: Optional[str] = None
     price: float
     is_available: bool = True
+    stock: Optional[conint(ge=0)] = None
 
 class MenuItemCreate(MenuItemBase):
     stall_id: int
@@ -13,6 +14,24 @@ class MenuItemCreate(MenuItemBase):
 class MenuItemUpdate(MenuItemBase):
     pass
 
+class MenuItemImportRow(BaseModel):
+    name: constr(strip_whitespace=True, min_length=1)
+    description: Optional[str] = None
+    price: confloat(ge=0)
+    is_available: bool = True
+    stock: Optional[conint(ge=0)] = None
+
+class MenuImport(BaseModel):
+    # Rows are validated one by one so errors can be reported per row
+    items: conlist(Dict[str, Any], min_length=1, max_length=1000)
+
+class MenuImportResult(BaseModel):
+    created: int
+    updated: int
+
+class MenuItemStockAdjust(BaseModel):
+    delta: int
+
 class MenuItemOut(MenuItemBase):
     id: int
     stall_id: int
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
-from ..models.notifications import NotificationType
+from ..models.notifications import BroadcastAudience, BroadcastStatus, NotificationType
+from ..models.users import UserRole
 
 class NotificationBase(BaseModel):
     type: NotificationType
@@ -17,4 +18,25 @@ class NotificationOut(NotificationBase):
     created_at: datetime
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True 
+
+class BroadcastCreate(BaseModel):
+    audience: BroadcastAudience
+    event_id: Optional[int] = None
+    role: Optional[UserRole] = None
+    type: NotificationType = NotificationType.EVENT_UPDATE
+    title: str
+    message: str
+
+class BroadcastOut(BroadcastCreate):
+    id: int
+    status: BroadcastStatus
+    total_recipients: int
+    sent_count: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, conint, conlist
 from typing import List, Optional
 from datetime import datetime
 from .menu_items import MenuItemOut
@@ -6,11 +6,11 @@ from ..models.orders import OrderStatus
 
 class OrderItemCreate(BaseModel):
     menu_item_id: int
-    quantity: int
+    quantity: conint(gt=0)
 
 class OrderCreate(BaseModel):
     stall_id: int
-    items: List[OrderItemCreate]
+    items: conlist(OrderItemCreate, min_length=1)
 
 class OrderItemOut(BaseModel):
     id: int
@@ -31,4 +31,17 @@ class OrderOut(BaseModel):
     items: List[OrderItemOut]
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class OrderStatusBulkUpdate(BaseModel):
+    order_ids: conlist(int, min_length=1, max_length=500)
+    status: OrderStatus
+
+class OrderStatusBulkResult(BaseModel):
+    status: OrderStatus
+    updated: List[int]
+    skipped: List[int]
+
+class OrderPage(BaseModel):
+    items: List[OrderOut]
+    next_cursor: Optional[str] 
\ No newline at end of file
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class SearchResult(BaseModel):
+    type: str
+    id: int
+    title: str
+    score: float
+
+class SearchResults(BaseModel):
+    items: List[SearchResult]
+    next_offset: Optional[int]
@@ -1,20 +1,91 @@
-from pydantic import BaseModel
-from typing import Optional
-from ..models.tickets import TicketType
+from pydantic import BaseModel, confloat, conint, conlist
+from typing import List, Optional
+from datetime import datetime
+from ..models.tickets import TicketType, TicketStatus
 
 class TicketBase(BaseModel):
     event_id: int
     ticket_type: TicketType
-    price: float
 
+# The price is looked up from the event's ticket type pricing, never sent by the client
 class TicketCreate(TicketBase):
     user_id: int
 
+class TicketBulkCreate(TicketBase):
+    quantity: conint(ge=1, le=500)
+
+class TicketBulkOut(BaseModel):
+    event_id: int
+    ticket_type: TicketType
+    quantity: int
+    ticket_ids: List[int]
+    status: TicketStatus
+    hold_expires_at: Optional[datetime]
+
 class TicketOut(TicketBase):
     id: int
-    qr_code: str
+    price: float
+    qr_payload: Optional[str]
     is_used: bool
     payment_id: Optional[str]
+    status: TicketStatus
+    hold_expires_at: Optional[datetime]
+    created_at: datetime
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class TicketPage(BaseModel):
+    items: List[TicketOut]
+    next_cursor: Optional[str]
+
+class TicketTypeAvailability(BaseModel):
+    ticket_type: TicketType
+    capacity: Optional[int]
+    price: Optional[float]
+    sold: int
+    held: int
+
+class EventAvailability(BaseModel):
+    event_id: int
+    capacity: int
+    sold: int
+    held: int
+    available: int
+    ticket_types: List[TicketTypeAvailability]
+
+class TicketTypeCapacityUpdate(BaseModel):
+    ticket_type: TicketType
+    capacity: Optional[int] = None
+
+class TicketTypePriceUpdate(BaseModel):
+    ticket_type: TicketType
+    price: Optional[confloat(ge=0)] = None  # None takes the type off sale
+
+class GateScanBatch(BaseModel):
+    scans: conlist(str, min_length=1, max_length=500)  # QR payloads in scan order
+
+class GateScanResult(BaseModel):
+    payload: str
+    ticket_id: Optional[int]
+    result: str
+
+class GateScanResults(BaseModel):
+    results: List[GateScanResult]
+
+class OfflineScan(BaseModel):
+    ticket_id: int
+    scanned_at: datetime
+
+class OfflineScanBatch(BaseModel):
+    scanner_id: str
+    scans: conlist(OfflineScan, min_length=1, max_length=5000)
+
+class OfflineScanConflict(BaseModel):
+    ticket_id: int
+    scanned_at: datetime
+    reason: str
+
+class OfflineSyncResult(BaseModel):
+    accepted: int
+    conflicts: List[OfflineScanConflict]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class WaitingRoomStatus(BaseModel):
+    event_id: int
+    queue_token: str
+    admitted: bool
+    position: int
+    retry_after: int
+    admission_token: Optional[str] = None
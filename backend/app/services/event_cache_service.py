@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import tuple_
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from cachetools import LRUCache
+import asyncio
+import json
+from ..models.events import Event
+from ..schemas.events import EventInDB
+from ..config import settings
+from ..utils.background import run_with_session
+from ..utils.pagination import decode_cursor, encode_cursor
+from .session_service import redis_client
+
+EVENTS_VERSION_KEY = "events:version"
+
+_response_cache = LRUCache(maxsize=settings.EVENT_CACHE_SIZE)
+_in_flight: Dict[tuple, asyncio.Future] = {}
+_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+def _serialize(value) -> Optional[bytes]:
+    if value is None:
+        return None
+    return json.dumps(jsonable_encoder(value)).encode()
+
+class EventCacheService:
+    """Cache of serialized public event responses, with concurrent misses coalesced"""
+
+    @staticmethod
+    def invalidate():
+        redis_client.incr(EVENTS_VERSION_KEY)
+
+    @staticmethod
+    def get_stats() -> dict:
+        return {**_stats, "size": len(_response_cache), "in_flight": len(_in_flight)}
+
+    @staticmethod
+    async def get(key: tuple, loader: Callable[[Session], Any]) -> Any:
+        """Return the cached response for `key`, loading it with `loader(db)` on a miss"""
+        key = (*key, int(redis_client.get(EVENTS_VERSION_KEY) or 0))
+        if key in _response_cache:
+            _stats["hits"] += 1
+            return _response_cache[key]
+
+        future = _in_flight.get(key)
+        if future is not None:
+            _stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        _stats["misses"] += 1
+        future = asyncio.ensure_future(run_in_threadpool(run_with_session, loader))
+        _in_flight[key] = future
+        try:
+            body = await asyncio.shield(future)
+        finally:
+            _in_flight.pop(key, None)
+        _response_cache[key] = body
+        return body
+
+    @staticmethod
+    def load_list(filters: dict, cursor: Optional[str], skip: int, limit: int) -> Callable[[Session], Tuple[bytes, Optional[str]]]:
+        """Load a page of dated events in (date, id) order and its next cursor"""
+        after = decode_cursor(cursor) if cursor else None
+
+        def loader(db: Session) -> Tuple[bytes, Optional[str]]:
+            query = db.query(Event).filter(Event.date.isnot(None))
+            if filters.get("is_active") is not None:
+                query = query.filter(Event.is_active == filters["is_active"])
+            if filters.get("venue"):
+                query = query.filter(Event.venue == filters["venue"])
+            if filters.get("date_from"):
+                query = query.filter(Event.date >= filters["date_from"])
+            if filters.get("date_to"):
+                query = query.filter(Event.date < filters["date_to"])
+            if after:
+                query = query.filter(tuple_(Event.date, Event.id) > after)
+
+            rows = query.order_by(Event.date, Event.id).offset(skip).limit(limit + 1).all()
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+            return _serialize([EventInDB.model_validate(event, from_attributes=True) for event in rows]), next_cursor
+        return loader
+
+    @staticmethod
+    def load_detail(event_id: int) -> Callable[[Session], Optional[bytes]]:
+        def loader(db: Session) -> Optional[bytes]:
+            event = db.query(Event).filter(Event.id == event_id).first()
+            return _serialize(EventInDB.model_validate(event, from_attributes=True) if event else None)
+        return loader
@@ -0,0 +1,157 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import Dict, List
+from ..models.tickets import Ticket, TicketStatus
+from ..config import settings
+from ..utils.background import run_periodically
+from .stats_service import StatsService
+from .session_service import redis_client
+
+PENDING_CHECKINS_KEY = "gate:pending_checkins"
+GATE_TTL_SECONDS = 24 * 60 * 60
+
+class ScanResult:
+    ADMITTED = "admitted"
+    ALREADY_USED = "already_used"
+    INVALID = "invalid"
+
+class GateService:
+    """Gate check-in against Redis bitsets, with check-ins written in batches"""
+
+    @staticmethod
+    def _keys(event_id: int):
+        return f"gate:{event_id}:open", f"gate:{event_id}:valid", f"gate:{event_id}:used"
+
+    @staticmethod
+    def is_open(event_id: int) -> bool:
+        open_key, _, _ = GateService._keys(event_id)
+        return bool(redis_client.exists(open_key))
+
+    @staticmethod
+    def open_gate(db: Session, event_id: int) -> int:
+        """Load the event's confirmed tickets into the gate bitsets"""
+        open_key, valid_key, used_key = GateService._keys(event_id)
+        redis_client.delete(open_key, valid_key, used_key)
+        # Queued check-ins must reach the database before it is read back
+        GateService.flush_checkins(db)
+
+        loaded = 0
+        pipe = redis_client.pipeline(transaction=False)
+        rows = db.query(Ticket.id, Ticket.is_used).filter(
+            Ticket.event_id == event_id,
+            Ticket.status == TicketStatus.CONFIRMED
+        ).yield_per(5000)
+        for ticket_id, is_used in rows:
+            pipe.setbit(valid_key, ticket_id, 1)
+            if is_used:
+                pipe.setbit(used_key, ticket_id, 1)
+            loaded += 1
+            if loaded % 5000 == 0:
+                pipe.execute()
+        pipe.execute()
+
+        for key in (valid_key, used_key):
+            redis_client.expire(key, GATE_TTL_SECONDS)
+        redis_client.set(open_key, 1, ex=GATE_TTL_SECONDS)
+        return loaded
+
+    @staticmethod
+    def close_gate(db: Session, event_id: int):
+        GateService.flush_checkins(db)
+        redis_client.delete(*GateService._keys(event_id))
+
+    @staticmethod
+    def _validate_missing(db: Session, event_id: int, ticket_ids: List[int]) -> Dict[int, bool]:
+        """Look up tickets missing from the valid bitset; returns the valid ones mapped to is_used"""
+        if not ticket_ids:
+            return {}
+
+        _, valid_key, used_key = GateService._keys(event_id)
+        found = dict(
+            db.query(Ticket.id, Ticket.is_used).filter(
+                Ticket.id.in_(ticket_ids),
+                Ticket.event_id == event_id,
+                Ticket.status == TicketStatus.CONFIRMED
+            ).all()
+        )
+        pipe = redis_client.pipeline(transaction=False)
+        for ticket_id, is_used in found.items():
+            pipe.setbit(valid_key, ticket_id, 1)
+            if is_used:
+                pipe.setbit(used_key, ticket_id, 1)
+        pipe.execute()
+        return found
+
+    @staticmethod
+    def check_in(db: Session, event_id: int, ticket_ids: List[int]) -> List[str]:
+        """Check in tickets at an open gate and return one result per scan, in order"""
+        _, valid_key, used_key = GateService._keys(event_id)
+
+        pipe = redis_client.pipeline(transaction=False)
+        for ticket_id in ticket_ids:
+            pipe.getbit(valid_key, ticket_id)
+        valid_bits = pipe.execute()
+
+        missing = [ticket_id for ticket_id, bit in zip(ticket_ids, valid_bits) if not bit]
+        late_valid = GateService._validate_missing(db, event_id, missing)
+        valid_positions = [
+            position for position, (ticket_id, bit) in enumerate(zip(ticket_ids, valid_bits))
+            if bit or ticket_id in late_valid
+        ]
+
+        # SETBIT returns the previous bit, so exactly one scan of a ticket sees 0
+        pipe = redis_client.pipeline(transaction=False)
+        for position in valid_positions:
+            pipe.setbit(used_key, ticket_ids[position], 1)
+        previous_bits = dict(zip(valid_positions, pipe.execute())) if valid_positions else {}
+
+        results = []
+        admitted = []
+        for position, ticket_id in enumerate(ticket_ids):
+            if position not in previous_bits:
+                results.append(ScanResult.INVALID)
+            elif previous_bits[position]:
+                results.append(ScanResult.ALREADY_USED)
+            else:
+                results.append(ScanResult.ADMITTED)
+                admitted.append(ticket_id)
+
+        if admitted:
+            redis_client.rpush(PENDING_CHECKINS_KEY, *admitted)
+        return results
+
+    @staticmethod
+    def flush_checkins(db: Session) -> int:
+        """Write queued check-ins to the database in batches"""
+        flushed = 0
+        while True:
+            ticket_ids = redis_client.lpop(PENDING_CHECKINS_KEY, settings.GATE_FLUSH_BATCH_SIZE)
+            if not ticket_ids:
+                break
+
+            try:
+                checked_in = db.execute(
+                    update(Ticket)
+                    .where(
+                        Ticket.id.in_([int(ticket_id) for ticket_id in ticket_ids]),
+                        Ticket.is_used == False
+                    )
+                    .values(is_used=True)
+                    .returning(Ticket.event_id, Ticket.ticket_type)
+                    .execution_options(synchronize_session=False)
+                ).all()
+                StatsService.record_checkins(db, checked_in)
+                db.commit()
+            except Exception:
+                db.rollback()
+                redis_client.lpush(PENDING_CHECKINS_KEY, *reversed(ticket_ids))
+                raise
+
+            flushed += len(ticket_ids)
+            if len(ticket_ids) < settings.GATE_FLUSH_BATCH_SIZE:
+                break
+        return flushed
+
+    @staticmethod
+    async def run_flusher():
+        await run_periodically(GateService.flush_checkins, settings.GATE_FLUSH_INTERVAL_SECONDS)
@@ -0,0 +1,108 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from collections import Counter
+from typing import List
+from datetime import datetime, timedelta
+from ..models.tickets import Ticket, TicketStatus
+from ..config import settings
+from ..utils.background import run_periodically
+from ..utils.logger import logger
+from .inventory_service import InventoryService
+from .stats_service import StatsService
+
+class HoldService:
+    @staticmethod
+    def hold_expiry() -> datetime:
+        return datetime.utcnow() + timedelta(minutes=settings.TICKET_HOLD_MINUTES)
+
+    @staticmethod
+    def confirm_tickets(db: Session, ticket_ids: List[int], payment_id: str):
+        """Turn held tickets into sales once their payment is verified"""
+        # Conditional flip, so it cannot race the sweeper
+        confirmed = db.execute(
+            update(Ticket)
+            .where(Ticket.id.in_(ticket_ids), Ticket.status == TicketStatus.HELD)
+            .values(status=TicketStatus.CONFIRMED, payment_id=payment_id, hold_expires_at=None)
+            .returning(Ticket.id, Ticket.event_id, Ticket.ticket_type, Ticket.price)
+            .execution_options(synchronize_session=False)
+        ).all()
+        per_type = Counter((row.event_id, row.ticket_type) for row in confirmed)
+        for (event_id, ticket_type), quantity in per_type.items():
+            InventoryService.confirm(db, event_id, ticket_type, quantity)
+
+        # Same conditional flip for released holds, so two confirms of one
+        # payment cannot both take the seat back
+        confirmed_ids = {row.id for row in confirmed}
+        expired = db.execute(
+            update(Ticket)
+            .where(
+                Ticket.id.in_([ticket_id for ticket_id in ticket_ids if ticket_id not in confirmed_ids]),
+                Ticket.status == TicketStatus.EXPIRED
+            )
+            .values(status=TicketStatus.CONFIRMED, payment_id=payment_id, hold_expires_at=None)
+            .returning(Ticket.id, Ticket.event_id, Ticket.ticket_type, Ticket.price)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if expired:
+            per_type = Counter((row.event_id, row.ticket_type) for row in expired)
+            for (event_id, ticket_type), quantity in per_type.items():
+                InventoryService.reserve(db, event_id, ticket_type, quantity)
+        StatsService.record_sales(db, confirmed + expired)
+
+        # Free tickets are confirmed at booking and only need the payment reference
+        db.execute(
+            update(Ticket)
+            .where(
+                Ticket.id.in_(ticket_ids),
+                Ticket.status == TicketStatus.CONFIRMED,
+                Ticket.payment_id.is_(None)
+            )
+            .values(payment_id=payment_id)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def confirm_ticket(db: Session, ticket: Ticket, payment_id: str):
+        HoldService.confirm_tickets(db, [ticket.id], payment_id)
+        db.refresh(ticket)
+        return ticket
+
+    @staticmethod
+    def release_expired_holds(db: Session, batch_size: int = None) -> int:
+        """Expire unpaid holds in batches and give their seats back"""
+        batch_size = batch_size or settings.HOLD_SWEEP_BATCH_SIZE
+        released = 0
+
+        while True:
+            expired = db.query(Ticket.id, Ticket.event_id, Ticket.ticket_type).filter(
+                Ticket.status == TicketStatus.HELD,
+                Ticket.hold_expires_at < datetime.utcnow()
+            ).order_by(
+                Ticket.hold_expires_at
+            ).limit(batch_size).with_for_update(skip_locked=True).all()
+
+            if not expired:
+                break
+
+            db.execute(
+                update(Ticket)
+                .where(Ticket.id.in_([row.id for row in expired]))
+                .values(status=TicketStatus.EXPIRED, hold_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            per_type = Counter((row.event_id, row.ticket_type) for row in expired)
+            for (event_id, ticket_type), quantity in per_type.items():
+                InventoryService.release(db, event_id, ticket_type, quantity, hold=True)
+            db.commit()
+
+            released += len(expired)
+            if len(expired) < batch_size:
+                break
+
+        if released:
+            logger.info(f"Released {released} expired ticket holds")
+        return released
+
+    @staticmethod
+    async def run_sweeper():
+        await run_periodically(HoldService.release_expired_holds, settings.HOLD_SWEEP_INTERVAL_SECONDS)
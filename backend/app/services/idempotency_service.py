@@ -0,0 +1,71 @@
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Optional
+import hashlib
+import json
+from ..config import settings
+from .session_service import redis_client
+
+class IdempotentRequest:
+    """Replay protection for retried writes, keyed by the Idempotency-Key header"""
+
+    def __init__(self, scope: str, user_id: int, key: Optional[str], payload: Any):
+        self.replay = None
+        self.redis_key = None
+        if not key:
+            return
+        if len(key) > 255:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Idempotency-Key is too long"
+            )
+
+        self.redis_key = f"idempotency:{scope}:{user_id}:{key}"
+        self.fingerprint = hashlib.sha256(
+            json.dumps(jsonable_encoder(payload), sort_keys=True).encode()
+        ).hexdigest()
+
+        claimed = redis_client.set(
+            self.redis_key,
+            json.dumps({"fingerprint": self.fingerprint}),
+            nx=True,
+            ex=settings.IDEMPOTENCY_LOCK_SECONDS
+        )
+        if claimed:
+            return
+
+        stored = json.loads(redis_client.get(self.redis_key) or "{}")
+        if stored.get("fingerprint") != self.fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+        if "response" not in stored:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed"
+            )
+        self.replay = stored["response"]
+
+    def save(self, response: Any) -> Any:
+        """Store the response for retries and return it"""
+        if self.redis_key is None:
+            return response
+
+        response = jsonable_encoder(response)
+        redis_client.set(
+            self.redis_key,
+            json.dumps({"fingerprint": self.fingerprint, "response": response}),
+            ex=settings.IDEMPOTENCY_TTL_HOURS * 3600
+        )
+        self.redis_key = None
+        return response
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None and self.redis_key is not None:
+            redis_client.delete(self.redis_key)
+            self.redis_key = None
+        return False
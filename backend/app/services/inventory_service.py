@@ -0,0 +1,262 @@
+from sqlalchemy import update, func, or_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from ..models.inventory import EventInventory, TicketTypeInventory
+from ..models.tickets import Ticket, TicketType, TicketStatus
+from ..models.events import Event
+
+class InventoryService:
+    """Seat counters for events, taken with conditional UPDATEs"""
+
+    @staticmethod
+    def create_for_event(db: Session, event: Event):
+        db.add(EventInventory(
+            event_id=event.id,
+            capacity=event.capacity or 0,
+            sold=0,
+            held=0,
+            version=0
+        ))
+        db.add_all(
+            TicketTypeInventory(event_id=event.id, ticket_type=ticket_type, sold=0, held=0)
+            for ticket_type in TicketType
+        )
+
+    @staticmethod
+    def _initialize(db: Session, event_id: int) -> bool:
+        """Build counters for an event created before inventory tracking existed"""
+        # Lock the event first so concurrent bookings initialize it only once
+        event = db.query(Event).filter(Event.id == event_id).with_for_update().first()
+        if not event:
+            return False
+
+        if db.query(EventInventory.event_id).filter(EventInventory.event_id == event_id).first():
+            return True
+
+        counts = {
+            (ticket_type, ticket_status): count
+            for ticket_type, ticket_status, count in db.query(
+                Ticket.ticket_type, Ticket.status, func.count(Ticket.id)
+            ).filter(
+                Ticket.event_id == event_id,
+                Ticket.status != TicketStatus.EXPIRED
+            ).group_by(Ticket.ticket_type, Ticket.status).all()
+        }
+        sold = {t: counts.get((t, TicketStatus.CONFIRMED), 0) for t in TicketType}
+        held = {t: counts.get((t, TicketStatus.HELD), 0) for t in TicketType}
+
+        db.add(EventInventory(
+            event_id=event_id,
+            capacity=event.capacity or 0,
+            sold=sum(sold.values()),
+            held=sum(held.values()),
+            version=0
+        ))
+        db.add_all(
+            TicketTypeInventory(
+                event_id=event_id,
+                ticket_type=ticket_type,
+                sold=sold[ticket_type],
+                held=held[ticket_type]
+            )
+            for ticket_type in TicketType
+        )
+        db.flush()
+        return True
+
+    @staticmethod
+    def reserve(db: Session, event_id: int, ticket_type: TicketType, quantity: int = 1, hold: bool = False):
+        """Take `quantity` seats (held with `hold`) or raise 400; the caller commits or rolls back"""
+        counter = "held" if hold else "sold"
+        result = db.execute(
+            update(EventInventory)
+            .where(
+                EventInventory.event_id == event_id,
+                EventInventory.sold + EventInventory.held + quantity <= EventInventory.capacity
+            )
+            .values({
+                counter: getattr(EventInventory, counter) + quantity,
+                "version": EventInventory.version + 1
+            })
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            exists = db.query(EventInventory.event_id).filter(
+                EventInventory.event_id == event_id
+            ).first()
+            if not exists and InventoryService._initialize(db, event_id):
+                return InventoryService.reserve(db, event_id, ticket_type, quantity, hold)
+
+            raise HTTPException(status_code=400, detail="Event is fully booked")
+
+        result = db.execute(
+            update(TicketTypeInventory)
+            .where(
+                TicketTypeInventory.event_id == event_id,
+                TicketTypeInventory.ticket_type == ticket_type,
+                or_(
+                    TicketTypeInventory.capacity.is_(None),
+                    TicketTypeInventory.sold + TicketTypeInventory.held + quantity <= TicketTypeInventory.capacity
+                )
+            )
+            .values({counter: getattr(TicketTypeInventory, counter) + quantity})
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No {ticket_type.value} tickets left for this event"
+            )
+
+    @staticmethod
+    def release(db: Session, event_id: int, ticket_type: TicketType, quantity: int = 1, hold: bool = False):
+        counter = "held" if hold else "sold"
+        db.execute(
+            update(EventInventory)
+            .where(EventInventory.event_id == event_id)
+            .values({
+                counter: getattr(EventInventory, counter) - quantity,
+                "version": EventInventory.version + 1
+            })
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(TicketTypeInventory)
+            .where(
+                TicketTypeInventory.event_id == event_id,
+                TicketTypeInventory.ticket_type == ticket_type
+            )
+            .values({counter: getattr(TicketTypeInventory, counter) - quantity})
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def confirm(db: Session, event_id: int, ticket_type: TicketType, quantity: int = 1):
+        """Turn held seats into sold ones"""
+        db.execute(
+            update(EventInventory)
+            .where(EventInventory.event_id == event_id)
+            .values(
+                held=EventInventory.held - quantity,
+                sold=EventInventory.sold + quantity,
+                version=EventInventory.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(TicketTypeInventory)
+            .where(
+                TicketTypeInventory.event_id == event_id,
+                TicketTypeInventory.ticket_type == ticket_type
+            )
+            .values(
+                held=TicketTypeInventory.held - quantity,
+                sold=TicketTypeInventory.sold + quantity
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def set_event_capacity(db: Session, event_id: int, capacity: int):
+        """Change an event's capacity; it cannot drop below the seats already taken"""
+        if not InventoryService._initialize(db, event_id):
+            raise HTTPException(status_code=404, detail="Event not found")
+
+        result = db.execute(
+            update(EventInventory)
+            .where(
+                EventInventory.event_id == event_id,
+                EventInventory.sold + EventInventory.held <= capacity
+            )
+            .values(capacity=capacity, version=EventInventory.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail="Capacity is lower than the tickets already sold or held"
+            )
+
+    @staticmethod
+    def set_type_capacity(db: Session, event_id: int, ticket_type: TicketType, capacity: int = None):
+        if not InventoryService._initialize(db, event_id):
+            raise HTTPException(status_code=404, detail="Event not found")
+
+        db.execute(
+            update(TicketTypeInventory)
+            .where(
+                TicketTypeInventory.event_id == event_id,
+                TicketTypeInventory.ticket_type == ticket_type
+            )
+            .values(capacity=capacity)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    @staticmethod
+    def set_type_price(db: Session, event_id: int, ticket_type: TicketType, price: float = None):
+        if not InventoryService._initialize(db, event_id):
+            raise HTTPException(status_code=404, detail="Event not found")
+
+        db.execute(
+            update(TicketTypeInventory)
+            .where(
+                TicketTypeInventory.event_id == event_id,
+                TicketTypeInventory.ticket_type == ticket_type
+            )
+            .values(price=price)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    @staticmethod
+    def get_price(db: Session, event_id: int, ticket_type: TicketType) -> float:
+        """The price of a ticket type as set by the event team; never taken from the client"""
+        query = db.query(TicketTypeInventory.price).filter(
+            TicketTypeInventory.event_id == event_id,
+            TicketTypeInventory.ticket_type == ticket_type
+        )
+        row = query.first()
+        if row is None:
+            if not InventoryService._initialize(db, event_id):
+                raise HTTPException(status_code=404, detail="Event not found")
+            row = query.first()
+
+        if row is None or row.price is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{ticket_type.value} tickets are not on sale for this event"
+            )
+        return row.price
+
+    @staticmethod
+    def get_availability(db: Session, event_id: int):
+        inventory = db.query(EventInventory).filter(EventInventory.event_id == event_id).first()
+        if not inventory:
+            if not InventoryService._initialize(db, event_id):
+                raise HTTPException(status_code=404, detail="Event not found")
+            db.commit()
+            inventory = db.query(EventInventory).filter(EventInventory.event_id == event_id).first()
+
+        types = db.query(TicketTypeInventory).filter(
+            TicketTypeInventory.event_id == event_id
+        ).all()
+
+        return {
+            "event_id": event_id,
+            "capacity": inventory.capacity,
+            "sold": inventory.sold,
+            "held": inventory.held,
+            "available": max(inventory.capacity - inventory.sold - inventory.held, 0),
+            "ticket_types": [
+                {
+                    "ticket_type": item.ticket_type,
+                    "capacity": item.capacity,
+                    "price": item.price,
+                    "sold": item.sold,
+                    "held": item.held
+                }
+                for item in types
+            ]
+        }
@@ -0,0 +1,57 @@
+from sqlalchemy.orm import Session
+from fastapi.encoders import jsonable_encoder
+from cachetools import LRUCache
+import json
+from ..models.menu_items import MenuItem
+from ..schemas.menu_items import MenuItemOut
+from ..config import settings
+from .session_service import redis_client
+
+_menu_cache = LRUCache(maxsize=settings.MENU_CACHE_SIZE)
+
+class MenuCacheService:
+    """Read-through cache of serialized stall menus behind a per-stall version"""
+
+    @staticmethod
+    def _version_key(stall_id: int) -> str:
+        return f"menu:{stall_id}:version"
+
+    @staticmethod
+    def get_version(stall_id: int) -> int:
+        return int(redis_client.get(MenuCacheService._version_key(stall_id)) or 0)
+
+    @staticmethod
+    def etag(stall_id: int, version: int) -> str:
+        return f'"menu-{stall_id}-{version}"'
+
+    @staticmethod
+    def invalidate(*stall_ids: int):
+        pipe = redis_client.pipeline(transaction=False)
+        for stall_id in set(stall_ids):
+            pipe.incr(MenuCacheService._version_key(stall_id))
+        pipe.execute()
+
+    @staticmethod
+    def get_menu(db: Session, stall_id: int, version: int) -> bytes:
+        """Return the stall's available items as JSON bytes for `version`"""
+        cached = _menu_cache.get(stall_id)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        body_key = f"menu:{stall_id}:body:{version}"
+        body = redis_client.get(body_key) if settings.MENU_CACHE_REDIS else None
+        if body is not None:
+            body = body.encode()
+        else:
+            items = db.query(MenuItem).filter(
+                MenuItem.stall_id == stall_id,
+                MenuItem.is_available == True
+            ).all()
+            body = json.dumps(jsonable_encoder([
+                MenuItemOut.model_validate(item, from_attributes=True) for item in items
+            ])).encode()
+            if settings.MENU_CACHE_REDIS:
+                redis_client.set(body_key, body.decode(), ex=settings.MENU_CACHE_TTL_SECONDS)
+
+        _menu_cache[stall_id] = (version, body)
+        return body
@@ -0,0 +1,242 @@
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import bindparam, case, insert, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterator, List
+import csv
+import io
+import json
+from ..database import SessionLocal
+from ..models.menu_items import MenuItem
+from ..schemas.menu_items import MenuItemImportRow
+
+EXPORT_COLUMNS = ["id", "name", "description", "price", "is_available", "stock"]
+
+class MenuService:
+    @staticmethod
+    def reserve_stock(db: Session, quantities: Dict[int, int]) -> List:
+        """Take stock for an order's stocked items or raise 400; returns the updated rows"""
+        # ID order, so concurrent multi-item orders lock rows in the same order;
+        # call this last in the order transaction to hold the locks briefly
+        updated = []
+        for menu_item_id in sorted(quantities):
+            quantity = quantities[menu_item_id]
+            row = db.execute(
+                update(MenuItem)
+                .where(
+                    MenuItem.id == menu_item_id,
+                    MenuItem.stock.isnot(None),
+                    MenuItem.stock >= quantity
+                )
+                .values(
+                    stock=MenuItem.stock - quantity,
+                    is_available=MenuItem.stock > quantity
+                )
+                .returning(MenuItem.id, MenuItem.stall_id, MenuItem.stock, MenuItem.is_available)
+                .execution_options(synchronize_session=False)
+            ).first()
+
+            if row is not None:
+                updated.append(row)
+                continue
+
+            # Only reached when the item ran out, or lost its stock count meanwhile
+            stock = db.query(MenuItem.stock).filter(MenuItem.id == menu_item_id).scalar()
+            if stock is not None:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Menu item {menu_item_id} has only {stock} left"
+                )
+        return updated
+
+    @staticmethod
+    def restock(db: Session, quantities: Dict[int, int]) -> List:
+        """Give stock back, e.g. for cancelled orders; the caller commits"""
+        updated = []
+        for menu_item_id in sorted(quantities):
+            row = db.execute(
+                update(MenuItem)
+                .where(MenuItem.id == menu_item_id, MenuItem.stock.isnot(None))
+                .values(
+                    stock=MenuItem.stock + quantities[menu_item_id],
+                    is_available=case((MenuItem.stock == 0, True), else_=MenuItem.is_available)
+                )
+                .returning(MenuItem.id, MenuItem.stall_id, MenuItem.stock, MenuItem.is_available)
+                .execution_options(synchronize_session=False)
+            ).first()
+            if row is not None:
+                updated.append(row)
+        return updated
+
+    @staticmethod
+    def adjust_stock(db: Session, menu_item: MenuItem, delta: int):
+        """Atomically add `delta` (which may be negative) to an item's stock"""
+        if menu_item.stock is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="This item has unlimited stock; set a stock count first"
+            )
+
+        row = db.execute(
+            update(MenuItem)
+            .where(MenuItem.id == menu_item.id, MenuItem.stock + delta >= 0)
+            .values(
+                stock=MenuItem.stock + delta,
+                is_available=case(
+                    (MenuItem.stock + delta == 0, False),
+                    (MenuItem.stock == 0, True),
+                    else_=MenuItem.is_available
+                )
+            )
+            .returning(MenuItem.id, MenuItem.stall_id, MenuItem.stock, MenuItem.is_available)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Stock cannot go below zero"
+            )
+        return row
+
+    @staticmethod
+    def import_menu(db: Session, stall_id: int, rows: List[Dict[str, Any]]) -> dict:
+        """Validate and upsert a stall's menu by item name in one transaction"""
+        items = []
+        errors = []
+        seen = set()
+        for number, row in enumerate(rows, start=1):
+            try:
+                item = MenuItemImportRow(**row)
+            except (TypeError, ValidationError) as e:
+                errors.append({
+                    "row": number,
+                    "errors": [
+                        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                        for error in e.errors()
+                    ] if isinstance(e, ValidationError) else ["Row must be an object"]
+                })
+                continue
+
+            if item.name in seen:
+                errors.append({"row": number, "errors": [f"name: duplicate item '{item.name}'"]})
+                continue
+            seen.add(item.name)
+            items.append(item)
+
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail={"message": "Menu import has invalid rows; nothing was saved", "errors": errors}
+            )
+
+        existing = {
+            name: (menu_item_id, stock)
+            for name, menu_item_id, stock in db.query(MenuItem.name, MenuItem.id, MenuItem.stock).filter(
+                MenuItem.stall_id == stall_id,
+                MenuItem.name.in_(seen)
+            ).all()
+        }
+        new_rows = []
+        changed_rows = []
+        stock_deltas = []
+        for item in items:
+            values = item.dict(exclude_unset=True)
+            if item.name not in existing:
+                # A new item with no stock left starts sold out unless the row says otherwise
+                new_rows.append({
+                    **item.dict(),
+                    "is_available": values.get("is_available", item.stock != 0),
+                    "stall_id": stall_id
+                })
+                continue
+
+            menu_item_id, current_stock = existing[item.name]
+            stock = values.pop("stock", current_stock)
+            if stock is not None and current_stock is not None:
+                # Apply a new count as a relative change, so it never overwrites concurrent sales
+                if stock != current_stock:
+                    stock_deltas.append({"item_id": menu_item_id, "delta": stock - current_stock})
+            else:
+                # Starting or stopping stock tracking; orders never touch untracked items
+                values["stock"] = stock
+            changed_rows.append({**values, "id": menu_item_id})
+
+        try:
+            if new_rows:
+                db.execute(insert(MenuItem), new_rows)
+            if stock_deltas:
+                # Same sold-out handling as adjust_stock; an explicit is_available below still wins
+                item_table = MenuItem.__table__
+                result = db.execute(
+                    item_table.update()
+                    .where(
+                        item_table.c.id == bindparam("item_id"),
+                        item_table.c.stock + bindparam("delta") >= 0
+                    )
+                    .values(
+                        stock=item_table.c.stock + bindparam("delta"),
+                        is_available=case(
+                            (item_table.c.stock + bindparam("delta") == 0, False),
+                            (item_table.c.stock == 0, True),
+                            else_=item_table.c.is_available
+                        )
+                    ),
+                    stock_deltas
+                )
+                if result.rowcount != len(stock_deltas):
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Stock changed during the import and would go below zero; nothing was saved"
+                    )
+            if changed_rows:
+                db.execute(update(MenuItem), changed_rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return {"created": len(new_rows), "updated": len(changed_rows)}
+
+    @staticmethod
+    def parse_csv(content: bytes) -> List[Dict[str, Any]]:
+        """Read import rows from CSV with a header line; empty cells are omitted"""
+        try:
+            text = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV file must be UTF-8 encoded"
+            )
+        return [
+            {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+
+    @staticmethod
+    def export_menu(stall_id: int, format: str) -> Iterator[str]:
+        """Stream every item of a stall as CSV or a JSON array"""
+        db = SessionLocal()
+        try:
+            rows = db.query(*[getattr(MenuItem, column) for column in EXPORT_COLUMNS]).filter(
+                MenuItem.stall_id == stall_id
+            ).order_by(MenuItem.id).yield_per(500)
+
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(EXPORT_COLUMNS)
+                for row in rows:
+                    writer.writerow(["" if value is None else value for value in row])
+                    if buffer.tell() > 64 * 1024:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                yield buffer.getvalue()
+            else:
+                yield "["
+                for position, row in enumerate(rows):
+                    yield ("," if position else "") + json.dumps(dict(zip(EXPORT_COLUMNS, row)))
+                yield "]"
+        finally:
+            db.close()
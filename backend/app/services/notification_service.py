@@ -1,8 +1,48 @@
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, bindparam, false, func, insert, literal, select, update
 from sqlalchemy.orm import Session
-from ..models.notifications import Notification, NotificationType
+from collections import Counter
+from typing import Optional
+from datetime import datetime
+from ..models.notifications import (
+    BroadcastAudience,
+    BroadcastStatus,
+    Notification,
+    NotificationBroadcast,
+    NotificationType
+)
+from ..models.events import Event
 from ..models.orders import OrderStatus
+from ..models.tickets import Ticket, TicketStatus
+from ..models.users import User, UserRole
+from ..config import settings
+from ..utils.background import run_periodically
+from ..utils.logger import logger
+
+ORDER_STATUS_MESSAGES = {
+    OrderStatus.CONFIRMED: "Your order has been confirmed",
+    OrderStatus.READY: "Your order is ready for pickup",
+    OrderStatus.COMPLETED: "Your order has been completed",
+    OrderStatus.CANCELLED: "Your order has been cancelled"
+}
 
 class NotificationService:
+    """Notifications and each user's unread counter"""
+
+    @staticmethod
+    def _add_unread(db: Session, counts: dict):
+        """Add `counts[user_id]` to each user's unread counter; the caller commits"""
+        if not counts:
+            return
+        user_table = User.__table__
+        # Sorted so concurrent transactions lock users in the same order
+        db.execute(
+            user_table.update()
+            .where(user_table.c.id == bindparam("user_ref"))
+            .values(unread_notifications=user_table.c.unread_notifications + bindparam("delta")),
+            [{"user_ref": user_id, "delta": delta} for user_id, delta in sorted(counts.items())]
+        )
+
     @staticmethod
     def create_notification(
         db: Session,
@@ -18,23 +58,220 @@ class NotificationService:
             message=message
         )
         db.add(notification)
+        NotificationService._add_unread(db, {user_id: 1})
         db.commit()
         return notification
 
     @staticmethod
-    def create_order_status_notification(db: Session, order, status: OrderStatus):
-        status_messages = {
-            OrderStatus.CONFIRMED: "Your order has been confirmed",
-            OrderStatus.READY: "Your order is ready for pickup",
-            OrderStatus.COMPLETED: "Your order has been completed",
-            OrderStatus.CANCELLED: "Your order has been cancelled"
-        }
-
-        if status in status_messages:
-            return NotificationService.create_notification(
-                db=db,
-                user_id=order.user_id,
-                type=NotificationType.ORDER_STATUS,
-                title=f"Order #{order.id} Status Update",
-                message=status_messages[status]
-            ) 
\ No newline at end of file
+    def create_order_status_notifications(db: Session, orders, status: OrderStatus):
+        """Add one status notification per order in a single INSERT; the caller commits"""
+        if status not in ORDER_STATUS_MESSAGES or not orders:
+            return
+
+        db.execute(
+            insert(Notification),
+            [
+                {
+                    "user_id": order.user_id,
+                    "type": NotificationType.ORDER_STATUS,
+                    "title": f"Order #{order.id} Status Update",
+                    "message": ORDER_STATUS_MESSAGES[status]
+                }
+                for order in orders
+            ]
+        )
+        NotificationService._add_unread(db, Counter(order.user_id for order in orders))
+
+    @staticmethod
+    def mark_read(db: Session, user_id: int, notification_id: Optional[int] = None) -> int:
+        """Mark one or all of a user's notifications read; returns how many changed"""
+        query = db.query(Notification).filter(
+            Notification.user_id == user_id,
+            Notification.is_read == False
+        )
+        if notification_id is not None:
+            query = query.filter(Notification.id == notification_id)
+
+        changed = query.update({"is_read": True}, synchronize_session=False)
+        if changed:
+            NotificationService._add_unread(db, {user_id: -changed})
+        return changed
+
+    @staticmethod
+    def repair_unread_counts(db: Session, batch_size: int = None) -> int:
+        """Recount unread notifications in batches of users and fix drifted counters"""
+        batch_size = batch_size or settings.UNREAD_REPAIR_BATCH_SIZE
+        last_id = 0
+        repaired = 0
+
+        while True:
+            # Lock the batch before counting: earlier increments are committed and counted, later ones wait
+            stored = dict(
+                db.query(User.id, User.unread_notifications).filter(
+                    User.id > last_id
+                ).order_by(User.id).limit(batch_size).with_for_update().all()
+            )
+            if not stored:
+                break
+
+            actual = dict(
+                db.query(Notification.user_id, func.count(Notification.id)).filter(
+                    Notification.user_id.in_(stored),
+                    Notification.is_read == False
+                ).group_by(Notification.user_id).all()
+            )
+            drifted = {
+                user_id: actual.get(user_id, 0) - count
+                for user_id, count in stored.items()
+                if actual.get(user_id, 0) != count
+            }
+            NotificationService._add_unread(db, drifted)
+            db.commit()
+
+            repaired += len(drifted)
+            last_id = max(stored)
+            if len(stored) < batch_size:
+                break
+
+        if repaired:
+            logger.warning(f"Repaired unread notification counters for {repaired} users")
+        return repaired
+
+    @staticmethod
+    def _recipients(broadcast: NotificationBroadcast):
+        """The audience's user IDs as a query, and the column to page it by"""
+        if broadcast.audience == BroadcastAudience.EVENT_TICKET_HOLDERS:
+            return Ticket.user_id, select(Ticket.user_id.label("user_id")).where(
+                Ticket.event_id == broadcast.event_id,
+                Ticket.status == TicketStatus.CONFIRMED
+            ).distinct()
+        return User.id, select(User.id.label("user_id")).where(
+            User.role == broadcast.role,
+            User.is_active == True
+        )
+
+    @staticmethod
+    def create_broadcast(
+        db: Session,
+        created_by: int,
+        audience: BroadcastAudience,
+        title: str,
+        message: str,
+        type: NotificationType = NotificationType.EVENT_UPDATE,
+        event_id: Optional[int] = None,
+        role: Optional[UserRole] = None
+    ) -> NotificationBroadcast:
+        """Queue a notification for an audience; the caller commits"""
+        if audience == BroadcastAudience.EVENT_TICKET_HOLDERS:
+            if event_id is None or not db.query(Event.id).filter(Event.id == event_id).first():
+                raise HTTPException(status_code=404, detail="Event not found")
+            role = None
+        elif role is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A role is required for a role broadcast"
+            )
+        else:
+            event_id = None
+
+        broadcast = NotificationBroadcast(
+            created_by=created_by,
+            audience=audience,
+            event_id=event_id,
+            role=role,
+            type=type,
+            title=title,
+            message=message,
+            status=BroadcastStatus.PENDING,
+            sent_count=0,
+            last_user_id=0
+        )
+        _, recipients = NotificationService._recipients(broadcast)
+        broadcast.total_recipients = db.execute(
+            select(func.count()).select_from(recipients.subquery())
+        ).scalar()
+        db.add(broadcast)
+        db.flush()
+        return broadcast
+
+    @staticmethod
+    def _send_chunk(db: Session, broadcast: NotificationBroadcast, chunk_size: int):
+        """Insert the next `chunk_size` recipients with one INSERT ... SELECT; the caller commits"""
+        column, recipients = NotificationService._recipients(broadcast)
+        chunk = recipients.where(column > broadcast.last_user_id).order_by(column).limit(chunk_size).subquery()
+        upper = db.execute(select(func.max(chunk.c.user_id))).scalar()
+
+        now = datetime.utcnow()
+        if broadcast.status == BroadcastStatus.PENDING:
+            broadcast.status = BroadcastStatus.RUNNING
+            broadcast.started_at = now
+
+        sent = 0
+        if upper is not None:
+            batch = recipients.where(column > broadcast.last_user_id, column <= upper).subquery()
+            sent = db.execute(
+                insert(Notification).from_select(
+                    ["user_id", "type", "title", "message", "is_read", "created_at"],
+                    select(
+                        batch.c.user_id,
+                        literal(broadcast.type, Notification.type.type),
+                        literal(broadcast.title),
+                        literal(broadcast.message),
+                        false(),
+                        literal(now, DateTime())
+                    )
+                )
+            ).rowcount
+            db.execute(
+                update(User)
+                .where(User.id.in_(select(batch.c.user_id)))
+                .values(unread_notifications=User.unread_notifications + 1)
+                .execution_options(synchronize_session=False)
+            )
+            broadcast.sent_count += sent
+            broadcast.last_user_id = upper
+
+        if sent < chunk_size:
+            broadcast.status = BroadcastStatus.COMPLETED
+            broadcast.finished_at = now
+
+    @staticmethod
+    def process_broadcasts(db: Session, chunk_size: int = None):
+        """Send queued broadcasts chunk by chunk, committing progress with each chunk"""
+        chunk_size = chunk_size or settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+
+        while True:
+            # SKIP LOCKED lets workers share broadcasts; a restart resumes after the last chunk
+            broadcast = db.query(NotificationBroadcast).filter(
+                NotificationBroadcast.status.in_([BroadcastStatus.PENDING, BroadcastStatus.RUNNING])
+            ).order_by(NotificationBroadcast.id).with_for_update(skip_locked=True).first()
+            if broadcast is None:
+                break
+
+            broadcast_id = broadcast.id
+            try:
+                NotificationService._send_chunk(db, broadcast, chunk_size)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.exception(f"Notification broadcast {broadcast_id} failed")
+                db.query(NotificationBroadcast).filter(
+                    NotificationBroadcast.id == broadcast_id
+                ).update({
+                    "status": BroadcastStatus.FAILED,
+                    "error": str(e)[:500],
+                    "finished_at": datetime.utcnow()
+                })
+                db.commit()
+                continue
+
+            if broadcast.status == BroadcastStatus.COMPLETED:
+                logger.info(f"Notification broadcast {broadcast_id} sent to {broadcast.sent_count} users")
+
+    @staticmethod
+    async def run_broadcaster():
+        await run_periodically(NotificationService.process_broadcasts, settings.NOTIFICATION_FANOUT_INTERVAL_SECONDS)
+
+    @staticmethod
+    async def run_unread_repair():
+        await run_periodically(NotificationService.repair_unread_counts, settings.UNREAD_REPAIR_INTERVAL_SECONDS)
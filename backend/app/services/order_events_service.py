@@ -0,0 +1,149 @@
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Set
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+import asyncio
+import json
+import redis.asyncio as aioredis
+from ..config import settings
+from ..utils.logger import logger
+from .session_service import redis_client
+
+ORDER_EVENTS_CHANNEL = "order_events"
+
+_subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+class OrderEventType:
+    CREATED = "order_created"
+    STATUS_CHANGED = "order_status_changed"
+    MENU_STOCK = "menu_item_stock"
+
+class OrderEventService:
+    """Push channel for order updates and menu stock changes"""
+
+    @staticmethod
+    def stall_channel(stall_id: int) -> str:
+        return f"stall:{stall_id}"
+
+    @staticmethod
+    def user_channel(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def menu_channel(stall_id: int) -> str:
+        return f"menu:{stall_id}"
+
+    @staticmethod
+    def _deliver(message: dict):
+        for channel in message["channels"]:
+            for queue in list(_subscribers.get(channel, ())):
+                if queue.full():
+                    # Slow clients lose their oldest event rather than blocking others
+                    queue.get_nowait()
+                queue.put_nowait(message["event"])
+
+    @staticmethod
+    def publish(event_type: str, order):
+        """Announce an order change; call after the change is committed"""
+        message = {
+            "channels": [
+                OrderEventService.stall_channel(order.stall_id),
+                OrderEventService.user_channel(order.user_id)
+            ],
+            "event": jsonable_encoder({
+                "type": event_type,
+                "order_id": order.id,
+                "stall_id": order.stall_id,
+                "user_id": order.user_id,
+                "status": order.status,
+                "total_amount": order.total_amount,
+                "created_at": order.created_at,
+                "completed_at": order.completed_at
+            })
+        }
+        OrderEventService._send(message)
+
+    @staticmethod
+    def publish_stock(items):
+        """Announce new stock levels; `items` need id, stall_id, stock and is_available"""
+        for item in items:
+            OrderEventService._send({
+                "channels": [OrderEventService.menu_channel(item.stall_id)],
+                "event": {
+                    "type": OrderEventType.MENU_STOCK,
+                    "menu_item_id": item.id,
+                    "stall_id": item.stall_id,
+                    "stock": item.stock,
+                    "is_available": item.is_available
+                }
+            })
+
+    @staticmethod
+    def _send(message: dict):
+        if settings.ORDER_EVENTS_BACKEND == "redis":
+            try:
+                redis_client.publish(ORDER_EVENTS_CHANNEL, json.dumps(message))
+            except Exception:
+                logger.exception(f"Failed to publish {message['event']['type']} event")
+        else:
+            OrderEventService._deliver(message)
+
+    @staticmethod
+    @asynccontextmanager
+    async def subscribe(*channels: str):
+        queue = asyncio.Queue(maxsize=settings.ORDER_EVENTS_QUEUE_SIZE)
+        for channel in channels:
+            _subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            for channel in channels:
+                _subscribers[channel].discard(queue)
+                if not _subscribers[channel]:
+                    del _subscribers[channel]
+
+    @staticmethod
+    async def stream(websocket: WebSocket, channel: str):
+        """Forward events on `channel` to an accepted socket until it disconnects"""
+        async with OrderEventService.subscribe(channel) as queue:
+            async def forward():
+                while True:
+                    await websocket.send_json(await queue.get())
+
+            sender = asyncio.create_task(forward())
+            try:
+                while True:
+                    await websocket.receive_text()
+            except WebSocketDisconnect:
+                pass
+            finally:
+                sender.cancel()
+
+    @staticmethod
+    async def run_listener():
+        """Relay events from Redis to this worker's subscribers"""
+        if settings.ORDER_EVENTS_BACKEND != "redis":
+            return
+
+        client = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=0,
+            decode_responses=True
+        )
+        try:
+            while True:
+                try:
+                    async with client.pubsub() as pubsub:
+                        await pubsub.subscribe(ORDER_EVENTS_CHANNEL)
+                        async for item in pubsub.listen():
+                            if item["type"] == "message":
+                                OrderEventService._deliver(json.loads(item["data"]))
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Order event listener lost its Redis connection")
+                    await asyncio.sleep(1)
+        finally:
+            await client.close()
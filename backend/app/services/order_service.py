@@ -0,0 +1,155 @@
+from fastapi import HTTPException, status
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session, selectinload
+from collections import defaultdict
+from typing import List, Optional
+from datetime import datetime
+from ..models.orders import Order, OrderItem, OrderStatus
+from ..models.menu_items import MenuItem
+from ..models.stalls import Stall
+from ..models.users import User
+from .menu_cache_service import MenuCacheService
+from .menu_service import MenuService
+from .notification_service import NotificationService
+from .order_events_service import OrderEventService, OrderEventType
+from .revenue_service import RevenueService
+
+OPEN_ORDER_STATUSES = [OrderStatus.PENDING, OrderStatus.CONFIRMED, OrderStatus.READY]
+
+class OrderService:
+    @staticmethod
+    def get_owned_stall(db: Session, user: User) -> Stall:
+        stall = db.query(Stall).filter(Stall.owner_id == user.id).first()
+        if not stall:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have a stall to manage orders for"
+            )
+        return stall
+
+    @staticmethod
+    def create_order(db: Session, user: User, order_data) -> Order:
+        """Create an order and its items in one transaction"""
+        # Fetch every requested item in one query
+        requested_ids = {item.menu_item_id for item in order_data.items}
+        available_items = {
+            menu_item.id: menu_item
+            for menu_item in db.query(MenuItem).filter(
+                MenuItem.id.in_(requested_ids),
+                MenuItem.stall_id == order_data.stall_id,
+                MenuItem.is_available == True
+            ).all()
+        }
+
+        for item in order_data.items:
+            if item.menu_item_id not in available_items:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Menu item {item.menu_item_id} not available"
+                )
+
+        # Calculate total amount
+        total_amount = sum(
+            available_items[item.menu_item_id].price * item.quantity
+            for item in order_data.items
+        )
+        # Only items with a stock count need a conditional UPDATE
+        quantities = defaultdict(int)
+        for item in order_data.items:
+            if available_items[item.menu_item_id].stock is not None:
+                quantities[item.menu_item_id] += item.quantity
+
+        # Create the order and its items in one transaction
+        try:
+            db_order = Order(
+                user_id=user.id,
+                stall_id=order_data.stall_id,
+                total_amount=total_amount
+            )
+            db.add(db_order)
+            db.flush()
+
+            db.execute(
+                insert(OrderItem),
+                [
+                    {
+                        "order_id": db_order.id,
+                        "menu_item_id": item.menu_item_id,
+                        "quantity": item.quantity,
+                        "price_at_time": available_items[item.menu_item_id].price
+                    }
+                    for item in order_data.items
+                ]
+            )
+            stock_changes = MenuService.reserve_stock(db, quantities)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        if stock_changes:
+            MenuCacheService.invalidate(order_data.stall_id)
+        OrderEventService.publish(OrderEventType.CREATED, db_order)
+        OrderEventService.publish_stock(stock_changes)
+
+        return db.query(Order).options(
+            selectinload(Order.items).selectinload(OrderItem.menu_item)
+        ).filter(Order.id == db_order.id).one()
+
+    @staticmethod
+    def transition(db: Session, stall_id: int, order_ids: List[int], new_status: OrderStatus) -> List[int]:
+        """Move a stall's open orders to `new_status` in one UPDATE; returns the IDs that changed"""
+        values = {"status": new_status}
+        if new_status == OrderStatus.COMPLETED:
+            values["completed_at"] = datetime.utcnow()
+
+        try:
+            changed = db.execute(
+                update(Order)
+                .where(
+                    Order.id.in_(order_ids),
+                    Order.stall_id == stall_id,
+                    Order.status.in_(OPEN_ORDER_STATUSES),
+                    Order.status != new_status
+                )
+                .values(**values)
+                .returning(
+                    Order.id, Order.user_id, Order.stall_id, Order.status,
+                    Order.total_amount, Order.created_at, Order.completed_at
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+            NotificationService.create_order_status_notifications(db, changed, new_status)
+            if new_status == OrderStatus.COMPLETED:
+                RevenueService.record_sales(db, changed)
+
+            stock_changes = []
+            if new_status == OrderStatus.CANCELLED and changed:
+                quantities = dict(
+                    db.query(OrderItem.menu_item_id, func.sum(OrderItem.quantity)).filter(
+                        OrderItem.order_id.in_([order.id for order in changed])
+                    ).group_by(OrderItem.menu_item_id).all()
+                )
+                stock_changes = MenuService.restock(db, quantities)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        if stock_changes:
+            MenuCacheService.invalidate(stall_id)
+        for order in changed:
+            OrderEventService.publish(OrderEventType.STATUS_CHANGED, order)
+        OrderEventService.publish_stock(stock_changes)
+        return [order.id for order in changed]
+
+    @staticmethod
+    def get_queue(db: Session, stall_id: int, order_status: Optional[OrderStatus], limit: int) -> List[Order]:
+        """Open orders of a stall, oldest first"""
+        statuses = [order_status] if order_status else OPEN_ORDER_STATUSES
+        return db.query(Order).options(
+            selectinload(Order.items).selectinload(OrderItem.menu_item)
+        ).filter(
+            Order.stall_id == stall_id,
+            Order.status.in_(statuses)
+        ).order_by(Order.created_at, Order.id).limit(limit).all()
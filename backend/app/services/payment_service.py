@@ -0,0 +1,253 @@
+from fastapi import HTTPException, status
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from typing import Callable, Dict, Optional
+import asyncio
+import functools
+import threading
+import time
+import razorpay
+import requests
+from requests.adapters import HTTPAdapter
+from ..config import settings
+from ..utils.logger import logger
+
+_executor: Optional[ThreadPoolExecutor] = None
+_client: Optional[razorpay.Client] = None
+# Metrics are updated from the event loop and from threadpool routes alike
+_metrics_lock = threading.Lock()
+_metrics = defaultdict(lambda: {
+    "calls": 0,
+    "errors": 0,
+    "timeouts": 0,
+    "rejected": 0,
+    "latencies": deque(maxlen=settings.PAYMENT_GATEWAY_LATENCY_SAMPLES)
+})
+
+def _count(operation: str, counter: str):
+    with _metrics_lock:
+        _metrics[operation][counter] += 1
+
+def _observe(operation: str, started: float):
+    with _metrics_lock:
+        _metrics[operation]["latencies"].append(time.monotonic() - started)
+
+class CircuitBreaker:
+    """Fails fast for `reset_seconds` after `threshold` consecutive failures"""
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                if self.opened_at is None:
+                    logger.warning(f"Payment gateway circuit opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+_breaker = CircuitBreaker(
+    settings.PAYMENT_GATEWAY_FAILURE_THRESHOLD,
+    settings.PAYMENT_GATEWAY_RESET_SECONDS
+)
+
+def _get_client() -> razorpay.Client:
+    """Razorpay client on a keep-alive connection pool sized to the worker pool"""
+    global _client
+    if _client is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.PAYMENT_GATEWAY_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        options = {}
+        if settings.PAYMENT_GATEWAY_BASE_URL:
+            options["base_url"] = settings.PAYMENT_GATEWAY_BASE_URL
+        _client = razorpay.Client(
+            session=session,
+            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+            **options
+        )
+    return _client
+
+def _percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class PaymentService:
+    """The one client for the payment gateway"""
+
+    @staticmethod
+    async def _call(operation: str, func: Callable, *args):
+        if not _breaker.allow():
+            _count(operation, "rejected")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Payment gateway is unavailable, please retry shortly"
+            )
+
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PAYMENT_GATEWAY_POOL_SIZE,
+                thread_name_prefix="payment-gateway"
+            )
+
+        timeout = settings.PAYMENT_GATEWAY_TIMEOUT_SECONDS
+        loop = asyncio.get_running_loop()
+        _count(operation, "calls")
+        started = time.monotonic()
+        try:
+            # The HTTP timeout frees the worker thread; wait_for bounds queueing too
+            result = await asyncio.wait_for(
+                loop.run_in_executor(_executor, functools.partial(func, *args, timeout=timeout)),
+                timeout
+            )
+        except (asyncio.TimeoutError, requests.Timeout):
+            _count(operation, "timeouts")
+            _breaker.record_failure()
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Payment gateway timed out"
+            )
+        except razorpay.errors.BadRequestError as e:
+            # The gateway answered; the request itself was wrong
+            _breaker.record_success()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        except Exception:
+            _count(operation, "errors")
+            _breaker.record_failure()
+            logger.exception(f"Payment gateway call {operation} failed")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Payment gateway error"
+            )
+        finally:
+            _observe(operation, started)
+
+        _breaker.record_success()
+        return result
+
+    @staticmethod
+    async def create_order(amount: int) -> dict:
+        return await PaymentService._call("order.create", _get_client().order.create, {
+            'amount': amount,  # amount in paisa
+            'currency': 'INR',
+            'payment_capture': 1
+        })
+
+    @staticmethod
+    async def fetch_order(gateway_order_id: str) -> dict:
+        return await PaymentService._call("order.fetch", _get_client().order.fetch, gateway_order_id)
+
+    @staticmethod
+    def verify_webhook_signature(body: bytes, signature: Optional[str]):
+        """Check the X-Razorpay-Signature of a webhook delivery; local, like verify_signature"""
+        if not settings.RAZORPAY_WEBHOOK_SECRET:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Payment webhooks are not configured"
+            )
+
+        _count("verify_webhook", "calls")
+        started = time.monotonic()
+        try:
+            _get_client().utility.verify_webhook_signature(
+                body.decode(), signature or "", settings.RAZORPAY_WEBHOOK_SECRET
+            )
+        except (UnicodeDecodeError, razorpay.errors.SignatureVerificationError):
+            _count("verify_webhook", "errors")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid webhook signature"
+            )
+        finally:
+            _observe("verify_webhook", started)
+
+    @staticmethod
+    def verify_signature(payment_details: Dict):
+        """Check the gateway's signature on a payment"""
+        _count("verify_signature", "calls")
+        started = time.monotonic()
+        try:
+            _get_client().utility.verify_payment_signature({
+                'razorpay_payment_id': payment_details['razorpay_payment_id'],
+                'razorpay_order_id': payment_details['razorpay_order_id'],
+                'razorpay_signature': payment_details['razorpay_signature']
+            })
+        except (KeyError, razorpay.errors.SignatureVerificationError):
+            _count("verify_signature", "errors")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Payment verification failed"
+            )
+        finally:
+            _observe("verify_signature", started)
+
+    @staticmethod
+    def get_stats() -> dict:
+        with _metrics_lock:
+            snapshot = [
+                (operation, dict(metrics, latencies=list(metrics["latencies"])))
+                for operation, metrics in _metrics.items()
+            ]
+
+        operations = {}
+        for operation, metrics in snapshot:
+            latencies = metrics["latencies"]
+            operations[operation] = {
+                "calls": metrics["calls"],
+                "errors": metrics["errors"],
+                "timeouts": metrics["timeouts"],
+                "rejected": metrics["rejected"],
+                "latency_ms": {
+                    "p50": round(_percentile(latencies, 0.5) * 1000, 1),
+                    "p95": round(_percentile(latencies, 0.95) * 1000, 1),
+                    "max": round(max(latencies) * 1000, 1)
+                } if latencies else None
+            }
+        return {
+            "circuit": _breaker.state,
+            "consecutive_failures": _breaker.failures,
+            "operations": operations
+        }
+
+    @staticmethod
+    def shutdown():
+        global _executor
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
@@ -0,0 +1,188 @@
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import Optional
+from datetime import datetime
+import hashlib
+import json
+from ..models.payment_webhooks import PaymentWebhookEvent
+from ..models.orders import Order
+from ..models.tickets import Ticket
+from ..config import settings
+from ..utils.background import run_periodically
+from ..utils.logger import logger
+from .hold_service import HoldService
+
+# Events that mean the customer's money was captured
+PAID_EVENTS = ("payment.captured", "order.paid")
+
+class PaymentWebhookService:
+    """Gateway webhooks stored in an inbox table and applied in batches"""
+
+    @staticmethod
+    def store(db: Session, body: bytes, delivery_id: Optional[str]) -> bool:
+        """Append a delivery to the inbox; returns False for a redelivery"""
+        try:
+            event = json.loads(body)
+            payload = event.get("payload") or {}
+            payment = (payload.get("payment") or {}).get("entity") or {}
+            event_type = event["event"]
+        except (AttributeError, KeyError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Malformed webhook payload"
+            )
+
+        db.add(PaymentWebhookEvent(
+            delivery_id=delivery_id or hashlib.sha256(body).hexdigest(),
+            event_type=event_type,
+            payment_id=payment.get("id"),
+            gateway_order_id=payment.get("order_id"),
+            amount=payment.get("amount"),
+            payload=body.decode()
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        return True
+
+    @staticmethod
+    def process(db: Session, batch_size: int = None) -> int:
+        """Apply pending deliveries in batches, one transaction per batch"""
+        batch_size = batch_size or settings.PAYMENT_WEBHOOK_BATCH_SIZE
+        processed = 0
+        failed = {}
+
+        while True:
+            batch = select(PaymentWebhookEvent.id).where(
+                PaymentWebhookEvent.processed_at.is_(None)
+            ).order_by(PaymentWebhookEvent.id).limit(batch_size).with_for_update(skip_locked=True)
+
+            events = db.execute(
+                update(PaymentWebhookEvent)
+                .where(PaymentWebhookEvent.id.in_(batch.scalar_subquery()))
+                .values(processed_at=datetime.utcnow())
+                .returning(
+                    PaymentWebhookEvent.event_type,
+                    PaymentWebhookEvent.payment_id,
+                    PaymentWebhookEvent.gateway_order_id,
+                    PaymentWebhookEvent.amount
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+            if not events:
+                break
+
+            # One entry per payment; redeliveries and order.paid duplicates collapse here
+            payments = {
+                event.payment_id: (event.gateway_order_id, event.amount)
+                for event in events
+                if event.event_type in PAID_EVENTS and event.payment_id and event.gateway_order_id
+            }
+            if payments:
+                try:
+                    PaymentWebhookService._apply(db, payments, failed)
+                except HTTPException:
+                    # The failure rolled the batch back; claim it again without that payment
+                    db.rollback()
+                    continue
+            db.commit()
+
+            processed += len(events)
+            if len(events) < batch_size:
+                break
+
+        if processed:
+            logger.info(f"Processed {processed} payment webhook events")
+        return processed
+
+    @staticmethod
+    def _apply(db: Session, payments: dict, failed: dict):
+        """Record captured payments on their tickets and orders; the caller commits"""
+        payment_for_order = {gateway_order_id: payment_id for payment_id, (gateway_order_id, _) in payments.items()}
+
+        tickets_per_payment = defaultdict(list)
+        totals = defaultdict(float)
+        for ticket_id, gateway_order_id, price in db.query(Ticket.id, Ticket.gateway_order_id, Ticket.price).filter(
+            Ticket.gateway_order_id.in_(payment_for_order)
+        ).all():
+            tickets_per_payment[payment_for_order[gateway_order_id]].append(ticket_id)
+            totals[payment_for_order[gateway_order_id]] += price
+        for gateway_order_id, total_amount in db.query(Order.gateway_order_id, Order.total_amount).filter(
+            Order.gateway_order_id.in_(payment_for_order)
+        ).all():
+            totals[payment_for_order[gateway_order_id]] += total_amount
+
+        for payment_id, (gateway_order_id, amount) in payments.items():
+            if payment_id not in failed and amount != round(totals[payment_id] * 100):
+                logger.error(
+                    f"Payment {payment_id} captured {amount} paise but gateway order "
+                    f"{gateway_order_id} totals {round(totals[payment_id] * 100)}; not applying it"
+                )
+                failed[payment_id] = "Captured amount does not match the tickets and orders"
+
+        for payment_id, ticket_ids in tickets_per_payment.items():
+            if payment_id in failed:
+                continue
+            try:
+                HoldService.confirm_tickets(db, ticket_ids, payment_id)
+            except HTTPException as e:
+                # Hold expired and the event sold out since; process() retries the batch without it
+                failed[payment_id] = e.detail
+                raise
+
+        paid_orders = [
+            {"order_ref": gateway_order_id, "payment_ref": payment_id}
+            for payment_id, (gateway_order_id, _) in payments.items()
+            if payment_id not in failed
+        ]
+        if paid_orders:
+            order_table = Order.__table__
+            db.execute(
+                order_table.update()
+                .where(
+                    order_table.c.gateway_order_id == bindparam("order_ref"),
+                    order_table.c.payment_id.is_(None)
+                )
+                .values(payment_id=bindparam("payment_ref")),
+                paid_orders
+            )
+
+        failed_here = {payment_id: failed[payment_id] for payment_id in payments if payment_id in failed}
+        if failed_here:
+            logger.warning(f"Could not apply {len(failed_here)} captured payments")
+            event_table = PaymentWebhookEvent.__table__
+            db.execute(
+                event_table.update()
+                .where(event_table.c.payment_id == bindparam("payment_ref"))
+                .values(error=bindparam("reason")),
+                [{"payment_ref": payment_id, "reason": reason} for payment_id, reason in failed_here.items()]
+            )
+
+    @staticmethod
+    def record_failure(db: Session, payment_id: str, gateway_order_id: str, amount: int, reason: str, payload: str):
+        """Log a captured payment that could not be applied, for finance to refund; commits"""
+        logger.error(f"Captured payment {payment_id} could not be applied: {reason}")
+        db.add(PaymentWebhookEvent(
+            delivery_id=f"verify:{payment_id}",
+            event_type="payment.verify_failed",
+            payment_id=payment_id,
+            gateway_order_id=gateway_order_id,
+            amount=amount,
+            payload=payload,
+            error=reason,
+            processed_at=datetime.utcnow()
+        ))
+        try:
+            db.commit()
+        except IntegrityError:
+            # A retried verify of the same payment is already on record
+            db.rollback()
+
+    @staticmethod
+    async def run_consumer():
+        await run_periodically(PaymentWebhookService.process, settings.PAYMENT_WEBHOOK_INTERVAL_SECONDS)
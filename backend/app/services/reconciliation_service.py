@@ -0,0 +1,118 @@
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Iterator, TextIO, Tuple
+import csv
+import json
+import os
+import tempfile
+import zlib
+from ..models.orders import Order
+from ..models.tickets import Ticket, TicketStatus
+from ..utils.logger import logger
+
+REPORT_COLUMNS = ["payment_id", "issue", "source", "db_records", "db_amount", "settled_amount"]
+
+def read_settlement(stream: TextIO, file_format: str, payment_column: str, amount_column: str,
+                    amount_in_paise: bool = True) -> Iterator[Tuple[str, float]]:
+    """Yield (payment_id, amount in rupees) from a CSV or JSON Lines settlement export"""
+    if file_format == "csv":
+        rows = csv.DictReader(stream)
+    else:
+        rows = (json.loads(line) for line in stream if line.strip())
+
+    divisor = 100 if amount_in_paise else 1
+    for row in rows:
+        payment_id = row.get(payment_column)
+        if payment_id:
+            yield payment_id, float(row.get(amount_column) or 0) / divisor
+
+class ReconciliationService:
+    """Match a gateway settlement export against paid tickets and orders"""
+
+    @staticmethod
+    def _partition(payment_id: str, partitions: int) -> int:
+        return zlib.crc32(payment_id.encode()) % partitions
+
+    @staticmethod
+    def _db_payments(db: Session, batch_size: int) -> Iterator[Tuple[str, str, int, float]]:
+        """Stream (source, payment_id, records, amount) per payment"""
+        tickets = select(
+            literal("ticket").label("source"),
+            Ticket.payment_id,
+            func.count(Ticket.id),
+            func.coalesce(func.sum(Ticket.price), 0)
+        ).where(
+            Ticket.payment_id.isnot(None),
+            Ticket.status == TicketStatus.CONFIRMED,
+            Ticket.price > 0
+        ).group_by(Ticket.payment_id)
+        orders = select(
+            literal("order").label("source"),
+            Order.payment_id,
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.total_amount), 0)
+        ).where(Order.payment_id.isnot(None)).group_by(Order.payment_id)
+
+        yield from db.execute(union_all(tickets, orders).execution_options(yield_per=batch_size))
+
+    @staticmethod
+    def reconcile(db: Session, settlement: Iterable[Tuple[str, float]], report: TextIO,
+                  partitions: int = 64, batch_size: int = 10000) -> Dict[str, int]:
+        """Write a mismatch report to `report` and return counts per issue"""
+        summary = {"settled_payments": 0, "db_payments": 0, "not_in_db": 0, "not_settled": 0, "amount_mismatch": 0}
+        writer = csv.writer(report)
+        writer.writerow(REPORT_COLUMNS)
+
+        with tempfile.TemporaryDirectory(prefix="reconcile-") as workdir:
+            def spill(name: str, rows: Iterable[tuple]):
+                files = [open(os.path.join(workdir, f"{name}-{i}.csv"), "w", newline="") for i in range(partitions)]
+                try:
+                    writers = [csv.writer(file) for file in files]
+                    for row in rows:
+                        writers[ReconciliationService._partition(row[0], partitions)].writerow(row)
+                finally:
+                    for file in files:
+                        file.close()
+
+            def load(name: str, index: int) -> Iterator[list]:
+                with open(os.path.join(workdir, f"{name}-{index}.csv"), newline="") as file:
+                    yield from csv.reader(file)
+
+            spill("settlement", settlement)
+            spill("db", (
+                (payment_id, source, records, amount)
+                for source, payment_id, records, amount in ReconciliationService._db_payments(db, batch_size)
+            ))
+            db.rollback()  # end the read transaction before the join
+
+            for index in range(partitions):
+                # A payment can be split across several settlement rows
+                settled = {}
+                for payment_id, amount in load("settlement", index):
+                    settled[payment_id] = settled.get(payment_id, 0.0) + float(amount)
+                summary["settled_payments"] += len(settled)
+
+                recorded = {}
+                for payment_id, source, records, amount in load("db", index):
+                    sources, total_records, total = recorded.get(payment_id, ((), 0, 0.0))
+                    recorded[payment_id] = ((*sources, source), total_records + int(records), total + float(amount))
+                summary["db_payments"] += len(recorded)
+
+                for payment_id, (sources, records, amount) in recorded.items():
+                    settled_amount = settled.pop(payment_id, None)
+                    if settled_amount is None:
+                        issue = "not_settled"
+                    elif abs(settled_amount - amount) > 0.005:
+                        issue = "amount_mismatch"
+                    else:
+                        continue
+                    summary[issue] += 1
+                    writer.writerow([payment_id, issue, "+".join(sources), records, round(amount, 2),
+                                     None if settled_amount is None else round(settled_amount, 2)])
+
+                for payment_id, settled_amount in settled.items():
+                    summary["not_in_db"] += 1
+                    writer.writerow([payment_id, "not_in_db", None, 0, None, round(settled_amount, 2)])
+
+        logger.info(f"Payment reconciliation finished: {summary}")
+        return summary
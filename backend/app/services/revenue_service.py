@@ -0,0 +1,106 @@
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import List, Optional
+from ..models.revenue import RevenueLedgerEntry
+from ..models.stalls import Stall
+from ..config import settings
+from ..utils.background import run_periodically
+from ..utils.logger import logger
+
+class RevenueService:
+    """Stall revenue kept as a ledger plus compacted totals"""
+
+    @staticmethod
+    def record_sales(db: Session, orders):
+        """Append one entry per completed order; the caller commits"""
+        if not orders:
+            return
+        db.execute(
+            insert(RevenueLedgerEntry),
+            [
+                {"stall_id": order.stall_id, "order_id": order.id, "amount": order.total_amount}
+                for order in orders
+            ]
+        )
+
+    @staticmethod
+    def compact(db: Session, batch_size: int = None) -> int:
+        """Fold unfolded ledger entries into the stall totals in batches"""
+        batch_size = batch_size or settings.REVENUE_COMPACT_BATCH_SIZE
+        folded = 0
+
+        while True:
+            batch = select(RevenueLedgerEntry.id).where(
+                RevenueLedgerEntry.folded == False
+            ).order_by(RevenueLedgerEntry.id).limit(batch_size).with_for_update(skip_locked=True)
+
+            entries = db.execute(
+                update(RevenueLedgerEntry)
+                .where(RevenueLedgerEntry.id.in_(batch.scalar_subquery()))
+                .values(folded=True)
+                .returning(RevenueLedgerEntry.stall_id, RevenueLedgerEntry.amount)
+                .execution_options(synchronize_session=False)
+            ).all()
+            if not entries:
+                break
+
+            per_stall = defaultdict(float)
+            for entry in entries:
+                per_stall[entry.stall_id] += entry.amount
+
+            stall_table = Stall.__table__
+            db.execute(
+                stall_table.update()
+                .where(stall_table.c.id == bindparam("stall_id"))
+                .values(
+                    total_revenue=func.coalesce(stall_table.c.total_revenue, 0) + bindparam("amount"),
+                    pending_payment=func.coalesce(stall_table.c.pending_payment, 0) + bindparam("amount")
+                ),
+                [{"stall_id": stall_id, "amount": amount} for stall_id, amount in per_stall.items()]
+            )
+            db.commit()
+
+            folded += len(entries)
+            if len(entries) < batch_size:
+                break
+
+        if folded:
+            logger.info(f"Folded {folded} revenue ledger entries")
+        return folded
+
+    @staticmethod
+    def get_summary(db: Session, after_id: int = 0, limit: int = 100, stall_id: Optional[int] = None) -> List[dict]:
+        """Live revenue per stall, ordered by stall ID, in one aggregate query"""
+        unfolded = select(
+            RevenueLedgerEntry.stall_id,
+            func.sum(RevenueLedgerEntry.amount).label("amount")
+        ).where(
+            RevenueLedgerEntry.folded == False
+        ).group_by(RevenueLedgerEntry.stall_id).subquery()
+        unfolded_amount = func.coalesce(unfolded.c.amount, 0)
+
+        query = db.query(
+            Stall.id,
+            Stall.name,
+            (func.coalesce(Stall.total_revenue, 0) + unfolded_amount).label("total_revenue"),
+            (func.coalesce(Stall.pending_payment, 0) + unfolded_amount).label("pending_payment")
+        ).outerjoin(unfolded, unfolded.c.stall_id == Stall.id)
+
+        if stall_id is not None:
+            query = query.filter(Stall.id == stall_id)
+        rows = query.filter(Stall.id > after_id).order_by(Stall.id).limit(limit).all()
+
+        return [
+            {
+                "stall_id": row.id,
+                "stall_name": row.name,
+                "total_revenue": row.total_revenue,
+                "pending_payment": row.pending_payment
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    async def run_compactor():
+        await run_periodically(RevenueService.compact, settings.REVENUE_COMPACT_INTERVAL_SECONDS)
@@ -0,0 +1,141 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import Dict, List, Tuple
+import heapq
+import math
+import re
+import time
+from ..models.events import Event
+from ..models.stalls import Stall
+from ..config import settings
+
+SEARCH_KINDS = ("event", "stall")
+
+# Must match the expressions of the GIN indexes in migration 0010
+EVENT_DOCUMENT = "to_tsvector('english', coalesce(e.name, '') || ' ' || coalesce(e.description, '') || ' ' || coalesce(e.venue, ''))"
+STALL_DOCUMENT = "to_tsvector('english', coalesce(s.name, '') || ' ' || coalesce(s.description, ''))"
+
+_WORD = re.compile(r"\w+")
+
+def _tokens(value: str) -> List[str]:
+    return _WORD.findall((value or "").lower())
+
+def _trigrams(word: str) -> set:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class InvertedIndex:
+    """In-memory search index used when the database is not PostgreSQL"""
+
+    def __init__(self, documents: List[Tuple[str, int, str, List[Tuple[str, float]]]]):
+        self.postings: Dict[str, Dict[Tuple[str, int], float]] = defaultdict(lambda: defaultdict(float))
+        self.titles = {}
+        for kind, id, title, fields in documents:
+            self.titles[(kind, id)] = title
+            for value, weight in fields:
+                for word in _tokens(value):
+                    self.postings[word][(kind, id)] += weight
+
+        self.trigram_words = defaultdict(set)
+        for word in self.postings:
+            for trigram in _trigrams(word):
+                self.trigram_words[trigram].add(word)
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Indexed words matching a query term, with their similarity"""
+        if term in self.postings:
+            return [(term, 1.0)]
+
+        term_trigrams = _trigrams(term)
+        candidates = set()
+        for trigram in term_trigrams:
+            candidates |= self.trigram_words.get(trigram, set())
+
+        matches = []
+        for word in candidates:
+            word_trigrams = _trigrams(word)
+            similarity = len(term_trigrams & word_trigrams) / len(term_trigrams | word_trigrams)
+            if similarity >= 0.3:
+                matches.append((word, similarity))
+        return sorted(matches, key=lambda match: -match[1])[:5]
+
+    def search(self, query: str, kinds: List[str], count: int) -> List[Tuple[str, int, str, float]]:
+        """The `count` best matches, best first"""
+        scores = defaultdict(float)
+        for term in set(_tokens(query)):
+            for word, similarity in self._expand(term):
+                postings = self.postings[word]
+                idf = math.log(1 + len(self.titles) / len(postings))
+                for key, weight in postings.items():
+                    if key[0] in kinds:
+                        scores[key] += similarity * weight * idf
+
+        ranked = heapq.nsmallest(count, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(kind, id, self.titles[(kind, id)], score) for (kind, id), score in ranked]
+
+_fallback = {"index": None, "built_at": 0.0}
+
+class SearchService:
+    @staticmethod
+    def search(db: Session, query: str, kinds: List[str], limit: int, offset: int) -> List[dict]:
+        """Ranked matches for active events and stalls"""
+        if db.bind.dialect.name == "postgresql":
+            rows = SearchService._search_postgres(db, query, kinds, limit, offset)
+        else:
+            rows = SearchService._get_fallback_index(db).search(query, kinds, offset + limit)[offset:]
+
+        return [
+            {"type": kind, "id": id, "title": title, "score": round(score, 4)}
+            for kind, id, title, score in rows
+        ]
+
+    @staticmethod
+    def _search_postgres(db: Session, query: str, kinds: List[str], limit: int, offset: int):
+        """Full-text rank plus trigram similarity on names, so typos still match"""
+        branches = []
+        if "event" in kinds:
+            branches.append(f"""
+                SELECT 'event' AS kind, e.id, e.name AS title,
+                       ts_rank({EVENT_DOCUMENT}, websearch_to_tsquery('english', :query))
+                       + similarity(e.name, :query) AS score
+                FROM events e
+                WHERE e.is_active
+                  AND ({EVENT_DOCUMENT} @@ websearch_to_tsquery('english', :query) OR e.name % :query)
+            """)
+        if "stall" in kinds:
+            branches.append(f"""
+                SELECT 'stall' AS kind, s.id, s.name AS title,
+                       ts_rank({STALL_DOCUMENT}, websearch_to_tsquery('english', :query))
+                       + similarity(s.name, :query) AS score
+                FROM stalls s
+                WHERE s.is_active
+                  AND ({STALL_DOCUMENT} @@ websearch_to_tsquery('english', :query) OR s.name % :query)
+            """)
+
+        return db.execute(
+            text(
+                f"SELECT kind, id, title, score FROM ({' UNION ALL '.join(branches)}) results "
+                "ORDER BY score DESC, kind, id LIMIT :limit OFFSET :offset"
+            ),
+            {"query": query, "limit": limit, "offset": offset}
+        ).all()
+
+    @staticmethod
+    def _get_fallback_index(db: Session) -> InvertedIndex:
+        """Build the in-process index, rebuilding it every SEARCH_INDEX_TTL_SECONDS"""
+        if _fallback["index"] is None or time.monotonic() - _fallback["built_at"] > settings.SEARCH_INDEX_TTL_SECONDS:
+            documents = [
+                ("event", id, name, [(name, 3.0), (venue, 2.0), (description, 1.0)])
+                for id, name, description, venue in db.query(
+                    Event.id, Event.name, Event.description, Event.venue
+                ).filter(Event.is_active == True).yield_per(5000)
+            ] + [
+                ("stall", id, name, [(name, 3.0), (description, 1.0)])
+                for id, name, description in db.query(
+                    Stall.id, Stall.name, Stall.description
+                ).filter(Stall.is_active == True).yield_per(5000)
+            ]
+            _fallback["index"] = InvertedIndex(documents)
+            _fallback["built_at"] = time.monotonic()
+        return _fallback["index"]
@@ -0,0 +1,118 @@
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import List, Tuple
+from cachetools import LRUCache
+import zlib
+from ..models.inventory import EventInventory
+from ..models.tickets import Ticket, TicketStatus
+from .inventory_service import InventoryService
+from .stats_service import StatsService
+from .gate_service import GateService, ScanResult
+
+_snapshot_cache = LRUCache(maxsize=64)
+
+def encode_ticket_ids(ticket_ids: List[int]) -> bytes:
+    """Encode sorted ticket IDs as zlib-compressed delta varints"""
+    out = bytearray()
+
+    def write_varint(value: int):
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    write_varint(len(ticket_ids))
+    previous = 0
+    for ticket_id in ticket_ids:
+        write_varint(ticket_id - previous)
+        previous = ticket_id
+    return zlib.compress(bytes(out), 9)
+
+class ConflictReason:
+    DOUBLE_USE = "double_use"
+    INVALID = "invalid"
+
+class SnapshotService:
+    """Offline scanner support: valid-ticket snapshots and scan log sync"""
+
+    @staticmethod
+    def get_snapshot(db: Session, event_id: int) -> Tuple[int, int, bytes]:
+        """Return (version, ticket_count, payload) for an event's confirmed tickets"""
+        version = db.query(EventInventory.version).filter(
+            EventInventory.event_id == event_id
+        ).scalar()
+        if version is None:
+            InventoryService.get_availability(db, event_id)
+            version = 0
+
+        cached = _snapshot_cache.get(event_id)
+        if cached and cached[0] == version:
+            return cached
+
+        ticket_ids = [
+            ticket_id for ticket_id, in db.query(Ticket.id).filter(
+                Ticket.event_id == event_id,
+                Ticket.status == TicketStatus.CONFIRMED
+            ).order_by(Ticket.id).yield_per(10000)
+        ]
+        snapshot = (version, len(ticket_ids), encode_ticket_ids(ticket_ids))
+        _snapshot_cache[event_id] = snapshot
+        return snapshot
+
+    @staticmethod
+    def sync_scans(db: Session, event_id: int, scans: list) -> dict:
+        """Apply offline scan logs; only the earliest scan of a ticket is accepted"""
+        scans = sorted(scans, key=lambda scan: scan.scanned_at)
+
+        first_scans = {}
+        conflicts = []
+        for scan in scans:
+            if scan.ticket_id in first_scans:
+                conflicts.append((scan, ConflictReason.DOUBLE_USE))
+            else:
+                first_scans[scan.ticket_id] = scan
+        ticket_ids = list(first_scans)
+
+        if GateService.is_open(event_id):
+            results = dict(zip(ticket_ids, GateService.check_in(db, event_id, ticket_ids)))
+            accepted = {ticket_id for ticket_id, result in results.items() if result == ScanResult.ADMITTED}
+            used = {ticket_id for ticket_id, result in results.items() if result == ScanResult.ALREADY_USED}
+        else:
+            checked_in = db.execute(
+                update(Ticket)
+                .where(
+                    Ticket.id.in_(ticket_ids),
+                    Ticket.event_id == event_id,
+                    Ticket.status == TicketStatus.CONFIRMED,
+                    Ticket.is_used == False
+                )
+                .values(is_used=True)
+                .returning(Ticket.id, Ticket.event_id, Ticket.ticket_type)
+                .execution_options(synchronize_session=False)
+            ).all()
+            StatsService.record_checkins(db, checked_in)
+            db.commit()
+            accepted = {row.id for row in checked_in}
+
+            remaining = [ticket_id for ticket_id in ticket_ids if ticket_id not in accepted]
+            used = {
+                ticket_id for ticket_id, in db.query(Ticket.id).filter(
+                    Ticket.id.in_(remaining),
+                    Ticket.event_id == event_id,
+                    Ticket.status == TicketStatus.CONFIRMED
+                ).all()
+            } if remaining else set()
+
+        for ticket_id, scan in first_scans.items():
+            if ticket_id in accepted:
+                continue
+            reason = ConflictReason.DOUBLE_USE if ticket_id in used else ConflictReason.INVALID
+            conflicts.append((scan, reason))
+
+        return {
+            "accepted": len(accepted),
+            "conflicts": [
+                {"ticket_id": scan.ticket_id, "scanned_at": scan.scanned_at, "reason": reason}
+                for scan, reason in conflicts
+            ]
+        }
@@ -0,0 +1,145 @@
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from datetime import datetime
+from ..models.events import Event
+from ..models.inventory import EventInventory
+from ..models.stats import EventTicketStats
+from ..models.tickets import Ticket, TicketType, TicketStatus
+from ..config import settings
+from ..utils.background import run_periodically
+from ..utils.logger import logger
+
+class StatsService:
+    """Per-event sales statistics"""
+
+    @staticmethod
+    def create_for_event(db: Session, event: Event):
+        db.add_all(
+            EventTicketStats(event_id=event.id, ticket_type=ticket_type, sold=0, revenue=0.0, checked_in=0)
+            for ticket_type in TicketType
+        )
+
+    @staticmethod
+    def _add(db: Session, changes: dict):
+        # Sorted so concurrent transactions lock stats rows in the same order
+        for (event_id, ticket_type), values in sorted(changes.items()):
+            db.execute(
+                update(EventTicketStats)
+                .where(
+                    EventTicketStats.event_id == event_id,
+                    EventTicketStats.ticket_type == ticket_type
+                )
+                .values({
+                    name: getattr(EventTicketStats, name) + value
+                    for name, value in values.items()
+                })
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def record_sales(db: Session, tickets):
+        """Count newly confirmed tickets; each needs event_id, ticket_type and price"""
+        changes = defaultdict(lambda: {"sold": 0, "revenue": 0.0})
+        for ticket in tickets:
+            totals = changes[(ticket.event_id, ticket.ticket_type)]
+            totals["sold"] += 1
+            totals["revenue"] += ticket.price or 0.0
+        StatsService._add(db, changes)
+
+    @staticmethod
+    def record_checkins(db: Session, tickets):
+        """Count newly used tickets; each needs event_id and ticket_type"""
+        changes = defaultdict(lambda: {"checked_in": 0})
+        for ticket in tickets:
+            changes[(ticket.event_id, ticket.ticket_type)]["checked_in"] += 1
+        StatsService._add(db, changes)
+
+    @staticmethod
+    def get_stats(db: Session, event_id: int) -> dict:
+        capacity = db.query(EventInventory.capacity).filter(
+            EventInventory.event_id == event_id
+        ).scalar()
+        rows = db.query(EventTicketStats).filter(
+            EventTicketStats.event_id == event_id
+        ).order_by(EventTicketStats.ticket_type).all()
+
+        sold = sum(row.sold for row in rows)
+        checked_in = sum(row.checked_in for row in rows)
+        return {
+            "event_id": event_id,
+            "capacity": capacity,
+            "sold": sold,
+            "revenue": sum(row.revenue for row in rows),
+            "checked_in": checked_in,
+            "check_in_rate": checked_in / sold if sold else 0.0,
+            "reconciled_at": min((row.reconciled_at for row in rows if row.reconciled_at), default=None),
+            "ticket_types": [
+                {
+                    "ticket_type": row.ticket_type,
+                    "sold": row.sold,
+                    "revenue": row.revenue,
+                    "checked_in": row.checked_in,
+                    "check_in_rate": row.checked_in / row.sold if row.sold else 0.0
+                }
+                for row in rows
+            ]
+        }
+
+    @staticmethod
+    def reconcile_event(db: Session, event_id: int) -> bool:
+        """Recount one event's tickets and fix its counters; returns True on drift"""
+        # Lock before counting: earlier updates are committed and counted, later ones wait
+        existing = {
+            row.ticket_type: row
+            for row in db.query(EventTicketStats).filter(
+                EventTicketStats.event_id == event_id
+            ).with_for_update().all()
+        }
+
+        counts = {
+            ticket_type: (sold, revenue or 0.0, checked_in or 0)
+            for ticket_type, sold, revenue, checked_in in db.query(
+                Ticket.ticket_type,
+                func.count(Ticket.id),
+                func.sum(Ticket.price),
+                func.sum(case((Ticket.is_used == True, 1), else_=0))
+            ).filter(
+                Ticket.event_id == event_id,
+                Ticket.status == TicketStatus.CONFIRMED
+            ).group_by(Ticket.ticket_type).all()
+        }
+
+        drifted = False
+        now = datetime.utcnow()
+        for ticket_type in TicketType:
+            sold, revenue, checked_in = counts.get(ticket_type, (0, 0.0, 0))
+            row = existing.get(ticket_type)
+            if row is None:
+                row = EventTicketStats(event_id=event_id, ticket_type=ticket_type)
+                db.add(row)
+            if (row.sold, row.checked_in) != (sold, checked_in) or abs((row.revenue or 0.0) - revenue) > 0.005:
+                drifted = True
+            row.sold, row.revenue, row.checked_in = sold, revenue, checked_in
+            row.reconciled_at = now
+        db.commit()
+        return drifted
+
+    @staticmethod
+    def reconcile(db: Session) -> int:
+        """Reconcile every active event, one short transaction per event"""
+        event_ids = [event_id for event_id, in db.query(Event.id).filter(Event.is_active == True).all()]
+        db.commit()
+
+        drifted = 0
+        for event_id in event_ids:
+            if StatsService.reconcile_event(db, event_id):
+                drifted += 1
+
+        if drifted:
+            logger.warning(f"Corrected sales statistics drift for {drifted} events")
+        return drifted
+
+    @staticmethod
+    async def run_reconciler():
+        await run_periodically(StatsService.reconcile, settings.STATS_RECONCILE_INTERVAL_SECONDS)
@@ -0,0 +1,125 @@
+from fastapi import HTTPException, status
+from jose import JWTError, jwt
+from datetime import datetime, timedelta
+import math
+import time
+from ..config import settings
+from .session_service import redis_client
+
+# Advance the admission cursor by `rate` per second since the last call, without
+# letting it run more than `burst` ahead of the people actually in the queue.
+_ADVANCE_SCRIPT = redis_client.register_script("""
+local issued = tonumber(redis.call('GET', KEYS[1]) or '0')
+local now = tonumber(ARGV[1])
+local state = redis.call('HMGET', KEYS[2], 'admitted', 'updated_at')
+local admitted = tonumber(state[1] or ARGV[3])
+local updated_at = tonumber(state[2] or ARGV[1])
+admitted = math.min(admitted + math.max(now - updated_at, 0) * tonumber(ARGV[2]), issued + tonumber(ARGV[3]))
+redis.call('HSET', KEYS[2], 'admitted', tostring(admitted), 'updated_at', ARGV[1])
+redis.call('EXPIRE', KEYS[2], 86400)
+return tostring(admitted)
+""")
+
+# Hand out the next queue number, or the one this user already holds, so
+# joining again never moves anyone back.
+_JOIN_SCRIPT = redis_client.register_script("""
+local number = redis.call('HGET', KEYS[2], ARGV[1])
+if not number then
+    number = redis.call('INCR', KEYS[1])
+    redis.call('HSET', KEYS[2], ARGV[1], number)
+end
+redis.call('EXPIRE', KEYS[1], 86400)
+redis.call('EXPIRE', KEYS[2], 86400)
+return tonumber(number)
+""")
+
+class WaitingRoomService:
+    """Admission queue in front of ticket booking"""
+
+    @staticmethod
+    def _keys(event_id: int):
+        return f"waiting_room:{event_id}:issued", f"waiting_room:{event_id}:cursor"
+
+    @staticmethod
+    def _admitted(event_id: int) -> int:
+        admitted = _ADVANCE_SCRIPT(
+            keys=list(WaitingRoomService._keys(event_id)),
+            args=[time.time(), settings.WAITING_ROOM_ADMIT_RATE, settings.WAITING_ROOM_BURST]
+        )
+        return math.floor(float(admitted))
+
+    @staticmethod
+    def _encode(claims: dict, expires: timedelta) -> str:
+        return jwt.encode(
+            {**claims, "exp": datetime.utcnow() + expires},
+            settings.SECRET_KEY,
+            algorithm=settings.ALGORITHM
+        )
+
+    @staticmethod
+    def _decode(token: str, token_type: str, event_id: int) -> dict:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            payload = {}
+        if payload.get("type") != token_type or payload.get("event_id") != event_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Invalid {token_type} token"
+            )
+        return payload
+
+    @staticmethod
+    def join(event_id: int, user_id: int) -> dict:
+        issued_key, _ = WaitingRoomService._keys(event_id)
+        number = _JOIN_SCRIPT(keys=[issued_key, f"waiting_room:{event_id}:members"], args=[user_id])
+
+        queue_token = WaitingRoomService._encode(
+            {"sub": str(user_id), "event_id": event_id, "number": number, "type": "queue"},
+            timedelta(hours=6)
+        )
+        return WaitingRoomService.get_status(event_id, queue_token)
+
+    @staticmethod
+    def get_status(event_id: int, queue_token: str) -> dict:
+        claims = WaitingRoomService._decode(queue_token, "queue", event_id)
+        position = claims["number"] - WaitingRoomService._admitted(event_id)
+
+        if position > 0:
+            return {
+                "event_id": event_id,
+                "queue_token": queue_token,
+                "admitted": False,
+                "position": position,
+                "retry_after": min(max(math.ceil(position / settings.WAITING_ROOM_ADMIT_RATE), 1), 30),
+                "admission_token": None
+            }
+
+        return {
+            "event_id": event_id,
+            "queue_token": queue_token,
+            "admitted": True,
+            "position": 0,
+            "retry_after": 0,
+            "admission_token": WaitingRoomService._encode(
+                {"sub": claims["sub"], "event_id": event_id, "type": "admission"},
+                timedelta(minutes=settings.ADMISSION_TOKEN_MINUTES)
+            )
+        }
+
+    @staticmethod
+    def verify_admission(admission_token: str, event_id: int, user_id: int):
+        if not settings.WAITING_ROOM_ENABLED:
+            return
+        if not admission_token:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Join the waiting room to book tickets for this event"
+            )
+
+        claims = WaitingRoomService._decode(admission_token, "admission", event_id)
+        if claims.get("sub") != str(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid admission token"
+            )
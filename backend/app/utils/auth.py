@@ -1,34 +1,37 @@
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
+from typing import Optional
 from ..database import get_db
 from ..models import users
 from ..config import settings
 from ..routers.auth import oauth2_scheme
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
+def get_user_from_token(db: Session, token: str) -> Optional[users.User]:
+    """Resolve a bearer token to its user, or None when it is invalid"""
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-        
-    user = db.query(users.User).filter(users.User.email == email).first()
+        return None
+    
+    email: str = payload.get("sub")
+    if email is None:
+        return None
+    return db.query(users.User).filter(users.User.email == email).first()
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    user = get_user_from_token(db, token)
     if user is None:
-        raise credentials_exception
-    return user 
\ No newline at end of file
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
\ No newline at end of file
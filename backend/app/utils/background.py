@@ -0,0 +1,33 @@
+import asyncio
+from typing import Callable, List
+from starlette.concurrency import run_in_threadpool
+from ..database import SessionLocal
+from .logger import logger
+
+_tasks: List[asyncio.Task] = []
+
+def run_with_session(job: Callable, *args):
+    """Run a synchronous `job(db, *args)` with its own database session"""
+    db = SessionLocal()
+    try:
+        return job(db, *args)
+    finally:
+        db.close()
+
+async def run_periodically(job: Callable, interval: float, *args):
+    """Call `job(db, *args)` on a worker thread every `interval` seconds"""
+    while True:
+        try:
+            await run_in_threadpool(run_with_session, job, *args)
+        except Exception:
+            logger.exception(f"Background job {job.__qualname__} failed")
+        await asyncio.sleep(interval)
+
+def start_background_job(coro):
+    _tasks.append(asyncio.create_task(coro))
+
+async def stop_background_jobs():
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
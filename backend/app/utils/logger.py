@@ -18,6 +18,9 @@ class SecurityFormatter(logging.Formatter):
                 'url': str(getattr(record.request, 'url', 'unknown')),
                 'timestamp': datetime.utcnow().isoformat()
             })
+        else:
+            # Background jobs log without a request
+            record.request_data = '{}'
         return super().format(record)
 
 # Create logger
@@ -0,0 +1,31 @@
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from typing import Optional, Tuple
+from datetime import datetime
+import base64
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        timestamp, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def paginate_newest_first(query: Query, model, cursor: Optional[str], limit: int) -> dict:
+    """Keyset pagination over (created_at, id), newest first"""
+    if cursor:
+        query = query.filter(tuple_(model.created_at, model.id) < decode_cursor(cursor))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
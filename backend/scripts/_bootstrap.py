@@ -0,0 +1,46 @@
+"""Shared setup for the scripts in this directory.
+
+Import it before anything from `app`: it puts the backend on sys.path and loads
+every model module, because relationships name their targets as strings and the
+mappers can only be configured once all of them are imported.
+"""
+import argparse
+import os
+import sys
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import app.models.activity  # noqa: E402,F401
+import app.models.events  # noqa: E402,F401
+import app.models.inventory  # noqa: E402,F401
+import app.models.menu_items  # noqa: E402,F401
+import app.models.notifications  # noqa: E402,F401
+import app.models.orders  # noqa: E402,F401
+import app.models.security  # noqa: E402,F401
+import app.models.stalls  # noqa: E402,F401
+import app.models.tickets  # noqa: E402,F401
+import app.models.users  # noqa: E402,F401
+from app.database import SessionLocal  # noqa: E402
+
+
+def benchmark_parser(description: str) -> argparse.ArgumentParser:
+    """Argument parser for a benchmark that seeds rows, with --keep to leave them behind"""
+    parser = argparse.ArgumentParser(description=description, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows")
+    return parser
+
+
+@contextmanager
+def scratch_session(keep: bool = False):
+    """Yield a session and `on_exit(cleanup, *args)`; unless `keep`, each cleanup(db, *args) runs at exit, newest first"""
+    db = SessionLocal()
+    cleanups = []
+    try:
+        yield db, lambda cleanup, *args: cleanups.append((cleanup, args))
+    finally:
+        db.rollback()
+        if not keep:
+            for cleanup, args in reversed(cleanups):
+                cleanup(db, *args)
+        db.close()
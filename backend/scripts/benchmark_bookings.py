@@ -0,0 +1,84 @@
+"""Benchmark parallel seat reservations against one event's inventory.
+
+    DATABASE_URL=postgresql://.../scratch python scripts/benchmark_bookings.py --attempts 5000 --capacity 1000
+
+Seeds an event with --capacity seats, fires --attempts reservations from
+--workers threads, each in its own session like concurrent requests, and
+reports bookings/s. Fails if more seats were sold than exist, then deletes
+what it created. Run it against a scratch database.
+"""
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+from _bootstrap import benchmark_parser, scratch_session
+from app.database import SessionLocal
+from app.models.events import Event
+from app.models.inventory import EventInventory, TicketTypeInventory
+from app.models.tickets import TicketType
+from app.services.inventory_service import InventoryService
+
+
+def reserve_one(event_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        InventoryService.reserve(db, event_id, TicketType.GENERAL)
+        db.commit()
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+def seed(db, capacity: int, run: str) -> int:
+    event = Event(name=f"Booking benchmark {run}", venue="Benchmark hall", date=datetime.utcnow(),
+                  capacity=capacity, is_active=False)
+    db.add(event)
+    db.flush()
+    InventoryService.create_for_event(db, event)
+    db.commit()
+    return event.id
+
+
+def cleanup(db, event_id: int):
+    db.execute(delete(TicketTypeInventory).where(TicketTypeInventory.event_id == event_id))
+    db.execute(delete(EventInventory).where(EventInventory.event_id == event_id))
+    db.execute(delete(Event).where(Event.id == event_id))
+    db.commit()
+
+
+def main():
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--attempts", type=int, default=5000)
+    parser.add_argument("--capacity", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=32)
+    args = parser.parse_args()
+
+    run = uuid.uuid4().hex[:8]
+    with scratch_session(args.keep) as (db, on_exit):
+        event_id = seed(db, args.capacity, run)
+        on_exit(cleanup, event_id)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            booked = sum(pool.map(reserve_one, [event_id] * args.attempts))
+        elapsed = time.perf_counter() - started
+
+        db.expire_all()
+        sold = db.query(EventInventory.sold).filter(EventInventory.event_id == event_id).scalar()
+        print(
+            f"{args.attempts} attempts on {args.workers} workers in {elapsed:.2f}s "
+            f"({args.attempts / elapsed:.0f} attempts/s), {booked} booked, {sold}/{args.capacity} sold"
+        )
+        if sold > args.capacity or sold != booked:
+            sys.exit(f"inventory is inconsistent: {sold} sold, {booked} booked, capacity {args.capacity}")
+
+
+if __name__ == "__main__":
+    main()
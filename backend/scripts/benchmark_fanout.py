@@ -0,0 +1,107 @@
+"""Benchmark notification fan-out to an event's ticket holders.
+
+    DATABASE_URL=postgresql://.../scratch python scripts/benchmark_fanout.py --recipients 100000
+
+Seeds the recipients as users holding confirmed tickets for a new event,
+times one-commit-per-notification sending on a sample and the chunked
+INSERT ... SELECT broadcaster on the whole audience, then deletes what it
+created. Run it against a scratch database.
+"""
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+
+from _bootstrap import benchmark_parser, scratch_session
+from app.models.events import Event
+from app.models.notifications import (
+    BroadcastAudience, Notification, NotificationBroadcast, NotificationType
+)
+from app.models.tickets import Ticket, TicketStatus, TicketType
+from app.models.users import User, UserRole
+from app.services.notification_service import NotificationService
+
+
+def seed(db, recipients: int, run: str) -> int:
+    event = Event(name=f"Fan-out benchmark {run}", venue="Benchmark hall", date=datetime.utcnow(),
+                  capacity=recipients, is_active=False)
+    db.add(event)
+    db.flush()
+
+    for start in range(0, recipients, 10000):
+        user_ids = db.execute(
+            insert(User).returning(User.id),
+            [
+                {"email": f"bench-{run}-{i}@example.invalid", "full_name": f"Bench {i}",
+                 "password": "!", "role": UserRole.STUDENT, "is_active": True}
+                for i in range(start, min(start + 10000, recipients))
+            ]
+        ).scalars().all()
+        db.execute(insert(Ticket), [
+            {"event_id": event.id, "user_id": user_id, "ticket_type": TicketType.GENERAL,
+             "price": 0.0, "status": TicketStatus.CONFIRMED}
+            for user_id in user_ids
+        ])
+    db.commit()
+    return event.id
+
+
+def cleanup(db, event_id: int, run: str):
+    bench_users = select(User.id).where(User.email.like(f"bench-{run}-%"))
+    db.execute(delete(Notification).where(Notification.user_id.in_(bench_users)))
+    db.execute(delete(NotificationBroadcast).where(NotificationBroadcast.event_id == event_id))
+    db.execute(delete(Ticket).where(Ticket.event_id == event_id))
+    db.execute(delete(Event).where(Event.id == event_id))
+    db.execute(delete(User).where(User.email.like(f"bench-{run}-%")))
+    db.commit()
+
+
+def main():
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--recipients", type=int, default=100000)
+    parser.add_argument("--naive-sample", type=int, default=2000,
+                        help="notifications sent one commit at a time, to extrapolate the old path")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+
+    run = uuid.uuid4().hex[:8]
+    with scratch_session(args.keep) as (db, on_exit):
+        started = time.perf_counter()
+        event_id = seed(db, args.recipients, run)
+        on_exit(cleanup, event_id, run)
+        print(f"seeded {args.recipients} ticket holders in {time.perf_counter() - started:.1f}s")
+
+        sample = db.execute(
+            select(Ticket.user_id).where(Ticket.event_id == event_id).limit(args.naive_sample)
+        ).scalars().all()
+        started = time.perf_counter()
+        for user_id in sample:
+            NotificationService.create_notification(
+                db, user_id, NotificationType.EVENT_UPDATE, "Benchmark", "One commit per notification"
+            )
+        naive = time.perf_counter() - started
+        print(
+            f"per-row: {len(sample)} in {naive:.2f}s, "
+            f"~{naive / max(len(sample), 1) * args.recipients:.0f}s extrapolated to {args.recipients}"
+        )
+
+        started = time.perf_counter()
+        broadcast = NotificationService.create_broadcast(
+            db, None, BroadcastAudience.EVENT_TICKET_HOLDERS, "Benchmark", "Fan-out", event_id=event_id
+        )
+        db.commit()
+        broadcast_id = broadcast.id
+        NotificationService.process_broadcasts(db, args.chunk_size)
+        elapsed = time.perf_counter() - started
+
+        broadcast = db.get(NotificationBroadcast, broadcast_id)
+        print(
+            f"fan-out: {broadcast.sent_count}/{broadcast.total_recipients} sent, "
+            f"status {broadcast.status.value}, in {elapsed:.2f}s "
+            f"({broadcast.sent_count / elapsed:.0f} notifications/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
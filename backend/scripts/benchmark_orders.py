@@ -0,0 +1,85 @@
+"""Benchmark order creation throughput against the number of line items.
+
+    DATABASE_URL=postgresql://.../scratch python scripts/benchmark_orders.py --orders 500 --items 1 5 20
+
+Seeds a stall with a menu and a customer, places --orders orders through
+OrderService.create_order for each line-item count, reports orders/s, then
+deletes what it created. With --stocked every menu item has a stock count,
+so each order also takes stock. Run it against a scratch database.
+"""
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select
+
+from _bootstrap import benchmark_parser, scratch_session
+from app.models.menu_items import MenuItem
+from app.models.orders import Order, OrderItem
+from app.models.stalls import Stall, StallType
+from app.models.users import User, UserRole
+from app.schemas.orders import OrderCreate, OrderItemCreate
+from app.services.order_service import OrderService
+
+
+def seed(db, menu_size: int, stock, run: str):
+    user = User(email=f"bench-{run}@example.invalid", full_name="Order bench",
+                password="!", role=UserRole.STUDENT, is_active=True)
+    db.add(user)
+    db.flush()
+    stall = Stall(name=f"Order benchmark {run}", description="Benchmark stall", type=StallType.FOOD,
+                  owner_id=user.id, is_active=True)
+    db.add(stall)
+    db.flush()
+
+    menu_item_ids = db.execute(
+        insert(MenuItem).returning(MenuItem.id),
+        [
+            {"stall_id": stall.id, "name": f"Item {i}", "price": 10.0 + i,
+             "is_available": True, "stock": stock}
+            for i in range(menu_size)
+        ]
+    ).scalars().all()
+    db.commit()
+    return user, stall.id, menu_item_ids
+
+
+def cleanup(db, stall_id: int, run: str):
+    bench_orders = select(Order.id).where(Order.stall_id == stall_id)
+    db.execute(delete(OrderItem).where(OrderItem.order_id.in_(bench_orders)))
+    db.execute(delete(Order).where(Order.stall_id == stall_id))
+    db.execute(delete(MenuItem).where(MenuItem.stall_id == stall_id))
+    db.execute(delete(Stall).where(Stall.id == stall_id))
+    db.execute(delete(User).where(User.email == f"bench-{run}@example.invalid"))
+    db.commit()
+
+
+def main():
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--orders", type=int, default=500, help="orders placed per line-item count")
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 5, 20], help="line items per order")
+    parser.add_argument("--stocked", action="store_true", help="give every menu item a stock count")
+    args = parser.parse_args()
+
+    run = uuid.uuid4().hex[:8]
+    stock = args.orders * len(args.items) if args.stocked else None
+    with scratch_session(args.keep) as (db, on_exit):
+        user, stall_id, menu_item_ids = seed(db, max(args.items), stock, run)
+        on_exit(cleanup, stall_id, run)
+
+        for item_count in args.items:
+            order = OrderCreate(stall_id=stall_id, items=[
+                OrderItemCreate(menu_item_id=menu_item_id, quantity=1)
+                for menu_item_id in menu_item_ids[:item_count]
+            ])
+            started = time.perf_counter()
+            for _ in range(args.orders):
+                OrderService.create_order(db, user, order)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{item_count:>3} items: {args.orders} orders in {elapsed:.2f}s "
+                f"({args.orders / elapsed:.0f} orders/s, {elapsed / args.orders * 1000:.1f} ms/order)"
+            )
+
+
+if __name__ == "__main__":
+    main()
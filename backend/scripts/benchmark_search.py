@@ -0,0 +1,112 @@
+"""Benchmark search latency over a large catalogue of events and stalls.
+
+    DATABASE_URL=postgresql://.../scratch python scripts/benchmark_search.py --rows 100000
+
+Seeds --rows active events and stalls with names drawn from a small
+vocabulary, runs exact, multi-word, typo and no-match queries through
+SearchService.search and reports their latency percentiles, then deletes
+what it created. On PostgreSQL this times the full-text and trigram
+queries (run the migrations first so the indexes exist); elsewhere it
+times the in-process index, whose build time is reported separately.
+Run it against a scratch database.
+"""
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert
+
+from _bootstrap import benchmark_parser, scratch_session
+from app.models.events import Event
+from app.models.stalls import Stall, StallType
+from app.models.users import User, UserRole
+from app.services import search_service
+from app.services.search_service import SEARCH_KINDS, SearchService
+
+ADJECTIVES = ["annual", "midnight", "acoustic", "robotics", "cultural", "spicy", "classic", "open", "grand", "retro"]
+NOUNS = ["concert", "hackathon", "workshop", "quiz", "marathon", "showcase", "biryani", "momos", "coffee", "gaming"]
+VENUES = ["Main Auditorium", "Open Air Theatre", "Lecture Hall Complex", "Sports Ground", "Library Lawn"]
+
+QUERIES = {
+    "exact": "hackathon",
+    "multi-word": "midnight acoustic concert",
+    "typo": "hackaton",
+    "venue": "open air theatre",
+    "no match": "zzzzqx",
+}
+
+
+def seed(db, rows: int, run: str) -> int:
+    rng = random.Random(run)
+    owner = User(email=f"bench-{run}@example.invalid", full_name="Search bench", password="!",
+                 role=UserRole.FOOD_STALL, is_active=True)
+    db.add(owner)
+    db.flush()
+
+    def name():
+        return f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.randrange(1000)}".title()
+
+    stalls = rows // 10
+    for start in range(0, rows - stalls, 10000):
+        db.execute(insert(Event), [
+            {"name": name(), "description": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} for everyone",
+             "venue": rng.choice(VENUES), "date": datetime.utcnow() + timedelta(days=i % 365),
+             "capacity": 100, "is_active": True, "created_by": owner.id}
+            for i in range(start, min(start + 10000, rows - stalls))
+        ])
+    for start in range(0, stalls, 10000):
+        db.execute(insert(Stall), [
+            {"name": name(), "description": f"{rng.choice(NOUNS)} and more", "type": StallType.FOOD,
+             "owner_id": owner.id, "is_active": True}
+            for _ in range(start, min(start + 10000, stalls))
+        ])
+    db.commit()
+    return owner.id
+
+
+def cleanup(db, owner_id: int):
+    db.execute(delete(Event).where(Event.created_by == owner_id))
+    db.execute(delete(Stall).where(Stall.owner_id == owner_id))
+    db.execute(delete(User).where(User.id == owner_id))
+    db.commit()
+
+
+def main():
+    parser = benchmark_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=100000, help="events plus stalls to seed")
+    parser.add_argument("--repeat", type=int, default=50, help="runs of each query")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    run = uuid.uuid4().hex[:8]
+    with scratch_session(args.keep) as (db, on_exit):
+        started = time.perf_counter()
+        owner_id = seed(db, args.rows, run)
+        on_exit(cleanup, owner_id)
+        print(f"seeded {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+        backend = db.bind.dialect.name
+        if backend != "postgresql":
+            search_service._fallback["index"] = None
+            started = time.perf_counter()
+            SearchService._get_fallback_index(db)
+            print(f"in-process index built in {time.perf_counter() - started:.2f}s")
+
+        print(f"{backend}, {args.repeat} runs per query, limit {args.limit}")
+        for label, query in QUERIES.items():
+            latencies = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results = SearchService.search(db, query, list(SEARCH_KINDS), args.limit, 0)
+                latencies.append((time.perf_counter() - started) * 1000)
+            cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+            print(
+                f"{label:>10} {query!r:<30} {len(results):>3} results  "
+                f"p50 {cuts[49]:.1f} ms  p95 {cuts[94]:.1f} ms  max {max(latencies):.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Local stand-in for the Razorpay API and its webhooks, for offline load tests.
+
+Serve a fake gateway and point the backend at it:
+
+    python scripts/fake_gateway.py serve --port 9000 --secret test-secret \
+        --webhook-url http://localhost:8000/payments/webhook
+    PAYMENT_GATEWAY_BASE_URL=http://localhost:9000/v1 RAZORPAY_WEBHOOK_SECRET=test-secret \
+        uvicorn app.main:app
+
+Orders created through the fake API are captured after --capture-delay
+seconds and their signed payment.captured webhook is posted to the backend.
+--latency and --failure-rate make the API slow or flaky, to exercise the
+backend's timeouts and circuit breaker.
+
+Or flood the webhook endpoint directly, with a share of redeliveries:
+
+    python scripts/fake_gateway.py flood --secret test-secret --count 20000 \
+        --concurrency 50 --duplicates 0.2 --webhook-url http://localhost:8000/payments/webhook
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import random
+import time
+import uuid
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+
+
+def captured_event(order_id: str, amount: int) -> dict:
+    payment = {
+        "id": f"pay_{uuid.uuid4().hex[:14]}",
+        "entity": "payment",
+        "amount": amount,
+        "currency": "INR",
+        "status": "captured",
+        "order_id": order_id,
+        "captured": True,
+    }
+    return {
+        "entity": "event",
+        "event": "payment.captured",
+        "contains": ["payment"],
+        "payload": {"payment": {"entity": payment}},
+        "created_at": int(time.time()),
+    }
+
+
+def signed_delivery(event: dict, secret: str):
+    body = json.dumps(event).encode()
+    headers = {
+        "Content-Type": "application/json",
+        "X-Razorpay-Signature": hmac.new(secret.encode(), body, hashlib.sha256).hexdigest(),
+        "X-Razorpay-Event-Id": f"evt_{uuid.uuid4().hex[:14]}",
+    }
+    return body, headers
+
+
+def create_app(args) -> FastAPI:
+    app = FastAPI(title="Fake payment gateway")
+    client = httpx.AsyncClient(timeout=10)
+    orders = {}
+
+    async def deliver(order_id: str, amount: int):
+        await asyncio.sleep(args.capture_delay)
+        body, headers = signed_delivery(captured_event(order_id, amount), args.secret)
+        try:
+            response = await client.post(args.webhook_url, content=body, headers=headers)
+            print(f"webhook {order_id} -> {response.status_code}")
+        except httpx.HTTPError as e:
+            print(f"webhook {order_id} failed: {e}")
+
+    @app.post("/v1/orders")
+    async def create_order(request: Request):
+        await asyncio.sleep(args.latency)
+        if random.random() < args.failure_rate:
+            raise HTTPException(status_code=500, detail={"error": {"code": "SERVER_ERROR"}})
+
+        data = await request.json()
+        order = {
+            "id": f"order_{uuid.uuid4().hex[:14]}",
+            "entity": "order",
+            "amount": data["amount"],
+            "currency": data.get("currency", "INR"),
+            "status": "created",
+            "notes": data.get("notes", []),
+            "created_at": int(time.time()),
+        }
+        orders[order["id"]] = order
+        if args.webhook_url:
+            asyncio.create_task(deliver(order["id"], order["amount"]))
+        return order
+
+    @app.get("/v1/orders/{order_id}")
+    async def fetch_order(order_id: str):
+        await asyncio.sleep(args.latency)
+        if order_id not in orders:
+            raise HTTPException(status_code=400, detail={"error": {"code": "BAD_REQUEST_ERROR"}})
+        return orders[order_id]
+
+    return app
+
+
+async def flood(args):
+    deliveries = []
+    for i in range(args.count):
+        if deliveries and random.random() < args.duplicates:
+            deliveries.append(random.choice(deliveries))
+        else:
+            deliveries.append(signed_delivery(captured_event(f"order_load{i}", 10000), args.secret))
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = {}
+
+    async with httpx.AsyncClient(timeout=30) as client:
+        async def send(body, headers):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(args.webhook_url, content=body, headers=headers)
+                    status = response.status_code
+                except httpx.HTTPError:
+                    status = "error"
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send(body, headers) for body, headers in deliveries))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"sent {len(deliveries)} deliveries in {elapsed:.2f}s ({len(deliveries) / elapsed:.0f}/s)")
+    print(f"status codes: {statuses}")
+    print(
+        f"latency p50 {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+        f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f}ms, "
+        f"max {latencies[-1] * 1000:.1f}ms"
+    )
+
+
+def main():
+    webhook = argparse.ArgumentParser(add_help=False)
+    webhook.add_argument("--secret", default=os.environ.get("RAZORPAY_WEBHOOK_SECRET", "test-secret"))
+    webhook.add_argument("--webhook-url", default="http://localhost:8000/payments/webhook")
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", parents=[webhook], help="run the fake gateway API")
+    serve.add_argument("--port", type=int, default=9000)
+    serve.add_argument("--capture-delay", type=float, default=0.5)
+    serve.add_argument("--latency", type=float, default=0.0)
+    serve.add_argument("--failure-rate", type=float, default=0.0)
+
+    flood_parser = commands.add_parser("flood", parents=[webhook], help="post signed webhooks as fast as allowed")
+    flood_parser.add_argument("--count", type=int, default=10000)
+    flood_parser.add_argument("--concurrency", type=int, default=50)
+    flood_parser.add_argument("--duplicates", type=float, default=0.1, help="share of redeliveries")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        uvicorn.run(create_app(args), port=args.port)
+    else:
+        asyncio.run(flood(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Reconcile a gateway settlement export against paid tickets and orders.
+
+    python scripts/reconcile_payments.py settlements.csv --report mismatches.csv
+
+The export is read as a stream, CSV or JSON Lines (one object per line),
+and the report lists every payment that is settled but unknown, recorded
+as paid but not settled, or settled for a different amount. Memory use is
+bounded by --partitions, so exports with millions of rows are fine; raise
+it for very large exports.
+"""
+import argparse
+import json
+import sys
+import time
+
+import _bootstrap  # noqa: F401
+from app.database import SessionLocal
+from app.services.reconciliation_service import ReconciliationService, read_settlement
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("settlement", help="settlement export, or - for stdin")
+    parser.add_argument("--report", default="reconciliation_report.csv")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    parser.add_argument("--payment-column", default="entity_id")
+    parser.add_argument("--amount-column", default="amount")
+    parser.add_argument("--amount-unit", choices=["paise", "rupees"], default="paise")
+    parser.add_argument("--partitions", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=10000, help="rows per server-side cursor fetch")
+    args = parser.parse_args()
+
+    file_format = args.format or ("csv" if args.settlement.endswith(".csv") else "jsonl")
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with (sys.stdin if args.settlement == "-" else open(args.settlement, newline="")) as stream, \
+                open(args.report, "w", newline="") as report:
+            summary = ReconciliationService.reconcile(
+                db,
+                read_settlement(stream, file_format, args.payment_column, args.amount_column,
+                                amount_in_paise=args.amount_unit == "paise"),
+                report,
+                partitions=args.partitions,
+                batch_size=args.batch_size
+            )
+    finally:
+        db.close()
+
+    print(json.dumps(summary, indent=2))
+    print(f"Report written to {args.report} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime
+from app.main import app
+from app.models.events import Event
+from app.models.tickets import Ticket, TicketStatus, TicketType
+from app.models.users import User, UserRole
+from app.services.gate_service import PENDING_CHECKINS_KEY, GateService, ScanResult
+from app.services.qr_service import QRService
+from app.services.session_service import redis_client
+from app.utils.auth import get_current_user
+
+@pytest.fixture(scope="module")
+def volunteer(db):
+    user = User(email="gate@example.com", full_name="Gate Volunteer", password="!",
+                role=UserRole.VOLUNTEER, is_active=True)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+@pytest.fixture
+def event(db):
+    event = Event(name="Gate event", venue="Main gate", date=datetime(2030, 1, 1), capacity=10)
+    db.add(event)
+    db.commit()
+    yield event
+    GateService.close_gate(db, event.id)
+
+@pytest.fixture
+def as_volunteer(client, volunteer):
+    app.dependency_overrides[get_current_user] = lambda: volunteer
+    yield client
+    del app.dependency_overrides[get_current_user]
+
+def make_ticket(db, event, user, **fields):
+    ticket = Ticket(event_id=event.id, user_id=user.id, ticket_type=TicketType.GENERAL, price=0.0, **fields)
+    db.add(ticket)
+    db.commit()
+    return ticket
+
+# Runs before the client starts the background flusher, which would drain the queue
+def test_check_in_admits_each_ticket_once(db, volunteer, event):
+    redis_client.delete(PENDING_CHECKINS_KEY)
+    fresh = make_ticket(db, event, volunteer, status=TicketStatus.CONFIRMED)
+    used = make_ticket(db, event, volunteer, status=TicketStatus.CONFIRMED, is_used=True)
+    held = make_ticket(db, event, volunteer, status=TicketStatus.HELD)
+    other_event = Event(name="Other gate event", venue="Side gate", date=datetime(2030, 1, 1), capacity=10)
+    db.add(other_event)
+    db.commit()
+    elsewhere = make_ticket(db, other_event, volunteer, status=TicketStatus.CONFIRMED)
+
+    assert GateService.open_gate(db, event.id) == 2
+    # Sold after the gate opened, so it is only found through the database
+    late = make_ticket(db, event, volunteer, status=TicketStatus.CONFIRMED)
+
+    results = GateService.check_in(
+        db, event.id, [fresh.id, fresh.id, used.id, held.id, elsewhere.id, late.id, late.id]
+    )
+    assert results == [
+        ScanResult.ADMITTED,
+        ScanResult.ALREADY_USED,
+        ScanResult.ALREADY_USED,
+        ScanResult.INVALID,
+        ScanResult.INVALID,
+        ScanResult.ADMITTED,
+        ScanResult.ALREADY_USED,
+    ]
+
+    # Admissions reach the database only when the queue is flushed
+    db.expire_all()
+    assert fresh.is_used is False
+    assert GateService.flush_checkins(db) == 2
+    db.expire_all()
+    assert fresh.is_used is True
+    assert late.is_used is True
+    assert held.is_used is False
+
+def test_verify_needs_an_open_gate(as_volunteer, event):
+    response = as_volunteer.post(f"/tickets/gate/{event.id}/verify", json={"scans": [QRService.sign(1, event.id)]})
+    assert response.status_code == 409
+
+def test_verify_rejects_forged_and_foreign_payloads(as_volunteer, db, volunteer, event):
+    ticket = make_ticket(db, event, volunteer, status=TicketStatus.CONFIRMED)
+    response = as_volunteer.post(f"/tickets/gate/{event.id}/open")
+    assert response.json()["tickets_loaded"] == 1
+
+    scans = [
+        QRService.sign(ticket.id, event.id),
+        QRService.sign(ticket.id, event.id + 1),
+        f"{ticket.id}.{event.id}.forged",
+        QRService.sign(ticket.id, event.id),
+    ]
+    response = as_volunteer.post(f"/tickets/gate/{event.id}/verify", json={"scans": scans})
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"payload": scans[0], "ticket_id": ticket.id, "result": ScanResult.ADMITTED},
+        {"payload": scans[1], "ticket_id": None, "result": ScanResult.INVALID},
+        {"payload": scans[2], "ticket_id": None, "result": ScanResult.INVALID},
+        {"payload": scans[3], "ticket_id": ticket.id, "result": ScanResult.ALREADY_USED},
+    ]
@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from app.config import settings
+from app.models.events import Event
+from app.models.inventory import EventInventory
+from app.models.tickets import Ticket, TicketStatus, TicketType
+from app.models.users import User, UserRole
+from app.services.hold_service import HoldService
+from app.services.inventory_service import InventoryService
+
+@pytest.fixture(scope="module")
+def buyer(db):
+    user = User(email="holds@example.com", full_name="Slow Payer", password="!",
+                role=UserRole.STUDENT, is_active=True)
+    db.add(user)
+    db.commit()
+    return user
+
+def make_event(db, capacity):
+    event = Event(name="Hold event", venue="Main hall", date=datetime(2030, 1, 1), capacity=capacity)
+    db.add(event)
+    db.flush()
+    InventoryService.create_for_event(db, event)
+    db.commit()
+    return event
+
+def hold(db, event, user, expires_at):
+    # The same steps the book route takes for a paid ticket
+    InventoryService.reserve(db, event.id, TicketType.GENERAL, hold=True)
+    ticket = Ticket(event_id=event.id, user_id=user.id, ticket_type=TicketType.GENERAL, price=100.0,
+                    status=TicketStatus.HELD, hold_expires_at=expires_at)
+    db.add(ticket)
+    db.commit()
+    return ticket
+
+def counters(db, event):
+    db.expire_all()
+    inventory = db.query(EventInventory).filter(EventInventory.event_id == event.id).one()
+    return inventory.sold, inventory.held
+
+def test_hold_expiry_follows_the_configured_window(monkeypatch):
+    monkeypatch.setattr(settings, "TICKET_HOLD_MINUTES", 15)
+    before = datetime.utcnow()
+    expires_at = HoldService.hold_expiry()
+    assert before + timedelta(minutes=15) <= expires_at <= datetime.utcnow() + timedelta(minutes=15)
+
+def test_sweeper_releases_only_overdue_holds(db, buyer):
+    event = make_event(db, capacity=10)
+    past = datetime.utcnow() - timedelta(minutes=1)
+    overdue = [hold(db, event, buyer, past) for _ in range(3)]
+    fresh = hold(db, event, buyer, HoldService.hold_expiry())
+
+    # A batch smaller than the backlog makes the sweeper loop
+    assert HoldService.release_expired_holds(db, batch_size=2) == 3
+
+    db.expire_all()
+    assert all(ticket.status == TicketStatus.EXPIRED for ticket in overdue)
+    assert all(ticket.hold_expires_at is None for ticket in overdue)
+    assert fresh.status == TicketStatus.HELD
+    assert counters(db, event) == (0, 1)
+    assert HoldService.release_expired_holds(db) == 0
+
+def test_confirm_turns_a_hold_into_a_sale(db, buyer):
+    event = make_event(db, capacity=1)
+    ticket = hold(db, event, buyer, HoldService.hold_expiry())
+
+    HoldService.confirm_ticket(db, ticket, "pay_held")
+    db.commit()
+
+    assert ticket.status == TicketStatus.CONFIRMED
+    assert ticket.payment_id == "pay_held"
+    assert ticket.hold_expires_at is None
+    assert counters(db, event) == (1, 0)
+
+def test_confirm_retakes_the_seat_of_an_expired_hold(db, buyer):
+    event = make_event(db, capacity=1)
+    ticket = hold(db, event, buyer, datetime.utcnow() - timedelta(minutes=1))
+    HoldService.release_expired_holds(db)
+    assert counters(db, event) == (0, 0)
+
+    HoldService.confirm_tickets(db, [ticket.id], "pay_late")
+    db.commit()
+    # A second verify of the same payment must not take another seat
+    HoldService.confirm_tickets(db, [ticket.id], "pay_late")
+    db.commit()
+
+    db.expire_all()
+    assert ticket.status == TicketStatus.CONFIRMED
+    assert ticket.payment_id == "pay_late"
+    assert counters(db, event) == (1, 0)
+
+def test_confirm_of_an_expired_hold_fails_once_the_seat_is_resold(db, buyer):
+    event = make_event(db, capacity=1)
+    ticket = hold(db, event, buyer, datetime.utcnow() - timedelta(minutes=1))
+    HoldService.release_expired_holds(db)
+    hold(db, event, buyer, HoldService.hold_expiry())
+
+    with pytest.raises(HTTPException) as exc_info:
+        HoldService.confirm_tickets(db, [ticket.id], "pay_too_late")
+    db.rollback()
+
+    assert exc_info.value.status_code == 400
+    db.expire_all()
+    assert ticket.status == TicketStatus.EXPIRED
+    assert ticket.payment_id is None
+    assert counters(db, event) == (0, 1)
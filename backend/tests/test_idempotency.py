@@ -0,0 +1,82 @@
+import pytest
+import uuid
+from fastapi import HTTPException
+from app.main import app
+from app.models.menu_items import MenuItem
+from app.models.orders import Order
+from app.models.stalls import Stall, StallType
+from app.models.users import User, UserRole
+from app.services.idempotency_service import IdempotentRequest
+from app.utils.auth import get_current_user
+
+@pytest.fixture(scope="module")
+def customer(client, db):
+    user = User(email="retry@example.com", full_name="Retrying Client", password="!",
+                role=UserRole.STUDENT, is_active=True)
+    db.add(user)
+    db.flush()
+    stall = Stall(name="Retry stall", type=StallType.FOOD, owner_id=user.id)
+    db.add(stall)
+    db.flush()
+    item = MenuItem(stall_id=stall.id, name="Samosa", price=20.0)
+    db.add(item)
+    db.commit()
+    db.refresh(user)
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user, stall, item
+    del app.dependency_overrides[get_current_user]
+
+def place(client, stall, item, key=None, quantity=1):
+    headers = {"Idempotency-Key": key} if key else {}
+    body = {"stall_id": stall.id, "items": [{"menu_item_id": item.id, "quantity": quantity}]}
+    return client.post("/orders/", json=body, headers=headers)
+
+def order_count(db, user):
+    return db.query(Order).filter(Order.user_id == user.id).count()
+
+def test_retry_replays_the_first_response(client, db, customer):
+    user, stall, item = customer
+    before = order_count(db, user)
+    key = uuid.uuid4().hex
+
+    first = place(client, stall, item, key)
+    retry = place(client, stall, item, key)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert order_count(db, user) == before + 1
+
+def test_key_reused_with_a_different_request_is_rejected(client, db, customer):
+    user, stall, item = customer
+    key = uuid.uuid4().hex
+    assert place(client, stall, item, key).status_code == 200
+
+    response = place(client, stall, item, key, quantity=2)
+    assert response.status_code == 422
+
+def test_requests_without_a_key_are_not_deduplicated(client, db, customer):
+    user, stall, item = customer
+    before = order_count(db, user)
+
+    assert place(client, stall, item).status_code == 200
+    assert place(client, stall, item).status_code == 200
+    assert order_count(db, user) == before + 2
+
+def test_retry_while_the_first_request_runs_is_a_conflict():
+    key = uuid.uuid4().hex
+    with IdempotentRequest("tests", 1, key, {"n": 1}):
+        with pytest.raises(HTTPException) as exc_info:
+            IdempotentRequest("tests", 1, key, {"n": 1})
+    assert exc_info.value.status_code == 409
+
+def test_failed_request_frees_its_key():
+    key = uuid.uuid4().hex
+    with pytest.raises(RuntimeError):
+        with IdempotentRequest("tests", 1, key, {"n": 1}):
+            raise RuntimeError("handler failed")
+
+    retry = IdempotentRequest("tests", 1, key, {"n": 1})
+    assert retry.replay is None
+    assert retry.save({"ok": True}) == {"ok": True}
+    assert IdempotentRequest("tests", 1, key, {"n": 1}).replay == {"ok": True}
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from fastapi import HTTPException
+from app.models.events import Event
+from app.models.inventory import EventInventory
+from app.models.tickets import TicketType
+from app.services.inventory_service import InventoryService
+from conftest import TestingSessionLocal
+
+CAPACITY = 200
+ATTEMPTS = 2000
+
+def reserve_one(event_id):
+    # Each booking runs in its own session, like concurrent requests do
+    db = TestingSessionLocal()
+    try:
+        InventoryService.reserve(db, event_id, TicketType.GENERAL)
+        db.commit()
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+def test_parallel_reserves_never_oversell(db):
+    event = Event(name="Parallel booking", venue="Main hall", date=datetime(2030, 1, 1), capacity=CAPACITY)
+    db.add(event)
+    db.flush()
+    InventoryService.create_for_event(db, event)
+    db.commit()
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(reserve_one, [event.id] * ATTEMPTS))
+
+    db.expire_all()
+    inventory = db.query(EventInventory).filter(EventInventory.event_id == event.id).one()
+    assert inventory.sold <= inventory.capacity
+    assert inventory.sold == sum(results) == CAPACITY
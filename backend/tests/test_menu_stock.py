@@ -0,0 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from app.models.menu_items import MenuItem
+from app.models.stalls import Stall, StallType
+from app.models.users import User, UserRole
+from app.services.menu_service import MenuService
+from conftest import TestingSessionLocal
+
+STOCK = 100
+ATTEMPTS = 1000
+
+def take_both(menu_item_ids):
+    # Each order runs in its own session, like concurrent requests do
+    db = TestingSessionLocal()
+    try:
+        MenuService.reserve_stock(db, {menu_item_id: 1 for menu_item_id in menu_item_ids})
+        db.commit()
+        return True
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+def test_parallel_orders_never_oversell_stock(db):
+    owner = User(email="stock@example.com", full_name="Stall Owner", password="!",
+                 role=UserRole.FOOD_STALL, is_active=True)
+    db.add(owner)
+    db.flush()
+    stall = Stall(name="Stock stall", type=StallType.FOOD, owner_id=owner.id)
+    db.add(stall)
+    db.flush()
+    menu = [MenuItem(stall_id=stall.id, name=f"Limited {i}", price=50.0, stock=STOCK) for i in range(2)]
+    db.add_all(menu)
+    db.commit()
+
+    # Half the orders list the items the other way round, which would
+    # deadlock if rows were not locked in a fixed order
+    ids = [item.id for item in menu]
+    orders = [ids if i % 2 else ids[::-1] for i in range(ATTEMPTS)]
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(take_both, orders))
+
+    db.expire_all()
+    for item in menu:
+        assert item.stock == 0
+        assert item.is_available is False
+    assert sum(results) == STOCK
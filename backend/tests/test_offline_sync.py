@@ -0,0 +1,77 @@
+import pytest
+from datetime import datetime, timedelta
+from app.models.events import Event
+from app.models.tickets import Ticket, TicketStatus, TicketType
+from app.models.users import User, UserRole
+from app.schemas.tickets import OfflineScan
+from app.services.gate_service import GateService
+from app.services.snapshot_service import ConflictReason, SnapshotService
+
+SCANNED_AT = datetime(2030, 1, 1, 18, 0)
+
+@pytest.fixture(scope="module")
+def holder(db):
+    user = User(email="offline@example.com", full_name="Offline Holder", password="!",
+                role=UserRole.STUDENT, is_active=True)
+    db.add(user)
+    db.commit()
+    return user
+
+@pytest.fixture
+def tickets(db, holder):
+    event, other_event = (
+        Event(name=name, venue="Field", date=datetime(2030, 1, 1), capacity=10)
+        for name in ("Offline event", "Other offline event")
+    )
+    db.add_all([event, other_event])
+    db.flush()
+
+    def ticket(event, **fields):
+        return Ticket(event_id=event.id, user_id=holder.id, ticket_type=TicketType.GENERAL, price=0.0, **fields)
+
+    created = {
+        "fresh": ticket(event, status=TicketStatus.CONFIRMED),
+        "used": ticket(event, status=TicketStatus.CONFIRMED, is_used=True),
+        "held": ticket(event, status=TicketStatus.HELD),
+        "elsewhere": ticket(other_event, status=TicketStatus.CONFIRMED),
+    }
+    db.add_all(created.values())
+    db.commit()
+    yield event, created
+    GateService.close_gate(db, event.id)
+
+def scan(ticket, minutes=0):
+    return OfflineScan(ticket_id=ticket.id, scanned_at=SCANNED_AT + timedelta(minutes=minutes))
+
+def conflicts_of(result):
+    return sorted((conflict["ticket_id"], conflict["scanned_at"], conflict["reason"]) for conflict in result["conflicts"])
+
+@pytest.mark.parametrize("gate_open", [False, True])
+def test_sync_accepts_the_earliest_scan_and_reports_the_rest(db, tickets, gate_open):
+    event, created = tickets
+    if gate_open:
+        GateService.open_gate(db, event.id)
+
+    fresh, used, held, elsewhere = created["fresh"], created["used"], created["held"], created["elsewhere"]
+    # Two scanners saw the same ticket; the later log entry arrives first
+    scans = [scan(fresh, 2), scan(fresh, 1), scan(used), scan(held), scan(elsewhere)]
+    result = SnapshotService.sync_scans(db, event.id, scans)
+
+    assert result["accepted"] == 1
+    assert conflicts_of(result) == sorted([
+        (fresh.id, SCANNED_AT + timedelta(minutes=2), ConflictReason.DOUBLE_USE),
+        (used.id, SCANNED_AT, ConflictReason.DOUBLE_USE),
+        (held.id, SCANNED_AT, ConflictReason.INVALID),
+        (elsewhere.id, SCANNED_AT, ConflictReason.INVALID),
+    ])
+
+    # A scanner that uploads its log again gets nothing new accepted
+    result = SnapshotService.sync_scans(db, event.id, [scan(fresh, 1)])
+    assert result["accepted"] == 0
+    assert conflicts_of(result) == [(fresh.id, SCANNED_AT + timedelta(minutes=1), ConflictReason.DOUBLE_USE)]
+
+    GateService.flush_checkins(db)
+    db.expire_all()
+    assert fresh.is_used is True
+    assert held.is_used is False
+    assert elsewhere.is_used is False
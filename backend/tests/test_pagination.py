@@ -0,0 +1,91 @@
+import pytest
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event as sa_event
+from app.main import app
+from app.models.events import Event
+from app.models.menu_items import MenuItem
+from app.models.orders import Order, OrderItem
+from app.models.stalls import Stall, StallType
+from app.models.tickets import Ticket, TicketStatus, TicketType
+from app.models.users import User, UserRole
+from app.utils.auth import get_current_user
+from conftest import engine
+
+ORDERS = 25
+ITEMS_PER_ORDER = 3
+PAGE_SIZE = 10
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sa_event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        sa_event.remove(engine, "before_cursor_execute", record)
+
+@pytest.fixture(scope="module")
+def customer(client, db):
+    user = User(email="pagination@example.com", full_name="Heavy User", password="!",
+                role=UserRole.STUDENT, is_active=True)
+    db.add(user)
+    db.flush()
+    stall = Stall(name="Pagination stall", type=StallType.FOOD, owner_id=user.id)
+    event = Event(name="Pagination event", venue="Main hall", date=datetime(2030, 1, 1), capacity=ORDERS)
+    db.add_all([stall, event])
+    db.flush()
+    menu = [MenuItem(stall_id=stall.id, name=f"Item {i}", price=10.0 + i) for i in range(ITEMS_PER_ORDER)]
+    db.add_all(menu)
+    db.flush()
+
+    for _ in range(ORDERS):
+        order = Order(user_id=user.id, stall_id=stall.id, total_amount=sum(item.price for item in menu))
+        db.add(order)
+        db.flush()
+        db.add_all(
+            OrderItem(order_id=order.id, menu_item_id=item.id, quantity=1, price_at_time=item.price)
+            for item in menu
+        )
+        db.add(Ticket(event_id=event.id, user_id=user.id, ticket_type=TicketType.GENERAL,
+                      price=0.0, status=TicketStatus.CONFIRMED))
+    db.commit()
+    db.refresh(user)
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    del app.dependency_overrides[get_current_user]
+
+def walk(client, url):
+    """Fetch every page, returning the query count and item count of each."""
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        with count_queries() as statements:
+            response = client.get(url, params=params)
+        assert response.status_code == 200
+        body = response.json()
+        pages.append((len(statements), len(body["items"])))
+        cursor = body["next_cursor"]
+        if not cursor:
+            return pages
+
+def test_my_orders_queries_per_page_are_constant(client, customer):
+    pages = walk(client, "/orders/my-orders")
+
+    # Orders, their items, and the items' menu entries: one query each
+    assert [queries for queries, _ in pages] == [3] * len(pages)
+    assert sum(items for _, items in pages) == ORDERS
+
+def test_my_tickets_is_one_query_per_page(client, customer):
+    pages = walk(client, "/tickets/my-tickets")
+
+    assert [queries for queries, _ in pages] == [1] * len(pages)
+    assert sum(items for _, items in pages) == ORDERS
@@ -0,0 +1,97 @@
+import pytest
+import json
+import uuid
+from datetime import datetime
+from fastapi import HTTPException
+from app.models.events import Event
+from app.models.inventory import EventInventory
+from app.models.payment_webhooks import PaymentWebhookEvent
+from app.models.tickets import Ticket, TicketStatus, TicketType
+from app.models.users import User, UserRole
+from app.services.hold_service import HoldService
+from app.services.inventory_service import InventoryService
+from app.services.payment_webhook_service import PaymentWebhookService
+
+@pytest.fixture(scope="module")
+def buyer(db):
+    user = User(email="webhooks@example.com", full_name="Card Payer", password="!",
+                role=UserRole.STUDENT, is_active=True)
+    db.add(user)
+    db.commit()
+    return user
+
+@pytest.fixture
+def held_ticket(db, buyer):
+    event = Event(name="Webhook event", venue="Main hall", date=datetime(2030, 1, 1), capacity=5)
+    db.add(event)
+    db.flush()
+    InventoryService.create_for_event(db, event)
+    db.commit()
+    InventoryService.reserve(db, event.id, TicketType.GENERAL, hold=True)
+    ticket = Ticket(event_id=event.id, user_id=buyer.id, ticket_type=TicketType.GENERAL, price=150.0,
+                    status=TicketStatus.HELD, hold_expires_at=HoldService.hold_expiry(),
+                    gateway_order_id=f"order_{uuid.uuid4().hex[:12]}")
+    db.add(ticket)
+    db.commit()
+    return ticket
+
+def webhook(event_type, payment_id, gateway_order_id, amount):
+    return json.dumps({
+        "event": event_type,
+        "payload": {"payment": {"entity": {"id": payment_id, "order_id": gateway_order_id, "amount": amount}}}
+    }).encode()
+
+def sold(db, ticket):
+    db.expire_all()
+    return db.query(EventInventory.sold).filter(EventInventory.event_id == ticket.event_id).scalar()
+
+def test_redeliveries_are_stored_once(db):
+    body = webhook("payment.captured", "pay_dedup", "order_dedup", 100)
+    assert PaymentWebhookService.store(db, body, "evt_dedup") is True
+    assert PaymentWebhookService.store(db, body, "evt_dedup") is False
+    # Without a delivery ID the body itself identifies the delivery
+    assert PaymentWebhookService.store(db, body, None) is True
+    assert PaymentWebhookService.store(db, body, None) is False
+    assert db.query(PaymentWebhookEvent).filter(PaymentWebhookEvent.payment_id == "pay_dedup").count() == 2
+
+def test_malformed_deliveries_are_rejected(db):
+    with pytest.raises(HTTPException) as exc_info:
+        PaymentWebhookService.store(db, b'{"payload": {}}', "evt_malformed")
+    assert exc_info.value.status_code == 400
+
+def test_duplicate_events_for_one_payment_confirm_once(db, held_ticket):
+    payment_id = f"pay_{uuid.uuid4().hex[:12]}"
+    for delivery_id, event_type in [("a", "payment.captured"), ("b", "payment.captured"), ("c", "order.paid")]:
+        body = webhook(event_type, payment_id, held_ticket.gateway_order_id, 15000)
+        PaymentWebhookService.store(db, body, f"{payment_id}:{delivery_id}")
+
+    PaymentWebhookService.process(db)
+
+    db.expire_all()
+    assert held_ticket.status == TicketStatus.CONFIRMED
+    assert held_ticket.payment_id == payment_id
+    assert sold(db, held_ticket) == 1
+    assert PaymentWebhookService.process(db) == 0
+
+def test_amount_mismatch_is_recorded_and_not_applied(db, held_ticket):
+    payment_id = f"pay_{uuid.uuid4().hex[:12]}"
+    body = webhook("payment.captured", payment_id, held_ticket.gateway_order_id, 100)
+    PaymentWebhookService.store(db, body, f"{payment_id}:a")
+
+    PaymentWebhookService.process(db)
+
+    db.expire_all()
+    assert held_ticket.status == TicketStatus.HELD
+    assert held_ticket.payment_id is None
+    assert sold(db, held_ticket) == 0
+    stored = db.query(PaymentWebhookEvent).filter(PaymentWebhookEvent.payment_id == payment_id).one()
+    assert stored.processed_at is not None
+    assert stored.error == "Captured amount does not match the tickets and orders"
+
+def test_verify_failures_are_recorded_once(db):
+    for _ in range(2):
+        PaymentWebhookService.record_failure(db, "pay_verify_failed", "order_verify_failed", 100,
+                                             "Payment amount mismatch", "{}")
+    stored = db.query(PaymentWebhookEvent).filter(PaymentWebhookEvent.payment_id == "pay_verify_failed").one()
+    assert stored.event_type == "payment.verify_failed"
+    assert stored.error == "Payment amount mismatch"
@@ -0,0 +1,81 @@
+import pytest
+import uuid
+from datetime import datetime
+from app.models.events import Event
+from app.models.notifications import BroadcastAudience, Notification, NotificationType
+from app.models.orders import Order, OrderStatus
+from app.models.stalls import Stall, StallType
+from app.models.tickets import Ticket, TicketStatus, TicketType
+from app.models.users import User, UserRole
+from app.services.notification_service import NotificationService
+
+@pytest.fixture
+def reader(db):
+    user = User(email=f"reader-{uuid.uuid4().hex[:8]}@example.com", full_name="Notification Reader",
+                password="!", role=UserRole.STUDENT, is_active=True)
+    db.add(user)
+    db.commit()
+    return user
+
+def unread(db, user):
+    db.expire_all()
+    stored = db.query(User.unread_notifications).filter(User.id == user.id).scalar()
+    actual = db.query(Notification).filter(Notification.user_id == user.id, Notification.is_read == False).count()
+    assert stored == actual
+    return stored
+
+def test_counter_follows_new_and_read_notifications(db, reader):
+    assert unread(db, reader) == 0
+
+    first = NotificationService.create_notification(db, reader.id, NotificationType.SYSTEM, "Hello", "First")
+    NotificationService.create_notification(db, reader.id, NotificationType.SYSTEM, "Hello", "Second")
+    stall = Stall(name="Unread stall", type=StallType.FOOD, owner_id=reader.id)
+    db.add(stall)
+    db.flush()
+    orders = [Order(user_id=reader.id, stall_id=stall.id, total_amount=10.0) for _ in range(2)]
+    db.add_all(orders)
+    db.flush()
+    NotificationService.create_order_status_notifications(db, orders, OrderStatus.READY)
+    db.commit()
+    assert unread(db, reader) == 4
+
+    assert NotificationService.mark_read(db, reader.id, first.id) == 1
+    db.commit()
+    assert unread(db, reader) == 3
+    # Reading an already read notification changes nothing
+    assert NotificationService.mark_read(db, reader.id, first.id) == 0
+    db.commit()
+    assert unread(db, reader) == 3
+
+    assert NotificationService.mark_read(db, reader.id) == 3
+    db.commit()
+    assert unread(db, reader) == 0
+
+def test_broadcast_counts_each_recipient_once(db, reader):
+    event = Event(name="Unread event", venue="Main hall", date=datetime(2030, 1, 1), capacity=10)
+    db.add(event)
+    db.flush()
+    # Two tickets, one recipient
+    db.add_all(
+        Ticket(event_id=event.id, user_id=reader.id, ticket_type=TicketType.GENERAL, price=0.0,
+               status=TicketStatus.CONFIRMED)
+        for _ in range(2)
+    )
+    NotificationService.create_broadcast(
+        db, None, BroadcastAudience.EVENT_TICKET_HOLDERS, "Gates open", "Doors at six", event_id=event.id
+    )
+    db.commit()
+
+    NotificationService.process_broadcasts(db, chunk_size=1)
+
+    assert unread(db, reader) == 1
+
+def test_repair_fixes_drifted_counters(db, reader):
+    NotificationService.create_notification(db, reader.id, NotificationType.SYSTEM, "Hello", "Only one")
+    db.query(User).filter(User.id == reader.id).update({"unread_notifications": 42})
+    db.commit()
+
+    assert NotificationService.repair_unread_counts(db, batch_size=2) >= 1
+
+    assert unread(db, reader) == 1
+    assert NotificationService.repair_unread_counts(db) == 0